@@ -3,7 +3,7 @@
 from waccy_edgar.companyfacts import EdgarCompanyFactsNormalizer
 from waccy_edgar.extractor import EdgarExtractor
 
-__version__ = "0.1.0"
+__version__ = "0.2.0"
 
 __all__ = [
     "EdgarCompanyFactsNormalizer",
@@ -5,6 +5,8 @@ from __future__ import annotations
 from datetime import date
 from typing import TYPE_CHECKING, Any
 
+from waccy.core.interning import intern_identifier
+
 if TYPE_CHECKING:
     from collections.abc import Iterable
 
@@ -210,11 +212,12 @@ class EdgarCompanyFactsNormalizer:
         concept: str,
         fact: dict[str, Any],
     ) -> dict[str, Any]:
-        period_label = f"FY{fact['fy']}"
+        period_label = intern_identifier(f"FY{fact['fy']}")
+        name = intern_identifier(f"us-gaap:{concept}")
         return {
-            "source_account_id": f"us-gaap:{concept}",
-            "source_account_name": f"us-gaap:{concept}",
-            "name": f"us-gaap:{concept}",
+            "source_account_id": name,
+            "source_account_name": name,
+            "name": name,
             "period": period_label,
             "amount": str(fact["val"]),
             "statement": statement,
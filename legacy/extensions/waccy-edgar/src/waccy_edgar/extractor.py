@@ -5,9 +5,10 @@ from __future__ import annotations
 from datetime import date
 from typing import Any
 
+from waccy.core.interning import dataset_string_pool, intern_identifier
 from waccy.core.models import ExtractedData, PeriodType, ReportingPeriod
 from waccy.extraction.base import Extractor
-from waccy.extraction.mapper import source_record_from_dict
+from waccy.extraction.mapper import source_record_batch_from_dicts, source_record_from_dict
 
 
 class EdgarExtractor(Extractor):
@@ -29,7 +30,10 @@ class EdgarExtractor(Extractor):
         return True
 
     def extract(self, config: dict[str, Any]) -> ExtractedData:
-        """Extract data from an EDGAR-shaped fixture or dictionary."""
+        """Extract data from an EDGAR-shaped fixture or dictionary.
+
+        Set ``columnar`` in ``config`` to return records as a ``SourceRecordBatch``.
+        """
         if "fixture" in config:
             fixture = config["fixture"]
         elif "data" in config:
@@ -51,8 +55,13 @@ class EdgarExtractor(Extractor):
         if not all(isinstance(period, dict) for period in raw_periods):
             raise ValueError("EDGAR fixture periods must be dictionaries.")
 
-        periods = [_period_from_dict(period) for period in raw_periods]
-        records = [source_record_from_dict(record, self.data_source) for record in raw_records]
+        with dataset_string_pool():
+            periods = [_period_from_dict(period) for period in raw_periods]
+            records = (
+                source_record_batch_from_dicts(raw_records, self.data_source)
+                if config.get("columnar")
+                else [source_record_from_dict(record, self.data_source) for record in raw_records]
+            )
         return ExtractedData(
             entity_name=str(fixture.get("entity_name", config.get("ticker", "EDGAR Entity"))),
             periods=periods,
@@ -74,7 +83,7 @@ def _period_from_dict(data: dict[str, Any]) -> ReportingPeriod:
         raise ValueError(f"EDGAR fixture period is missing required keys: {missing}. Period: {data!r}")
 
     return ReportingPeriod(
-        label=str(data["label"]),
+        label=intern_identifier(str(data["label"])),
         start_date=date.fromisoformat(str(data["start_date"])),
         end_date=date.fromisoformat(str(data["end_date"])),
         period_type=PeriodType(str(data.get("period_type", "year"))),
@@ -5,9 +5,10 @@ from __future__ import annotations
 from datetime import date
 from typing import Any
 
-from waccy.core.models import ExtractedData, PeriodType, ReportingPeriod
+from waccy.core.interning import dataset_string_pool, intern_identifier
+from waccy.core.models import ExtractedData, PeriodType, ReportingPeriod, SourceAccount
 from waccy.extraction.base import Extractor
-from waccy.extraction.mapper import source_record_from_dict
+from waccy.extraction.mapper import source_record_batch_from_dicts, source_record_from_dict
 
 
 class QuickBooksExtractor(Extractor):
@@ -32,7 +33,10 @@ class QuickBooksExtractor(Extractor):
         return True
 
     def extract(self, config: dict[str, Any]) -> ExtractedData:
-        """Extract data from a QuickBooks-shaped fixture or dictionary."""
+        """Extract data from a QuickBooks-shaped fixture or dictionary.
+
+        Set ``columnar`` in ``config`` to return records as a ``SourceRecordBatch``.
+        """
         if "fixture" in config:
             fixture = config["fixture"]
         elif "data" in config:
@@ -54,18 +58,25 @@ class QuickBooksExtractor(Extractor):
         if not all(isinstance(period, dict) for period in raw_periods):
             raise ValueError("QuickBooks fixture periods must be dictionaries.")
 
-        periods = [_period_from_dict(period) for period in raw_periods]
-        records = [source_record_from_dict(record, self.data_source) for record in raw_records]
         raw_accounts = fixture.get("accounts", [])
         if not isinstance(raw_accounts, list):
             raise ValueError("QuickBooks fixture accounts must be a list.")
         if not all(isinstance(account, dict) for account in raw_accounts):
             raise ValueError("QuickBooks fixture accounts must be dictionaries.")
+
+        with dataset_string_pool():
+            periods = [_period_from_dict(period) for period in raw_periods]
+            records = (
+                source_record_batch_from_dicts(raw_records, self.data_source)
+                if config.get("columnar")
+                else [source_record_from_dict(record, self.data_source) for record in raw_records]
+            )
+            accounts = [_account_from_dict(account) for account in raw_accounts]
         return ExtractedData(
             entity_name=str(fixture.get("entity_name", config.get("company_id", "QuickBooks Entity"))),
             periods=periods,
             source_records=records,
-            accounts=raw_accounts,
+            accounts=accounts,
             metadata={
                 "source": self.data_source,
                 "mode": "fixture",
@@ -75,6 +86,23 @@ class QuickBooksExtractor(Extractor):
         )
 
 
+def _account_from_dict(data: dict[str, Any]) -> SourceAccount:
+    if "source_account_id" in data:
+        return SourceAccount.model_validate(data)
+    account_id = data.get("Id") or data.get("id")
+    if account_id is None:
+        raise ValueError(f"QuickBooks fixture account is missing 'Id'. Account: {data!r}")
+    account_type = data.get("AccountType") or data.get("Classification")
+    return SourceAccount(
+        source_account_id=intern_identifier(str(account_id)),
+        source_account_name=intern_identifier(
+            str(data.get("Name") or data.get("FullyQualifiedName") or account_id)
+        ),
+        source_account_type=intern_identifier(str(account_type)) if account_type else None,
+        metadata=data,
+    )
+
+
 def _period_from_dict(data: dict[str, Any]) -> ReportingPeriod:
     missing_keys = {"label", "start_date", "end_date"} - data.keys()
     if missing_keys:
@@ -82,7 +110,7 @@ def _period_from_dict(data: dict[str, Any]) -> ReportingPeriod:
         raise ValueError(f"QuickBooks fixture period is missing required keys: {missing}. Period: {data!r}")
 
     return ReportingPeriod(
-        label=str(data["label"]),
+        label=intern_identifier(str(data["label"])),
         start_date=date.fromisoformat(str(data["start_date"])),
         end_date=date.fromisoformat(str(data["end_date"])),
         period_type=PeriodType(str(data.get("period_type", "year"))),
@@ -6,6 +6,8 @@ from datetime import date
 from decimal import Decimal, InvalidOperation
 from typing import Any
 
+from waccy.core.interning import intern_identifier
+
 from waccy_quickbooks.models import QuickBooksReportPull
 
 REPORT_STATEMENTS = {
@@ -239,7 +241,8 @@ class QuickBooksReportNormalizer:
         amount = self._decimal(amount_column.get("value"))
         if amount is None:
             return None
-        account_id = str(account_column.get("id") or account_name)
+        account_name = intern_identifier(account_name)
+        account_id = intern_identifier(str(account_column.get("id") or account_name))
         account = accounts_by_id.get(account_id, {})
         account_type = account.get("AccountType") or account.get("Classification")
         return {
@@ -249,12 +252,11 @@ class QuickBooksReportNormalizer:
             "period": period_label,
             "amount": str(amount),
             "statement": statement,
-            "source_account_type": str(account_type) if account_type else None,
+            "source_account_type": intern_identifier(str(account_type)) if account_type else None,
             "unit": unit,
             "metadata": {
                 "report_name": report_name,
                 "row_path": path,
-                "qbo_account": account,
                 "qbo_row_type": row.get("type"),
             },
         }
@@ -0,0 +1,106 @@
+"""Benchmark taxonomy concept lookup as account aliases and as a ConceptTable.
+
+The full US-GAAP element list is not bundled, so the benchmark synthesizes
+taxonomy-shaped concept names (``us-gaap:`` plus CamelCase words) spread over the
+standard accounts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from waccy.core.ontology import (
+    CompiledOntology,
+    ConceptTable,
+    StandardChartOfAccounts,
+    compiled_ontology,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+WORDS = [
+    "Accrued", "Adjustment", "Amortization", "Asset", "Benefit", "Capital", "Carrying",
+    "Contract", "Current", "Deferred", "Depreciation", "Equity", "Expense", "Fair", "Finance",
+    "Gain", "Income", "Increase", "Intangible", "Interest", "Lease", "Liability", "Loss", "Net",
+    "Noncurrent", "Obligation", "Operating", "Payable", "Payment", "Proceeds", "Receivable",
+    "Revenue", "Tax", "Value",
+]  # fmt: skip
+
+
+def synthetic_concepts(count: int) -> list[tuple[str, str]]:
+    """Return ``count`` distinct ``(concept, account_id)`` pairs."""
+    account_ids = [account.id for account in compiled_ontology().sorted_accounts]
+    concepts = []
+    for index in range(count):
+        words, value = [], index
+        while True:
+            value, word = divmod(value, len(WORDS))
+            words.append(WORDS[word])
+            if not value:
+                break
+        concept = f"us-gaap:{''.join(words)}Member{index % 7}"
+        concepts.append((concept, account_ids[index % len(account_ids)]))
+    return concepts
+
+
+def _measured(function: Callable[[], Any]) -> tuple[float, int, Any]:
+    tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, retained, result
+
+
+def _lookup_rate(chart: StandardChartOfAccounts, concepts: list[tuple[str, str]]) -> float:
+    started = time.perf_counter()
+    for concept, account_id in concepts:
+        assert chart.map_account(concept, "edgar").id == account_id  # type: ignore[union-attr]
+    return len(concepts) / (time.perf_counter() - started)
+
+
+def main() -> int:
+    """Print build, load, memory, and lookup figures for both representations."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concepts", type=int, default=15_000, help="synthetic concept count")
+    args = parser.parse_args()
+
+    concepts = synthetic_concepts(args.concepts)
+    accounts = {account.id: account for account in compiled_ontology().sorted_accounts}
+    for concept, account_id in concepts:
+        accounts[account_id] = accounts[account_id].model_copy(
+            update={"aliases": [*accounts[account_id].aliases, concept]}
+        )
+
+    seconds, retained, compiled = _measured(
+        lambda: CompiledOntology.from_accounts(accounts.values())
+    )
+    print(f" aliases: compile {seconds * 1e3:.1f}ms, {retained / 1e6:.2f}MB retained")
+    print(f"          lookup {_lookup_rate(StandardChartOfAccounts(compiled), concepts):,.0f}/s")
+
+    seconds, _, table = _measured(lambda: ConceptTable.from_concepts(concepts))
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "concepts.npz"
+        table.save(path)
+        size = path.stat().st_size
+        seconds_loaded, retained, table = _measured(lambda: ConceptTable.load(path))
+    chart = StandardChartOfAccounts(concepts=table)
+    print(
+        f"   table: build {seconds * 1e3:.1f}ms, load {seconds_loaded * 1e3:.1f}ms, "
+        f"{retained / 1e6:.2f}MB retained, {size / 1e6:.2f}MB on disk"
+    )
+    print(f"          lookup {_lookup_rate(chart, concepts):,.0f}/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
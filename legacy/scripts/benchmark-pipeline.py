@@ -0,0 +1,126 @@
+"""Benchmark the normalize, map, validate, and build pipeline on synthetic records."""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import TYPE_CHECKING, Any
+
+from waccy.core.models import ExtractedData
+from waccy.core.trusted import strict_validation
+from waccy.extraction.mapper import (
+    DataMapper,
+    source_record_batch_from_dicts,
+    source_record_from_dict,
+)
+from waccy.modeling.builder import ModelBuilder
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+ACCOUNTS = [
+    ("Sales", "income_statement"),
+    ("Cost of Goods Sold", "income_statement"),
+    ("Payroll Expenses", "income_statement"),
+    ("Depreciation", "income_statement"),
+    ("Interest Expense", "income_statement"),
+    ("Income Tax Expense", "income_statement"),
+    ("Checking", "balance_sheet"),
+    ("Accounts Receivable", "balance_sheet"),
+    ("Inventory Asset", "balance_sheet"),
+    ("Accounts Payable", "balance_sheet"),
+    ("Long-Term Debt", "balance_sheet"),
+    ("Retained Earnings", "balance_sheet"),
+    ("Office Snacks", "income_statement"),
+]
+PERIODS = ["2021", "2022", "2023", "2024"]
+
+
+def synthetic_records(count: int) -> list[dict[str, Any]]:
+    """Return ``count`` fixture-shaped records spread over accounts and periods."""
+    records = []
+    for index in range(count):
+        name, statement = ACCOUNTS[index % len(ACCOUNTS)]
+        records.append(
+            {
+                "id": f"row-{index}",
+                "account_id": f"{index % len(ACCOUNTS)}",
+                "name": name,
+                "period": PERIODS[(index // len(ACCOUNTS)) % len(PERIODS)],
+                "amount": f"{(index * 7919) % 100000}.{index % 100:02d}",
+                "statement": statement,
+            }
+        )
+    return records
+
+
+def _timed(function: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run(
+    records: list[dict[str, Any]],
+    *,
+    columnar: bool,
+    amount_engine: str,
+    repeat: int,
+) -> dict[str, float]:
+    """Return the best wall time in seconds for each pipeline stage."""
+    source_records = (
+        source_record_batch_from_dicts(records, "qbo")
+        if columnar
+        else [source_record_from_dict(record, "qbo") for record in records]
+    )
+    extracted = ExtractedData(
+        entity_name="Benchmark Co",
+        source_records=source_records,
+        metadata={"source": "qbo"},
+    )
+    mapper = DataMapper()
+    builder = ModelBuilder(amount_engine=amount_engine)  # type: ignore[arg-type]
+    timings: dict[str, float] = {}
+    timings["normalize"], normalized = _timed(lambda: mapper.normalize(extracted), repeat)
+    timings["map"], mapped = _timed(lambda: mapper.map_dataset(normalized), repeat)
+    timings["validate"], validated = _timed(lambda: mapper.validate(mapped), repeat)
+    timings["build"], _ = _timed(lambda: builder.build_three_statement_model(validated), repeat)
+    return timings
+
+
+def main() -> int:
+    """Run the pipeline benchmark in trusted and strict validation modes."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=50_000, help="synthetic record count")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage; best is kept")
+    parser.add_argument("--columnar", action="store_true", help="use a SourceRecordBatch")
+    parser.add_argument(
+        "--amount-engine",
+        choices=["decimal", "fixed_point"],
+        default="decimal",
+        help="ModelBuilder amount engine",
+    )
+    args = parser.parse_args()
+
+    records = synthetic_records(args.records)
+    for label, strict in (("trusted", False), ("strict", True)):
+        with strict_validation(strict):
+            timings = run(
+                records,
+                columnar=args.columnar,
+                amount_engine=args.amount_engine,
+                repeat=args.repeat,
+            )
+        per_record = ", ".join(
+            f"{stage} {seconds / len(records) * 1e6:.2f}us" for stage, seconds in timings.items()
+        )
+        print(f"{label:>8}: total {sum(timings.values()):.3f}s ({per_record} per record)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,71 @@
+"""Report the memory the identifier string pool saves on QBO and EDGAR records."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tracemalloc
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from waccy.core.interning import StringPool, string_pool
+from waccy.extraction.mapper import source_record_from_dict
+
+if TYPE_CHECKING:
+    from waccy.core.models import SourceRecord
+
+ROOT = Path(__file__).resolve().parents[1]
+CONFORMANCE_DIR = ROOT / "tests" / "conformance"
+SOURCES = ("qbo", "edgar")
+
+
+def fixture_text(source: str) -> str:
+    """Return the committed conformance source fixture for ``source``."""
+    return (CONFORMANCE_DIR / source / "source-fixture.json").read_text()
+
+
+def retained_bytes(source: str, copies: int, pool: StringPool | None) -> int:
+    """Return the bytes records built from ``copies`` parsed fixtures keep alive.
+
+    Each copy is decoded from JSON on its own and dropped once its records are
+    built, the way separate API responses are, so without the pool every record
+    keeps its own copies of the identifiers it was parsed with.
+    """
+    text = fixture_text(source)
+    records: list[SourceRecord] = []
+    tracemalloc.start()
+    try:
+        with string_pool(pool):
+            for _ in range(copies):
+                rows = json.loads(text)["records"]
+                records.extend(source_record_from_dict(row, source) for row in rows)
+            del rows
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return retained
+
+
+def main() -> int:
+    """Print retained record memory with and without the string pool per source."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--copies", type=int, default=2_000, help="parsed fixture copies")
+    args = parser.parse_args()
+
+    for source in SOURCES:
+        records = args.copies * len(json.loads(fixture_text(source))["records"])
+        unpooled = retained_bytes(source, args.copies, None)
+        pool = StringPool()
+        pooled = retained_bytes(source, args.copies, pool)
+        saved = unpooled - pooled
+        print(
+            f"{source:>6}: {records} records, {len(pool)} pooled strings; "
+            f"{unpooled / 2**20:.1f} MiB unpooled, {pooled / 2**20:.1f} MiB pooled, "
+            f"{saved / 2**20:.1f} MiB saved ({saved / unpooled:.0%}, "
+            f"{saved / records:.0f} bytes per record)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
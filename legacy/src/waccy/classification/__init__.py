@@ -1,12 +1,40 @@
 """LLM-enhanced classification for ambiguous account mappings."""
 
+from waccy.classification.bulk import LearningProgress, learn_from_companyfacts
+from waccy.classification.cache import ClassificationCache
 from waccy.classification.confidence import ConfidenceScorer
-from waccy.classification.engine import ClassificationEngine, ClassificationResult
+from waccy.classification.engine import (
+    ClassificationBatch,
+    ClassificationEngine,
+    ClassificationResult,
+)
 from waccy.classification.patterns import PatternMatcher
+from waccy.classification.providers import (
+    ClassificationProvider,
+    LocalStubProvider,
+    ProviderAccount,
+    ProviderStats,
+    ProviderSuggestion,
+    ProviderTier,
+)
+from waccy.classification.statistical import NaiveBayesClassifier
+from waccy.classification.store import PatternStore
 
 __all__ = [
+    "ClassificationBatch",
+    "ClassificationCache",
     "ClassificationEngine",
+    "ClassificationProvider",
     "ClassificationResult",
     "ConfidenceScorer",
+    "LearningProgress",
+    "LocalStubProvider",
+    "NaiveBayesClassifier",
     "PatternMatcher",
+    "PatternStore",
+    "ProviderAccount",
+    "ProviderStats",
+    "ProviderSuggestion",
+    "ProviderTier",
+    "learn_from_companyfacts",
 ]
@@ -0,0 +1,205 @@
+"""Bulk pattern learning from SEC companyfacts corpora.
+
+``learn_from_companyfacts`` reads a directory of companyfacts JSON files, or a
+zip of them such as the SEC's nightly ``companyfacts.zip``, and learns alias
+observations from every filer. Files are split into batches that worker
+processes parse and match against the caller's chart of accounts, which each
+worker rebuilds once from its accounts, concept table, and instance aliases.
+Workers are spawned rather than forked, since the parent may be running other
+threads. Each worker reduces its batch to one table of observation counts, and
+the parent merges those tables and writes the total to a ``PatternStore`` in
+one transaction.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from waccy.classification.patterns import PatternMatcher
+from waccy.core.ontology import (
+    AccountCategory,
+    CompiledOntology,
+    ConceptTable,
+    StandardChartOfAccounts,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+    from waccy.classification.store import PatternStore
+
+type Observation = tuple[str, str, str, str | None]
+# ``(archive, member)`` for a file in a zip, ``("", path)`` for a plain file.
+type _Task = tuple[str, str]
+# Accounts, concept table, and instance aliases that rebuild a chart in a worker.
+type _ChartParts = tuple[tuple[AccountCategory, ...], ConceptTable | None, dict[str, list[str]]]
+
+_worker_matcher: PatternMatcher | None = None
+
+
+@dataclass(slots=True)
+class LearningProgress:
+    """Counters for a bulk learning run, updated as worker batches complete."""
+
+    files_total: int
+    files_done: int = 0
+    files_failed: int = 0
+    concepts: int = 0
+    observations: int = 0
+    bytes_read: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        """Return the seconds since the run started."""
+        return time.perf_counter() - self.started
+
+    @property
+    def files_per_second(self) -> float:
+        """Return the parsed and failed files per second so far."""
+        elapsed = self.elapsed
+        return (self.files_done + self.files_failed) / elapsed if elapsed else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Return the bytes of JSON parsed per second so far."""
+        elapsed = self.elapsed
+        return self.bytes_read / elapsed if elapsed else 0.0
+
+
+@dataclass(slots=True)
+class _BatchResult:
+    counts: Counter[Observation]
+    files_done: int = 0
+    files_failed: int = 0
+    concepts: int = 0
+    bytes_read: int = 0
+
+
+def learn_from_companyfacts(
+    source: str | Path,
+    store: PatternStore,
+    *,
+    ontology: StandardChartOfAccounts | None = None,
+    workers: int | None = None,
+    batch_size: int = 64,
+    progress: Callable[[LearningProgress], None] | None = None,
+) -> LearningProgress:
+    """Learn alias observations from every companyfacts file in ``source``.
+
+    Every concept of every taxonomy in a file becomes an EDGAR record, as
+    ``PatternMatcher.extract_patterns`` would read it. Concepts are matched
+    against ``ontology``, the standard chart of accounts by default.
+    ``workers`` defaults to the CPU count; ``1`` learns in this process. Files
+    that cannot be read or parsed are counted in ``files_failed`` and skipped.
+    ``progress`` is called with the running counters after every batch.
+    """
+    if batch_size <= 0:
+        raise ValueError("Bulk learning batch_size must be a positive integer.")
+    tasks = _tasks(Path(source))
+    batches = [tasks[start : start + batch_size] for start in range(0, len(tasks), batch_size)]
+    ontology = ontology or StandardChartOfAccounts()
+    state = LearningProgress(files_total=len(tasks))
+    counts: Counter[Observation] = Counter()
+
+    workers = workers or os.cpu_count() or 1
+    with ExitStack() as stack:
+        if workers == 1 or len(batches) <= 1:
+            matcher = PatternMatcher(ontology)
+            results: Iterator[_BatchResult] = (_learn_batch(matcher, batch) for batch in batches)
+        else:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_start_worker,
+                    initargs=(_chart_parts(ontology),),
+                )
+            )
+            results = executor.map(_learn_worker_batch, batches)
+        for result in results:
+            counts.update(result.counts)
+            state.files_done += result.files_done
+            state.files_failed += result.files_failed
+            state.concepts += result.concepts
+            state.observations += result.counts.total()
+            state.bytes_read += result.bytes_read
+            if progress is not None:
+                progress(state)
+
+    store.add_counts(counts)
+    return state
+
+
+def companyfacts_records(companyfacts: Any) -> list[dict[str, Any]]:
+    """Return one EDGAR pattern record per concept of a companyfacts payload."""
+    facts = companyfacts.get("facts") if isinstance(companyfacts, dict) else None
+    if not isinstance(facts, dict):
+        raise ValueError("Companyfacts payload is missing facts.")
+    return [
+        {"concept": f"{taxonomy}:{concept}"}
+        for taxonomy, concepts in facts.items()
+        if isinstance(concepts, dict)
+        for concept in concepts
+    ]
+
+
+def _tasks(source: Path) -> list[_Task]:
+    if source.is_dir():
+        return [("", str(path)) for path in sorted(source.glob("*.json"))]
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            names = sorted(name for name in archive.namelist() if name.endswith(".json"))
+        return [(str(source), name) for name in names]
+    raise ValueError(f"Companyfacts source {source} must be a directory or a zip file.")
+
+
+def _chart_parts(ontology: StandardChartOfAccounts) -> _ChartParts:
+    return tuple(ontology.accounts.values()), ontology.concepts, ontology.alias_overrides()
+
+
+def _start_worker(parts: _ChartParts) -> None:
+    global _worker_matcher  # noqa: PLW0603
+    accounts, concepts, aliases = parts
+    ontology = StandardChartOfAccounts(CompiledOntology.from_accounts(accounts), concepts)
+    ontology.add_aliases(aliases)
+    _worker_matcher = PatternMatcher(ontology)
+
+
+def _learn_worker_batch(tasks: Sequence[_Task]) -> _BatchResult:
+    if _worker_matcher is None:
+        raise RuntimeError("Bulk learning worker was not started with a chart of accounts.")
+    return _learn_batch(_worker_matcher, tasks)
+
+
+def _learn_batch(matcher: PatternMatcher, tasks: Sequence[_Task]) -> _BatchResult:
+    result = _BatchResult(Counter())
+    with ExitStack() as stack:
+        archives: dict[str, zipfile.ZipFile] = {}
+        for archive_path, name in tasks:
+            try:
+                if archive_path:
+                    if archive_path not in archives:
+                        archives[archive_path] = stack.enter_context(zipfile.ZipFile(archive_path))
+                    content = archives[archive_path].read(name)
+                else:
+                    content = Path(name).read_bytes()
+                records = companyfacts_records(json.loads(content))
+            except (OSError, ValueError, zipfile.BadZipFile):
+                result.files_failed += 1
+                continue
+            result.counts.update(matcher.observe({"records": records}))
+            result.files_done += 1
+            result.concepts += len(records)
+            result.bytes_read += len(content)
+    return result
@@ -0,0 +1,113 @@
+"""Two-tier cache of account classification results."""
+
+from __future__ import annotations
+
+import sqlite3
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from waccy.classification.engine import ClassificationResult
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from pathlib import Path
+
+# ``(version, source_system, normalized name, statement hint)``.
+type CacheKey = tuple[str, str, str, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS classification_results (
+    version TEXT NOT NULL,
+    source_system TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    statement TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (version, source_system, name_key, statement)
+) WITHOUT ROWID
+"""
+_LOOKUP = """
+SELECT result FROM classification_results
+WHERE version = ? AND source_system = ? AND name_key = ? AND statement = ?
+"""
+
+
+class ClassificationCache:
+    """Classification results by source system, normalized name, and statement hint.
+
+    Lookups try an in-memory LRU of at most ``maxsize`` results, then the SQLite
+    database at ``path`` when one is given, and results read from disk move into
+    the LRU. Every key starts with the version of the ontology and pattern store
+    the result was classified against, so results become unreachable as soon as
+    either changes, and writing results of one version deletes the rows of every
+    other version; ``clear`` drops them all. Cached results are shared and must
+    not be modified.
+    """
+
+    def __init__(self, path: str | Path | None = None, *, maxsize: int = 4096) -> None:
+        """Open the cache, creating the database at ``path`` if needed."""
+        if maxsize <= 0:
+            raise ValueError("Classification cache maxsize must be a positive integer.")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[CacheKey, ClassificationResult] = OrderedDict()
+        self._connection = None if path is None else sqlite3.connect(str(path))
+        if self._connection is not None:
+            with self._connection:
+                self._connection.execute(_SCHEMA)
+
+    def __len__(self) -> int:
+        """Return the number of results held in memory."""
+        return len(self._entries)
+
+    def get_many(self, keys: Sequence[CacheKey]) -> list[ClassificationResult | None]:
+        """Return the cached result for each key, ``None`` where there is none."""
+        results: list[ClassificationResult | None] = []
+        for key in keys:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+            elif self._connection is not None:
+                row = self._connection.execute(_LOOKUP, key).fetchone()
+                if row is not None:
+                    result = ClassificationResult.model_validate_json(row[0])
+                    self._remember(key, result)
+            results.append(result)
+        return results
+
+    def put_many(self, items: Iterable[tuple[CacheKey, ClassificationResult]]) -> None:
+        """Cache results in memory and write them to disk in one transaction.
+
+        Rows on disk whose version is not among the written keys' are deleted.
+        """
+        rows = []
+        for key, result in items:
+            self._remember(key, result)
+            rows.append((*key, result.model_dump_json()))
+        if self._connection is not None and rows:
+            versions = sorted({row[0] for row in rows})
+            with self._connection:
+                self._connection.execute(
+                    "DELETE FROM classification_results "
+                    f"WHERE version NOT IN ({', '.join('?' * len(versions))})",
+                    versions,
+                )
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO classification_results VALUES (?, ?, ?, ?, ?)", rows
+                )
+
+    def clear(self) -> None:
+        """Drop every cached result from both tiers."""
+        self._entries.clear()
+        if self._connection is not None:
+            with self._connection:
+                self._connection.execute("DELETE FROM classification_results")
+
+    def close(self) -> None:
+        """Close the database connection, if any."""
+        if self._connection is not None:
+            self._connection.close()
+
+    def _remember(self, key: CacheKey, result: ClassificationResult) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
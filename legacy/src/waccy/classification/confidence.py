@@ -1,5 +1,6 @@
 """Confidence scoring for account mappings."""
 
+from collections.abc import Iterable
 from typing import Any
 
 from waccy.core.ontology import StandardChartOfAccounts
@@ -24,19 +25,73 @@ class ConfidenceScorer:
         validation_results: dict[str, Any],
     ) -> float:
         """Calculate confidence score for an account mapping."""
+        return self._score(
+            _key(source_account),
+            mapped_account,
+            any(
+                _pattern_supports_account(pattern, mapped_account)
+                for pattern in transaction_patterns
+            ),
+            validation_results,
+            {},
+        )
+
+    def calculate_confidence_many(
+        self, mappings: Iterable[tuple[str, str, list[dict], dict[str, Any]]]
+    ) -> list[float]:
+        """Score ``calculate_confidence`` argument rows, once per distinct input.
+
+        A score depends on the source account only through its normalized key and
+        on the transaction patterns only through whether any supports the mapped
+        account, so rows that agree on those, the mapped account, and the
+        (hashable) validation results share one score.
+        """
+        scores: dict[tuple[Any, ...], float] = {}
+        containing: dict[str, frozenset[str]] = {}
+        results: list[float] = []
+        for source_account, mapped_account, transaction_patterns, validation_results in mappings:
+            supported = any(
+                _pattern_supports_account(pattern, mapped_account)
+                for pattern in transaction_patterns
+            )
+            key = (
+                _key(source_account),
+                mapped_account,
+                supported,
+                tuple(validation_results.items()),
+            )
+            score = scores.get(key)
+            if score is None:
+                score = scores[key] = self._score(
+                    key[0], mapped_account, supported, validation_results, containing
+                )
+            results.append(score)
+        return results
+
+    def _score(
+        self,
+        source_key: str,
+        mapped_account: str,
+        supported: bool,
+        validation_results: dict[str, Any],
+        containing: dict[str, frozenset[str]],
+    ) -> float:
         account = self.ontology.get_account(mapped_account)
         if account is None:
             return 0.0
 
         score = 0.35
-        source_key = _key(source_account)
-        alias_keys = {_key(account.id), _key(account.name), *{_key(alias) for alias in account.aliases}}
+        alias_keys = self.ontology.alias_keys(account.id)
         if source_key in alias_keys:
             score += 0.45
-        elif any(source_key in alias or alias in source_key for alias in alias_keys):
+        elif self.ontology.compiled.accounts.get(account.id) is not account:
+            # Instance accounts are not in the compiled substring index.
+            if any(source_key in key or key in source_key for key in alias_keys):
+                score += 0.25
+        elif self._shares_substring(source_key, account.id, containing):
             score += 0.25
 
-        if any(_pattern_supports_account(pattern, mapped_account) for pattern in transaction_patterns):
+        if supported:
             score += 0.1
         if validation_results.get("pattern_account_id") == mapped_account:
             score += 0.1
@@ -48,6 +103,22 @@ class ConfidenceScorer:
             score -= 0.35
         return max(0.0, min(round(score, 2), 1.0))
 
+    def _shares_substring(
+        self, source_key: str, account_id: str, containing: dict[str, frozenset[str]]
+    ) -> bool:
+        """Return whether an alias key of the account and ``source_key`` nest.
+
+        ``containing`` caches, per source key, the accounts with an alias key that
+        occurs in it, so one automaton pass serves every candidate account.
+        """
+        substring_index = self.ontology.compiled.substring_index
+        if substring_index.occurs_in(account_id, source_key):
+            return True
+        accounts = containing.get(source_key)
+        if accounts is None:
+            accounts = containing[source_key] = substring_index.occurring_in(source_key)
+        return account_id in accounts
+
 
 def _pattern_supports_account(pattern: dict, account_id: str) -> bool:
     return (
@@ -2,15 +2,43 @@
 
 from __future__ import annotations
 
-from typing import Any
+import copy
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Self
 
+import numpy as np
 from pydantic import BaseModel, Field
 
 from waccy.classification.confidence import ConfidenceScorer
 from waccy.classification.patterns import PatternMatcher
+from waccy.classification.providers import ProviderAccount, ProviderTier
+from waccy.classification.statistical import NaiveBayesClassifier
+from waccy.core.batch import DictionaryColumn
 from waccy.core.models import MappingStatus
 from waccy.core.ontology import AccountCategory, StandardChartOfAccounts
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from pathlib import Path
+    from types import TracebackType
+
+    from waccy.classification.bulk import LearningProgress
+    from waccy.classification.cache import CacheKey, ClassificationCache
+    from waccy.classification.providers import ClassificationProvider
+    from waccy.classification.store import PatternStore
+    from waccy.core.ontology import CandidateMatches
+
+
+_STATISTICAL = "classified_by_statistical_model"
+_PROVIDER = "classified_by_llm_provider"
+# Naive Bayes posteriors run high, so guesses are only suggestions, and only those
+# more likely than every other account together are made.
+_STATISTICAL_MIN_PROBABILITY = 0.5
+
+
+def _key(value: str) -> str:
+    return "".join(ch for ch in value.lower() if ch.isalnum())
+
 
 class ClassificationResult(BaseModel):
     """Diagnostic result for account classification."""
@@ -23,15 +51,95 @@ class ClassificationResult(BaseModel):
     pattern: dict[str, Any] | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class ClassificationBatch:
+    """Classification results for many accounts, one row per input account.
+
+    Rows with the same outcome share one ``ClassificationResult`` in ``results``,
+    and ``codes`` maps every row to its result. Shared results must not be
+    modified.
+    """
+
+    results: tuple[ClassificationResult, ...]
+    codes: np.ndarray
+
+    def __len__(self) -> int:
+        """Return the number of input rows."""
+        return len(self.codes)
+
+    def __getitem__(self, row: int) -> ClassificationResult:
+        """Return the result for one input row."""
+        return self.results[int(self.codes[row])]
+
+    def account_ids(self) -> DictionaryColumn:
+        """Return the classified account id of every row, ``None`` when unclassified."""
+        return DictionaryColumn(self.codes, [result.account_id for result in self.results])
+
+    def statuses(self) -> DictionaryColumn:
+        """Return the mapping status of every row."""
+        return DictionaryColumn(self.codes, [result.status for result in self.results])
+
+    def confidences(self) -> np.ndarray:
+        """Return the confidence of every row."""
+        confidences = np.array([result.confidence for result in self.results], dtype=np.float64)
+        result: np.ndarray = confidences[self.codes]
+        return result
+
+
 class ClassificationEngine:
     """Deterministic-first classification for ambiguous accounts."""
 
-    def __init__(self, llm_provider: str | None = None) -> None:
-        """Initialize the classification engine."""
-        self.ontology = StandardChartOfAccounts()
+    def __init__(
+        self,
+        llm_provider: str | ClassificationProvider | None = None,
+        ontology: StandardChartOfAccounts | None = None,
+        pattern_store: PatternStore | None = None,
+        cache: ClassificationCache | None = None,
+        statistical_fallback: bool = False,
+    ) -> None:
+        """Initialize the classification engine.
+
+        Patterns learned from EDGAR filings accumulate in ``pattern_store``; pass
+        a file-backed ``PatternStore`` to keep them across processes. Results are
+        reused from ``cache``, if given, while the ontology and pattern store are
+        unchanged. A ``ClassificationProvider`` given as ``llm_provider``
+        classifies accounts that no pattern or alias matches through
+        ``provider_tier``; a provider name alone enables nothing. With
+        ``statistical_fallback``, accounts still unmatched are marked
+        ``AMBIGUOUS`` with the guess of ``statistical_classifier`` as the
+        suggested account, unless it contradicts the statement hint. Close the
+        engine, or use it as a context manager, to shut down the provider tier.
+        """
+        self.ontology = ontology or StandardChartOfAccounts()
         self.llm_provider = llm_provider
-        self.pattern_matcher = PatternMatcher(self.ontology)
+        self.provider_tier = (
+            None
+            if llm_provider is None or isinstance(llm_provider, str)
+            else ProviderTier(llm_provider)
+        )
+        self.pattern_matcher = PatternMatcher(self.ontology, pattern_store)
         self.confidence_scorer = ConfidenceScorer(self.ontology)
+        self.cache = cache
+        self.statistical_fallback = statistical_fallback
+        self._statistical: tuple[str, NaiveBayesClassifier] | None = None
+
+    def close(self) -> None:
+        """Shut down the provider tier, if any; ``cache`` and the pattern store stay open."""
+        if self.provider_tier is not None:
+            self.provider_tier.close()
+
+    def __enter__(self) -> Self:
+        """Return the engine itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the engine."""
+        self.close()
 
     def classify_account(
         self,
@@ -51,66 +159,261 @@ class ClassificationEngine:
         transaction_patterns: list[dict],
         context: dict,
     ) -> ClassificationResult:
-        """Classify an account and return mapping diagnostics."""
-        source_system = str(context.get("source_system", ""))
-        candidates = self.ontology.map_candidates(source_account_name, source_system)
-        pattern = self.pattern_matcher.match_pattern(source_account_name, transaction_patterns)
-
-        if pattern and isinstance(pattern.get("account_id"), str):
-            pattern_account = self.ontology.get_account(str(pattern["account_id"]))
-            if pattern_account:
-                confidence = self.confidence_scorer.calculate_confidence(
-                    source_account_name,
-                    pattern_account.id,
-                    transaction_patterns,
-                    {
-                        "pattern_account_id": pattern_account.id,
-                        "statement": pattern.get("statement") or context.get("statement"),
-                    },
-                )
-                return ClassificationResult(
-                    account=pattern_account,
-                    account_id=pattern_account.id,
-                    status=MappingStatus.MAPPED,
-                    confidence=max(confidence, float(pattern.get("confidence", 0.0))),
-                    diagnostics=["classified_by_edgar_pattern"],
-                    pattern=pattern,
+        """Classify an account and return mapping diagnostics.
+
+        The result is the caller's own copy, so changing it, its diagnostics, or
+        its pattern leaves cached and shared batch results intact.
+        """
+        result = self.classify_many([(source_account_name, transaction_patterns, context)])[0]
+        return result.model_copy(
+            update={
+                "diagnostics": list(result.diagnostics),
+                "pattern": copy.deepcopy(result.pattern),
+            }
+        )
+
+    def classify_many(
+        self, accounts: Iterable[tuple[str, list[dict], dict]]
+    ) -> ClassificationBatch:
+        """Classify ``(source_account_name, transaction_patterns, context)`` rows.
+
+        Row ``i`` of the batch is what ``classify_with_diagnostics`` returns for
+        row ``i`` of ``accounts``. Candidates, learned patterns, and confidence
+        scores are looked up once per distinct normalized name, and rows with the
+        same outcome share one result.
+
+        With a cache, rows without transaction patterns are looked up by source
+        system, normalized name, and statement hint first. Unmapped results name
+        the source account as given, so they are not cached, and nothing is cached
+        while ``pattern_matcher.patterns`` holds aliases the cache cannot track.
+        """
+        rows = list(accounts)
+        if self.cache is None or self.pattern_matcher.patterns:
+            return self._classify(rows)
+
+        # Cacheable rows are grouped by lookup, so each distinct one is normalized,
+        # looked up, and on a miss classified once; -1 marks the other rows.
+        lookups: dict[tuple[str, str, str], int] = {}
+        first_rows: list[int] = []
+        lookup_codes: list[int] = []
+        for row, (name, transaction_patterns, context) in enumerate(rows):
+            statement = context.get("statement")
+            if transaction_patterns or not (statement is None or isinstance(statement, str)):
+                lookup_codes.append(-1)
+                continue
+            lookup = (str(context.get("source_system", "")), name, statement or "")
+            code = lookups.get(lookup)
+            if code is None:
+                code = lookups[lookup] = len(first_rows)
+                first_rows.append(row)
+            lookup_codes.append(code)
+
+        version = f"{self.ontology.version}:{self.pattern_matcher.store.version}"
+        if self.statistical_fallback:
+            version += ":statistical"
+        if self.provider_tier is not None:
+            version += f":{self.provider_tier.provider.name}"
+        keys: list[CacheKey] = [
+            (version, source_system, _key(name), statement)
+            for source_system, name, statement in lookups
+        ]
+        found = self.cache.get_many(keys)
+        pending = [
+            *(row for row, code in enumerate(lookup_codes) if code < 0),
+            *(first_rows[code] for code, result in enumerate(found) if result is None),
+        ]
+        classified: dict[int, ClassificationResult] = {}
+        if pending:
+            batch = self._classify([rows[row] for row in pending])
+            classified = {row: batch[position] for position, row in enumerate(pending)}
+        resolved: list[ClassificationResult] = []
+        stored: dict[CacheKey, ClassificationResult] = {}
+        for code, hit in enumerate(found):
+            result = hit if hit is not None else classified[first_rows[code]]
+            if hit is None and result.status != MappingStatus.UNMAPPED:
+                stored[keys[code]] = result
+            resolved.append(result)
+        self.cache.put_many(stored.items())
+
+        codes_by_id: dict[int, int] = {}
+        results: list[ClassificationResult] = []
+        codes = np.empty(len(rows), dtype=np.int32)
+        for row, lookup_code in enumerate(lookup_codes):
+            cached = resolved[lookup_code] if lookup_code >= 0 else classified[row]
+            code = codes_by_id.get(id(cached))
+            if code is None:
+                code = codes_by_id[id(cached)] = len(results)
+                results.append(cached)
+            codes[row] = code
+        return ClassificationBatch(results=tuple(results), codes=codes)
+
+    def _classify(self, rows: list[tuple[str, list[dict], dict]]) -> ClassificationBatch:
+        matches = self.ontology.map_candidates_many(
+            (str(context.get("source_system", "")), name, None) for name, _, context in rows
+        )
+        patterns = self.pattern_matcher.match_patterns(
+            (name, transaction_patterns) for name, transaction_patterns, _ in rows
+        )
+
+        # Each row resolves to an account (or none) before any confidence is scored.
+        decisions, scoring = self._decide(rows, matches, patterns)
+        scores = iter(self.confidence_scorer.calculate_confidence_many(scoring))
+
+        outcomes: dict[tuple[Any, ...], int] = {}
+        results: list[ClassificationResult] = []
+        codes = np.empty(len(rows), dtype=np.int32)
+        for row, (diagnostic, account, floor) in enumerate(decisions):
+            pattern = patterns[row]
+            if account is None:
+                candidates = matches[row]
+                if candidates:
+                    ids = ", ".join(candidate.id for candidate in candidates)
+                    outcome = (MappingStatus.AMBIGUOUS, 0.35, f"ambiguous_candidates: {ids}")
+                else:
+                    message = f"No deterministic classification for {rows[row][0]!r}."
+                    outcome = (MappingStatus.UNMAPPED, 0.0, message)
+            elif diagnostic == _STATISTICAL:
+                outcome = (MappingStatus.AMBIGUOUS, floor, diagnostic)
+            elif diagnostic == _PROVIDER:
+                outcome = (MappingStatus.MAPPED, floor, diagnostic)
+            else:
+                outcome = (MappingStatus.MAPPED, max(next(scores), floor), diagnostic)
+            key = (*outcome, account.id if account else None, id(pattern))
+            code = outcomes.get(key)
+            if code is None:
+                status, confidence, message = outcome
+                code = outcomes[key] = len(results)
+                results.append(
+                    ClassificationResult(
+                        account=account,
+                        account_id=account.id if account else None,
+                        status=status,
+                        confidence=confidence,
+                        diagnostics=[message],
+                        pattern=pattern,
+                    )
                 )
+            codes[row] = code
+        return ClassificationBatch(results=tuple(results), codes=codes)
 
-        if len(candidates) == 1:
-            account = candidates[0]
-            confidence = self.confidence_scorer.calculate_confidence(
-                source_account_name,
-                account.id,
-                transaction_patterns,
-                {"statement": context.get("statement")},
-            )
-            return ClassificationResult(
-                account=account,
-                account_id=account.id,
-                status=MappingStatus.MAPPED,
-                confidence=max(confidence, 0.8),
-                diagnostics=["classified_by_ontology_alias"],
-                pattern=pattern,
+    def _decide(
+        self,
+        rows: list[tuple[str, list[dict], dict]],
+        matches: CandidateMatches,
+        patterns: list[dict | None],
+    ) -> tuple[
+        list[tuple[str, AccountCategory | None, float]],
+        list[tuple[str, str, list[dict], dict[str, Any]]],
+    ]:
+        decisions: list[tuple[str, AccountCategory | None, float]] = []
+        scoring: list[tuple[str, str, list[dict], dict[str, Any]]] = []
+        unmatched: list[int] = []
+        for row, (name, transaction_patterns, context) in enumerate(rows):
+            pattern = patterns[row]
+            account_id = pattern.get("account_id") if pattern else None
+            pattern_account = (
+                self.ontology.get_account(account_id) if isinstance(account_id, str) else None
             )
+            candidates = matches[row]
+            if pattern is not None and pattern_account is not None:
+                floor = float(pattern.get("confidence", 0.0))
+                decisions.append(("classified_by_edgar_pattern", pattern_account, floor))
+                validation = {
+                    "pattern_account_id": pattern_account.id,
+                    "statement": pattern.get("statement") or context.get("statement"),
+                }
+                scoring.append((name, pattern_account.id, transaction_patterns, validation))
+            elif len(candidates) == 1:
+                decisions.append(("classified_by_ontology_alias", candidates[0], 0.8))
+                validation = {"statement": context.get("statement")}
+                scoring.append((name, candidates[0].id, transaction_patterns, validation))
+            else:
+                decisions.append(("", None, 0.0))
+                if not candidates:
+                    unmatched.append(row)
+        if unmatched:
+            for row, decision in self._fallbacks(rows, unmatched).items():
+                decisions[row] = decision
+        return decisions, scoring
+
+    def _fallbacks(
+        self, rows: list[tuple[str, list[dict], dict]], unmatched: list[int]
+    ) -> dict[int, tuple[str, AccountCategory, float]]:
+        """Decide rows that no pattern or alias matches with the opt-in fallback tiers."""
+        fallbacks: dict[int, tuple[str, AccountCategory, float]] = {}
+        if self.provider_tier is not None:
+            accounts = []
+            for row in unmatched:
+                name, _, context = rows[row]
+                statement = context.get("statement")
+                accounts.append(
+                    ProviderAccount(
+                        name,
+                        str(context.get("source_system", "")),
+                        statement if isinstance(statement, str) else None,
+                    )
+                )
+            for row, suggestion in zip(
+                unmatched, self.provider_tier.classify(accounts), strict=True
+            ):
+                account = self.ontology.get_account(suggestion.account_id) if suggestion else None
+                if suggestion is not None and account is not None:
+                    confidence = round(0.7 * min(max(suggestion.confidence, 0.0), 1.0), 2)
+                    fallbacks[row] = (_PROVIDER, account, confidence)
+
+        pending = [row for row in unmatched if row not in fallbacks]
+        if self.statistical_fallback and pending:
+            guesses = self._statistical_guesses([rows[row][0] for row in pending])
+            for row in pending:
+                guess = guesses.get(rows[row][0])
+                statement = rows[row][2].get("statement")
+                if guess is not None and statement in (None, guess[0].statement):
+                    fallbacks[row] = (_STATISTICAL, guess[0], round(0.4 * guess[1], 2))
+        return fallbacks
 
-        if len(candidates) > 1:
-            return ClassificationResult(
-                status=MappingStatus.AMBIGUOUS,
-                confidence=0.35,
-                diagnostics=[
-                    "ambiguous_candidates: " + ", ".join(account.id for account in candidates)
-                ],
-                pattern=pattern,
+    def statistical_classifier(self) -> NaiveBayesClassifier:
+        """Return the fallback model, trained on the ontology aliases and learned patterns.
+
+        The model is trained on first use and again after the ontology or pattern
+        store changes.
+        """
+        version = f"{self.ontology.version}:{self.pattern_matcher.store.version}"
+        if self._statistical is None or self._statistical[0] != version:
+            classifier = NaiveBayesClassifier.from_aliases(
+                [*self.ontology.alias_entries(), *self.pattern_matcher.learned_aliases()]
             )
+            self._statistical = (version, classifier)
+        return self._statistical[1]
 
-        return ClassificationResult(
-            status=MappingStatus.UNMAPPED,
-            confidence=0.0,
-            diagnostics=[f"No deterministic classification for {source_account_name!r}."],
-            pattern=pattern,
-        )
+    def _statistical_guesses(self, names: list[str]) -> dict[str, tuple[AccountCategory, float]]:
+        classifier = self.statistical_classifier()
+        distinct = list(dict.fromkeys(names))
+        probabilities = classifier.probabilities(distinct)
+        best = probabilities.argmax(axis=1)
+        guesses: dict[str, tuple[AccountCategory, float]] = {}
+        for name, column, probability in zip(
+            distinct,
+            best.tolist(),
+            probabilities[np.arange(len(distinct)), best].tolist(),
+            strict=True,
+        ):
+            account = self.ontology.get_account(classifier.account_ids[column])
+            if account is not None and probability >= _STATISTICAL_MIN_PROBABILITY:
+                guesses[name] = (account, probability)
+        return guesses
 
     def learn_from_edgar(self, filing_data: dict) -> None:
         """Extract classification patterns from EDGAR filings."""
         self.pattern_matcher.extract_patterns(filing_data)
+
+    def learn_from_companyfacts(
+        self,
+        source: str | Path,
+        *,
+        workers: int | None = None,
+        progress: Callable[[LearningProgress], None] | None = None,
+    ) -> LearningProgress:
+        """Learn patterns from a directory or zip of companyfacts JSON in parallel."""
+        return self.pattern_matcher.learn_from_companyfacts(
+            source, workers=workers, progress=progress
+        )
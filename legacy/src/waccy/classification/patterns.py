@@ -1,9 +1,20 @@
 """Pattern matching from EDGAR filings."""
 
-from typing import Any
+from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any
+
+from waccy.classification.store import PatternStore
+from waccy.core.fuzzy import TrigramIndex
 from waccy.core.ontology import StandardChartOfAccounts
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from pathlib import Path
+
+    from waccy.classification.bulk import LearningProgress
+    from waccy.core.ontology import AccountCategory
+
 
 def _key(value: str) -> str:
     return "".join(ch for ch in value.lower() if ch.isalnum())
@@ -12,59 +23,176 @@ def _key(value: str) -> str:
 class PatternMatcher:
     """Extract and match patterns from EDGAR filings."""
 
-    def __init__(self, ontology: StandardChartOfAccounts | None = None) -> None:
-        """Initialize the pattern matcher."""
+    def __init__(
+        self,
+        ontology: StandardChartOfAccounts | None = None,
+        store: PatternStore | None = None,
+    ) -> None:
+        """Initialize the pattern matcher.
+
+        Aliases learned by ``extract_patterns`` accumulate in ``store``, which is
+        in memory unless a persistent store is given. Aliases set in ``patterns``
+        take precedence over learned ones.
+        """
         self.ontology = ontology or StandardChartOfAccounts()
+        self.store = store if store is not None else PatternStore()
         self.patterns: dict[str, Any] = {}
+        self._learned: dict[str, dict[str, Any] | None] = {}
 
     def extract_patterns(self, filing_data: dict) -> dict[str, Any]:
-        """Extract classification patterns from filing data."""
-        raw_records = filing_data.get("records") or filing_data.get("facts") or filing_data.get("concepts") or []
-        if not isinstance(raw_records, list):
-            raise ValueError("EDGAR pattern extraction requires a list of records, facts, or concepts.")
+        """Extract classification patterns from filing data and add them to the store.
 
+        Returns the patterns of this filing alone.
+        """
         aliases: dict[str, dict[str, Any]] = {}
         statements: dict[str, str] = {}
+        for source_name, account, statement in self._filing_matches(filing_data):
+            aliases[_key(source_name)] = {
+                "source": source_name,
+                "account_id": account.id,
+                "account_name": account.name,
+                "statement": statement or account.statement,
+                "confidence": 0.85,
+            }
+            if isinstance(statement, str):
+                statements[account.id] = statement
+
+        self.store.record(self.observe(filing_data))
+        self._learned.clear()
+        return {"aliases": aliases, "statements": statements}
+
+    def observe(self, filing_data: dict) -> list[tuple[str, str, str, str | None]]:
+        """Return a filing's ``PatternStore.record`` observations without recording them."""
+        return [
+            (_key(source_name), source_name, account.id, statement or account.statement)
+            for source_name, account, statement in self._filing_matches(filing_data)
+        ]
+
+    def learn_from_companyfacts(
+        self,
+        source: str | Path,
+        *,
+        workers: int | None = None,
+        progress: Callable[[LearningProgress], None] | None = None,
+    ) -> LearningProgress:
+        """Learn from a directory or zip of companyfacts JSON across a process pool.
+
+        Concepts are matched against this matcher's chart of accounts. See
+        ``waccy.classification.bulk.learn_from_companyfacts``.
+        """
+        from waccy.classification.bulk import learn_from_companyfacts  # noqa: PLC0415
+
+        result = learn_from_companyfacts(
+            source,
+            self.store,
+            ontology=self.ontology,
+            workers=workers,
+            progress=progress,
+        )
+        self._learned.clear()
+        return result
+
+    def _filing_matches(self, filing_data: dict) -> list[tuple[str, AccountCategory, Any]]:
+        raw_records = (
+            filing_data.get("records")
+            or filing_data.get("facts")
+            or filing_data.get("concepts")
+            or []
+        )
+        if not isinstance(raw_records, list):
+            raise ValueError(
+                "EDGAR pattern extraction requires a list of records, facts, or concepts."
+            )
+
+        named_records: list[tuple[str, Any]] = []
         for raw_record in raw_records:
             if not isinstance(raw_record, dict):
                 raise ValueError("EDGAR pattern records must be dictionaries.")
             source_name = _source_name(raw_record)
-            if not source_name:
-                continue
-            statement = raw_record.get("statement")
-            candidates = self.ontology.map_candidates(source_name, "edgar")
-            if len(candidates) == 1:
-                account = candidates[0]
-                aliases[_key(source_name)] = {
-                    "source": source_name,
-                    "account_id": account.id,
-                    "account_name": account.name,
-                    "statement": statement or account.statement,
-                    "confidence": 0.85,
-                }
-                if isinstance(statement, str):
-                    statements[account.id] = statement
-
-        self.patterns = {"aliases": aliases, "statements": statements}
-        return self.patterns
+            if source_name:
+                named_records.append((source_name, raw_record.get("statement")))
+        matches = self.ontology.map_candidates_many(
+            ("edgar", source_name, None) for source_name, _ in named_records
+        )
+        return [
+            (source_name, matches[row][0], statement)
+            for row, (source_name, statement) in enumerate(named_records)
+            if len(matches[row]) == 1
+        ]
 
     def match_pattern(self, account_name: str, transaction_data: list[dict]) -> dict | None:
         """Match account against learned patterns."""
+        return self.match_patterns([(account_name, transaction_data)])[0]
+
+    def match_patterns(self, accounts: Iterable[tuple[str, list[dict]]]) -> list[dict | None]:
+        """Match ``(account_name, transaction_data)`` rows against learned patterns.
+
+        Each distinct account or transaction source name is normalized once for
+        the whole batch.
+        """
+        aliases = self.patterns.get("aliases", {})
+        if not isinstance(aliases, dict):
+            aliases = {}
+        keys: dict[str, str] = {}
+
+        def lookup(name: str) -> dict | None:
+            key = keys.get(name)
+            if key is None:
+                key = keys[name] = _key(name)
+            match = aliases.get(key)
+            return match if isinstance(match, dict) else self._learned_pattern(key)
+
+        matches: list[dict | None] = []
+        for account_name, transaction_data in accounts:
+            match = lookup(account_name)
+            for transaction in () if match else transaction_data:
+                if not isinstance(transaction, dict):
+                    continue
+                source_name = _source_name(transaction)
+                if source_name:
+                    match = lookup(source_name)
+                    if match:
+                        break
+            matches.append(match)
+        return matches
+
+    def learned_aliases(self) -> list[tuple[str, str]]:
+        """Return ``(source, account_id)`` for the aliases in ``patterns`` and the store."""
         aliases = self.patterns.get("aliases", {})
-        if isinstance(aliases, dict):
-            match = aliases.get(_key(account_name))
-            if isinstance(match, dict):
-                return match
-
-        for transaction in transaction_data:
-            if not isinstance(transaction, dict):
-                continue
-            source_name = _source_name(transaction)
-            if source_name and isinstance(aliases, dict):
-                match = aliases.get(_key(source_name))
-                if isinstance(match, dict):
-                    return match
-        return None
+        return [
+            *(
+                (str(match["source"]), str(match["account_id"]))
+                for match in (aliases.values() if isinstance(aliases, dict) else ())
+                if isinstance(match, dict)
+            ),
+            *self.store.aliases(),
+        ]
+
+    def fuzzy_index(self) -> TrigramIndex:
+        """Return a trigram index over the ontology aliases and learned pattern sources."""
+        learned = self.learned_aliases()
+        if not learned:
+            return self.ontology.fuzzy_index()
+        return TrigramIndex([*self.ontology.alias_entries(), *learned])
+
+    def _learned_pattern(self, alias_key: str) -> dict[str, Any] | None:
+        if alias_key in self._learned:
+            return self._learned[alias_key]
+        pattern = None
+        learned = self.store.lookup(alias_key)
+        account = self.ontology.get_account(learned["account_id"]) if learned else None
+        if learned is not None and account is not None:
+            pattern = {
+                "source": learned["source"],
+                "account_id": account.id,
+                "account_name": account.name,
+                "statement": learned["statement"] or account.statement,
+                "confidence": round(0.85 * learned["share"], 2),
+                "count": learned["count"],
+                "statements": learned["statements"],
+            }
+        self._learned[alias_key] = pattern
+        return pattern
 
 
 def _source_name(record: dict[str, Any]) -> str:
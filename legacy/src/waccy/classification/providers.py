@@ -0,0 +1,239 @@
+"""Batched, cached, concurrent calls to model-backed classification providers.
+
+A ``ClassificationProvider`` classifies a batch of account names per call, as a
+request to a hosted model would. ``ProviderTier`` sits between the engine and a
+provider: it answers repeated accounts from a bounded cache, sends the distinct
+remaining accounts in batches of ``batch_size``, keeps at most
+``max_concurrency`` batches in flight across all its calls, and stops waiting
+at ``deadline`` seconds. Accounts whose batch failed or missed the deadline
+stay unresolved and are not cached, so a later call asks again; a batch still
+running at the deadline keeps its slot until the provider returns. Close the
+tier, or use it as a context manager, to release its worker threads.
+
+``LocalStubProvider`` is a deterministic offline stand-in for measuring
+throughput and latency.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Protocol, Self
+
+from waccy.core.ontology import StandardChartOfAccounts
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from types import TracebackType
+
+
+def _key(value: str) -> str:
+    return "".join(ch for ch in value.lower() if ch.isalnum())
+
+
+@dataclass(frozen=True, slots=True)
+class ProviderAccount:
+    """An account a provider is asked to classify."""
+
+    name: str
+    source_system: str = ""
+    statement: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ProviderSuggestion:
+    """A provider's account for one ``ProviderAccount``, with its own confidence."""
+
+    account_id: str
+    confidence: float
+
+
+class ClassificationProvider(Protocol):
+    """Protocol that model-backed classification providers must implement."""
+
+    name: str
+
+    def classify_batch(
+        self, accounts: Sequence[ProviderAccount]
+    ) -> Sequence[ProviderSuggestion | None]:
+        """Return one suggestion, or ``None``, per account, in order."""
+        ...
+
+
+@dataclass(slots=True)
+class ProviderStats:
+    """Counters for a ``ProviderTier``, accumulated over its calls.
+
+    ``requests`` and ``accounts_sent`` count batches the provider was actually
+    called with, not those cancelled at the deadline before they started.
+    """
+
+    requests: int = 0
+    accounts_sent: int = 0
+    cache_hits: int = 0
+    failed_batches: int = 0
+    timed_out_batches: int = 0
+
+
+class ProviderTier:
+    """Batch, de-duplicate, cache, and bound the concurrency of provider calls."""
+
+    def __init__(
+        self,
+        provider: ClassificationProvider,
+        *,
+        batch_size: int = 25,
+        max_concurrency: int = 4,
+        deadline: float = 30.0,
+        cache_size: int = 4096,
+    ) -> None:
+        """Wrap ``provider``; ``deadline`` bounds each ``classify`` call in seconds."""
+        if batch_size <= 0 or max_concurrency <= 0 or cache_size <= 0:
+            raise ValueError(
+                "Provider batch_size, max_concurrency, and cache_size must be positive integers."
+            )
+        if deadline <= 0:
+            raise ValueError("Provider deadline must be positive.")
+        self.provider = provider
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.deadline = deadline
+        self.cache_size = cache_size
+        self.stats = ProviderStats()
+        self._cache: OrderedDict[tuple[str, str, str], ProviderSuggestion | None] = OrderedDict()
+        # Shared by every call, so batches abandoned at a deadline still hold a worker.
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._stats_lock = threading.Lock()
+
+    def classify(self, accounts: Sequence[ProviderAccount]) -> list[ProviderSuggestion | None]:
+        """Return the provider's suggestion for each account, ``None`` when there is none.
+
+        Accounts are de-duplicated by source system, normalized name, and
+        statement hint before anything is sent.
+        """
+        keys = [
+            (account.source_system, _key(account.name), account.statement or "")
+            for account in accounts
+        ]
+        resolved: dict[tuple[str, str, str], ProviderSuggestion | None] = {}
+        pending: dict[tuple[str, str, str], ProviderAccount] = {}
+        for key, account in zip(keys, accounts, strict=True):
+            if key in resolved or key in pending:
+                continue
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats.cache_hits += 1
+                resolved[key] = self._cache[key]
+            else:
+                pending[key] = account
+        if pending:
+            resolved.update(self._request(list(pending.items())))
+        return [resolved.get(key) for key in keys]
+
+    def close(self) -> None:
+        """Release the worker threads, cancelling batches not yet started.
+
+        Batches already running finish in the background; ``classify`` must
+        not be called afterwards.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> Self:
+        """Return the tier itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the tier."""
+        self.close()
+
+    def _request(
+        self, pending: list[tuple[tuple[str, str, str], ProviderAccount]]
+    ) -> dict[tuple[str, str, str], ProviderSuggestion | None]:
+        batches = [
+            pending[start : start + self.batch_size]
+            for start in range(0, len(pending), self.batch_size)
+        ]
+        futures = {
+            self._executor.submit(self._send, [account for _, account in batch]): batch
+            for batch in batches
+        }
+        done, not_done = wait(futures, timeout=self.deadline)
+        for future in not_done:
+            future.cancel()
+        self.stats.timed_out_batches += len(not_done)
+
+        resolved: dict[tuple[str, str, str], ProviderSuggestion | None] = {}
+        for future in done:
+            batch = futures[future]
+            suggestions = None if future.exception() is not None else list(future.result())
+            if suggestions is None or len(suggestions) != len(batch):
+                self.stats.failed_batches += 1
+                continue
+            for (key, _), suggestion in zip(batch, suggestions, strict=True):
+                resolved[key] = self._cache[key] = suggestion
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return resolved
+
+    def _send(self, accounts: list[ProviderAccount]) -> Sequence[ProviderSuggestion | None]:
+        with self._stats_lock:
+            self.stats.requests += 1
+            self.stats.accounts_sent += len(accounts)
+        return self.provider.classify_batch(accounts)
+
+
+class LocalStubProvider:
+    """Deterministic offline stand-in for a model-backed provider.
+
+    Each account gets the ontology account with the most similar alias by
+    trigram similarity, with that similarity as its confidence, or ``None``
+    below ``min_score``. Every call sleeps ``latency`` plus ``per_account_latency``
+    per account to imitate a remote request, and ``calls`` and ``accounts``
+    count what was asked.
+    """
+
+    name = "local-stub"
+
+    def __init__(
+        self,
+        ontology: StandardChartOfAccounts | None = None,
+        *,
+        latency: float = 0.0,
+        per_account_latency: float = 0.0,
+        min_score: float = 0.3,
+    ) -> None:
+        """Initialize the stub over ``ontology``, the standard chart by default."""
+        self.ontology = ontology or StandardChartOfAccounts()
+        self.latency = latency
+        self.per_account_latency = per_account_latency
+        self.min_score = min_score
+        self.calls = 0
+        self.accounts = 0
+        self._lock = threading.Lock()
+
+    def classify_batch(
+        self, accounts: Sequence[ProviderAccount]
+    ) -> list[ProviderSuggestion | None]:
+        """Return the closest ontology account for each account."""
+        with self._lock:
+            self.calls += 1
+            self.accounts += len(accounts)
+        delay = self.latency + self.per_account_latency * len(accounts)
+        if delay > 0:
+            time.sleep(delay)
+        index = self.ontology.fuzzy_index()
+        suggestions: list[ProviderSuggestion | None] = []
+        for account in accounts:
+            matches = index.search(account.name, limit=1, min_score=self.min_score)
+            suggestions.append(
+                ProviderSuggestion(matches[0].account_id, matches[0].score) if matches else None
+            )
+        return suggestions
@@ -0,0 +1,127 @@
+"""Statistical fallback classification of account names.
+
+``NaiveBayesClassifier`` is a multinomial naive Bayes model over hashed name
+features. Every lowercase word of a name, and each of its padded character
+trigrams as ``waccy.core.fuzzy.trigrams`` produces them, is hashed with CRC-32
+into one of ``n_features`` buckets. Training counts bucket hits per account over alias
+entries. Scoring a batch sums the log-probability rows of each distinct word's
+buckets, then each name's word rows, with one ``np.add.reduceat`` apiece, so
+the cost is a few array operations per batch rather than a loop over accounts
+per name.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from waccy.core.fuzzy import trigrams
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+@dataclass(frozen=True, slots=True)
+class NaiveBayesClassifier:
+    """Multinomial naive Bayes over hashed word and trigram features of account names.
+
+    ``feature_log_probs`` holds ``log P(feature | account)`` with one row per
+    feature bucket and one column per entry of ``account_ids``. Every account is
+    equally likely a priori, since the number of aliases an account has says
+    little about how often it occurs.
+    """
+
+    account_ids: tuple[str, ...]
+    feature_log_probs: np.ndarray
+
+    @classmethod
+    def from_aliases(
+        cls,
+        entries: Iterable[tuple[str, str]],
+        *,
+        n_features: int = 1 << 14,
+        alpha: float = 0.1,
+    ) -> NaiveBayesClassifier:
+        """Train on ``(alias, account_id)`` entries with additive smoothing ``alpha``."""
+        if n_features <= 0 or alpha <= 0:
+            raise ValueError("Naive Bayes n_features and alpha must be positive.")
+        account_codes: dict[str, int] = {}
+        buckets: list[int] = []
+        codes: list[int] = []
+        for alias, account_id in entries:
+            code = account_codes.setdefault(account_id, len(account_codes))
+            features = _buckets(alias, n_features)
+            buckets.extend(features)
+            codes.extend([code] * len(features))
+        if not account_codes:
+            raise ValueError("Naive Bayes training requires at least one alias entry.")
+
+        accounts = len(account_codes)
+        counts = np.bincount(
+            np.array(buckets, dtype=np.int64) * accounts + np.array(codes, dtype=np.int64),
+            minlength=n_features * accounts,
+        ).reshape(n_features, accounts)
+        smoothed = counts + alpha
+        log_probs = np.log(smoothed / smoothed.sum(axis=0)).astype(np.float32)
+        return cls(account_ids=tuple(account_codes), feature_log_probs=log_probs)
+
+    def probabilities(self, names: Sequence[str]) -> np.ndarray:
+        """Return ``P(account | name)`` with one row per name and a column per account.
+
+        Each distinct word in the batch is scored once, and a name's score is the
+        sum of its words' scores. A name without any word characters gets the
+        uniform distribution.
+        """
+        vocabulary: dict[str, int] = {}
+        word_ids: list[int] = []
+        lengths = np.empty(len(names), dtype=np.intp)
+        for row, name in enumerate(names):
+            words = _WORD.findall(name.lower())
+            word_ids.extend(vocabulary.setdefault(word, len(vocabulary)) for word in words)
+            lengths[row] = len(words)
+
+        scores = np.zeros((len(names), len(self.account_ids)), dtype=np.float64)
+        rows = np.flatnonzero(lengths)
+        if len(rows):
+            n_features = len(self.feature_log_probs)
+            word_buckets = [_word_buckets(word, n_features) for word in vocabulary]
+            word_scores = _segment_sums(
+                self.feature_log_probs[np.fromiter(chain.from_iterable(word_buckets), np.intp)],
+                np.fromiter(map(len, word_buckets), np.intp, len(word_buckets)),
+            )
+            scores[rows] = _segment_sums(
+                word_scores[np.array(word_ids, dtype=np.intp)], lengths[rows]
+            )
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+
+def _segment_sums(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    # Sums consecutive runs of rows; every length must be positive.
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    sums: np.ndarray = np.add.reduceat(values, starts, axis=0)
+    return sums
+
+
+def _buckets(text: str, n_features: int) -> list[int]:
+    buckets: list[int] = []
+    for word in _WORD.findall(text.lower()):
+        buckets.extend(_word_buckets(word, n_features))
+    return buckets
+
+
+@lru_cache(maxsize=1 << 16)
+def _word_buckets(word: str, n_features: int) -> tuple[int, ...]:
+    # Account names reuse a small vocabulary, so most words hash from the cache.
+    features = [f"w:{word}", *sorted(trigrams(word))]
+    return tuple(zlib.crc32(feature.encode()) % n_features for feature in features)
@@ -0,0 +1,156 @@
+"""Persistent store of alias observations learned from filings."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+    from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alias_observations (
+    alias_key TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    statement TEXT NOT NULL,
+    source TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (alias_key, account_id, statement)
+) WITHOUT ROWID
+"""
+# One row holding the digest of the observation counts; see PatternStore.version.
+_STATE = """
+CREATE TABLE IF NOT EXISTS store_digest (
+    singleton INTEGER PRIMARY KEY CHECK (singleton = 0),
+    digest TEXT NOT NULL
+)
+"""
+_DIGEST_MASK = (1 << 64) - 1
+_RECORD = """
+INSERT INTO alias_observations (alias_key, account_id, statement, source, count)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (alias_key, account_id, statement)
+DO UPDATE SET source = MIN(source, excluded.source), count = count + excluded.count
+"""
+
+
+class PatternStore:
+    """SQLite-backed counts of ``(alias key, account, statement)`` observations.
+
+    Opening a store only connects to the database, so start-up does not depend on
+    how many filings it has learned from, and each lookup reads the rows of one
+    alias key through the primary key. The default ``":memory:"`` store lasts as
+    long as the object.
+    """
+
+    def __init__(self, path: str | Path = ":memory:") -> None:
+        """Open, and create if needed, the store at ``path``."""
+        self._connection = sqlite3.connect(str(path))
+        with self._connection:
+            self._connection.execute(_SCHEMA)
+            self._connection.execute(_STATE)
+            if self._connection.execute("SELECT digest FROM store_digest").fetchone() is None:
+                # A store written before digests were kept is summed once.
+                rows = self._connection.execute(
+                    "SELECT alias_key, account_id, statement, source, count FROM alias_observations"
+                )
+                self._connection.execute(
+                    "INSERT INTO store_digest VALUES (0, ?)",
+                    (f"{_digest_sum(0, ((row[:4], row[4]) for row in rows)):016x}",),
+                )
+
+    def __len__(self) -> int:
+        """Return the number of distinct alias keys observed."""
+        (count,) = self._connection.execute(
+            "SELECT COUNT(DISTINCT alias_key) FROM alias_observations"
+        ).fetchone()
+        return int(count)
+
+    @property
+    def version(self) -> str:
+        """Return a digest of the observation counts, including other processes' additions.
+
+        It is a sum of one 64-bit hash per observation times its count, so stores
+        that counted the same observations share a version whatever order they
+        were learned in, and every empty store has the same one.
+        """
+        (digest,) = self._connection.execute("SELECT digest FROM store_digest").fetchone()
+        return str(digest)
+
+    def record(self, observations: Iterable[tuple[str, str, str, str | None]]) -> None:
+        """Count ``(alias_key, source, account_id, statement)`` observations."""
+        self.add_counts(Counter(observations))
+
+    def add_counts(self, counts: Mapping[tuple[str, str, str, str | None], int]) -> None:
+        """Add observation counts, such as merged ``record`` inputs, in one transaction."""
+        rows = (
+            (alias_key, account_id, statement or "", source, count)
+            for (alias_key, source, account_id, statement), count in counts.items()
+        )
+        if not counts:
+            return
+        with self._connection:
+            # The inserts take the write lock before the digest is read.
+            self._connection.executemany(_RECORD, rows)
+            (digest,) = self._connection.execute("SELECT digest FROM store_digest").fetchone()
+            digest = _digest_sum(
+                int(digest, 16),
+                (
+                    ((alias_key, account_id, statement or "", source), count)
+                    for (alias_key, source, account_id, statement), count in counts.items()
+                ),
+            )
+            self._connection.execute("UPDATE store_digest SET digest = ?", (f"{digest:016x}",))
+
+    def lookup(self, alias_key: str) -> dict[str, Any] | None:
+        """Summarize the observations of one alias key, or ``None`` if it has none.
+
+        The summary names the most observed account, its source name, how often
+        it was observed and its ``share`` of all observations of the key, and its
+        observation count per statement with the most frequent as ``statement``.
+        """
+        rows = self._connection.execute(
+            "SELECT account_id, statement, source, count FROM alias_observations "
+            "WHERE alias_key = ? ORDER BY account_id, statement",
+            (alias_key,),
+        ).fetchall()
+        if not rows:
+            return None
+        totals: dict[str, int] = {}
+        sources: dict[str, str] = {}
+        statements: dict[str, dict[str, int]] = {}
+        for account_id, statement, source, count in rows:
+            totals[account_id] = totals.get(account_id, 0) + count
+            sources[account_id] = min(source, sources.get(account_id, source))
+            if statement:
+                statements.setdefault(account_id, {})[statement] = count
+        account_id = max(totals, key=totals.__getitem__)
+        frequencies = statements.get(account_id, {})
+        return {
+            "source": sources[account_id],
+            "account_id": account_id,
+            "statement": max(frequencies, key=frequencies.__getitem__) if frequencies else None,
+            "statements": frequencies,
+            "count": totals[account_id],
+            "share": totals[account_id] / sum(totals.values()),
+        }
+
+    def aliases(self) -> Iterator[tuple[str, str]]:
+        """Yield ``(source, account_id)`` for every observed alias key and account."""
+        yield from self._connection.execute(
+            "SELECT MIN(source), account_id FROM alias_observations GROUP BY alias_key, account_id"
+        )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+
+def _digest_sum(digest: int, counts: Iterable[tuple[tuple[str, ...], int]]) -> int:
+    for key, count in counts:
+        hashed = hashlib.blake2b("\0".join(key).encode(), digest_size=8).digest()
+        digest = (digest + int.from_bytes(hashed, "little") * count) & _DIGEST_MASK
+    return digest
@@ -1,5 +1,6 @@
 """Core platform components: ontology, models, and validation."""
 
+from waccy.core.batch import MappedRecordBatch, SourceRecordBatch
 from waccy.core.models import (
     CONTRACT_SCHEMA_VERSION,
     ExtractedData,
@@ -14,6 +15,7 @@ from waccy.core.models import (
     NormalizedFinancialDataset,
     PeriodType,
     ReportingPeriod,
+    SourceAccount,
     SourceRecord,
     SourceReference,
     StatementLine,
@@ -21,32 +23,53 @@ from waccy.core.models import (
     ValidatedFinancialDataset,
     ValidationIssue,
 )
-from waccy.core.ontology import AccountCategory, AccountType, StandardChartOfAccounts
+from waccy.core.ontology import (
+    AccountCategory,
+    AccountHierarchy,
+    AccountType,
+    CandidateMatches,
+    CompiledOntology,
+    ConceptTable,
+    StandardChartOfAccounts,
+    compiled_ontology,
+)
+from waccy.core.statement_values import PeriodIndex, PeriodValues, StatementValues
 from waccy.core.validation import validate_extracted_data, validate_mapped_dataset
 
 __all__ = [
     "CONTRACT_SCHEMA_VERSION",
     "AccountCategory",
+    "AccountHierarchy",
     "AccountType",
+    "CandidateMatches",
+    "CompiledOntology",
+    "ConceptTable",
     "ExtractedData",
     "ExtractedTransaction",
     "FinancialStatement",
     "IssueSeverity",
     "MappedFinancialDataset",
     "MappedFinancialRecord",
+    "MappedRecordBatch",
     "MappingDiagnostic",
     "MappingOverride",
     "MappingStatus",
     "NormalizedFinancialDataset",
+    "PeriodIndex",
     "PeriodType",
+    "PeriodValues",
     "ReportingPeriod",
+    "SourceAccount",
     "SourceRecord",
+    "SourceRecordBatch",
     "SourceReference",
     "StandardChartOfAccounts",
     "StatementLine",
+    "StatementValues",
     "ThreeStatementModel",
     "ValidatedFinancialDataset",
     "ValidationIssue",
+    "compiled_ontology",
     "validate_extracted_data",
     "validate_mapped_dataset",
 ]
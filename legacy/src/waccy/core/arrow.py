@@ -0,0 +1,504 @@
+"""Arrow interchange for normalized datasets, mapped datasets, and models.
+
+Requires the optional ``pyarrow`` dependency (``waccy[arrow]``). Tables carry one
+row per record, or per statement line and period for models; each line of a
+statement without periods gets one row with a null period and a zero amount,
+so the line survives the round trip. Strings are
+dictionary-encoded and amounts are ``decimal128(38, scale)`` at the smallest
+scale that holds every amount, so tables hand over to polars, pandas, and the
+Rust core without conversion. An ``amount_exponent`` column keeps the exponent
+each ``Decimal`` amount carried, so ``from_arrow`` reproduces the JSON contract
+exactly. Dataset-level fields travel as JSON in the table's schema metadata.
+"""
+
+from __future__ import annotations
+
+import json
+from decimal import Context, Decimal
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from pydantic_core import to_json
+
+from waccy.core.batch import (
+    MAPPING_STATUSES,
+    DictionaryColumn,
+    MappedRecordBatch,
+    SourceRecordBatch,
+    split_decimal,
+)
+from waccy.core.models import (
+    MappedFinancialDataset,
+    MappingDiagnostic,
+    MappingStatus,
+    NormalizedFinancialDataset,
+    ThreeStatementModel,
+)
+from waccy.core.trusted import construct
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+METADATA_KEY = b"waccy"
+_DECIMAL_PRECISION = 38
+_MAX_POWER = 18
+_EXACT = Context(prec=2 * _DECIMAL_PRECISION)
+
+
+def normalized_dataset_to_arrow(dataset: NormalizedFinancialDataset) -> Any:
+    """Return a normalized dataset as a ``pyarrow.Table`` with one row per record."""
+    pa = _pyarrow()
+    columns = _source_columns(_source_batch(dataset.records))
+    return pa.table(columns).replace_schema_metadata(
+        _schema_metadata("normalized", dataset.model_dump(mode="json", exclude={"records"}))
+    )
+
+
+def normalized_dataset_from_arrow(table: Any) -> NormalizedFinancialDataset:
+    """Rebuild a normalized dataset whose records are a ``SourceRecordBatch``."""
+    fields = _dataset_fields(table, "normalized")
+    dataset = NormalizedFinancialDataset.model_validate({**fields, "records": []})
+    return dataset.model_copy(update={"records": _source_batch_from_arrow(_combined(table))})
+
+
+def mapped_dataset_to_arrow(dataset: MappedFinancialDataset) -> Any:
+    """Return a mapped dataset as a ``pyarrow.Table`` with one row per record."""
+    pa = _pyarrow()
+    records = dataset.records
+    batch = (
+        records
+        if isinstance(records, MappedRecordBatch)
+        else MappedRecordBatch.from_records(records)
+    )
+    columns = _source_columns(_source_batch(batch.source))
+    account_ids = [account_id for account_id, _ in batch.accounts]
+    account_names = [account_name for _, account_name in batch.accounts]
+    columns["account_id"] = _dictionary(batch.account_codes, account_ids)
+    columns["account_name"] = _dictionary(batch.account_codes, account_names)
+    columns["status"] = _dictionary(
+        batch.status_codes.astype(np.int32), [status.value for status in MAPPING_STATUSES]
+    )
+    columns["confidence"] = pa.array(batch.confidences, type=pa.float64())
+    columns["diagnostics"] = pa.ListArray.from_arrays(
+        pa.array(batch.diagnostic_offsets, type=pa.int32()),
+        pa.array(
+            [{"code": item.code, "message": item.message} for item in batch.diagnostics],
+            type=pa.struct([("code", pa.string()), ("message", pa.string())]),
+        ),
+    )
+    override_notes: list[str | None] = [None] * len(batch)
+    for row, note in batch.override_notes.items():
+        override_notes[row] = note
+    columns["override_note"] = pa.array(override_notes, type=pa.string())
+    return pa.table(columns).replace_schema_metadata(
+        _schema_metadata("mapped", dataset.model_dump(mode="json", exclude={"records"}))
+    )
+
+
+def mapped_dataset_from_arrow(table: Any) -> MappedFinancialDataset:
+    """Rebuild a mapped dataset whose records are a ``MappedRecordBatch``."""
+    fields = _dataset_fields(table, "mapped")
+    dataset = MappedFinancialDataset.model_validate({**fields, "records": []})
+    table = _combined(table)
+    source = _source_batch_from_arrow(table)
+
+    account_ids = _dictionary_column(table.column("account_id"))
+    account_names = _dictionary_column(table.column("account_name"))
+    pairs, inverse = np.unique(
+        np.stack([account_ids.codes, account_names.codes]), axis=1, return_inverse=True
+    )
+    account_codes: np.ndarray = inverse.reshape(-1).astype(np.int32)
+    accounts = [
+        (account_ids.values[id_code], account_names.values[name_code])
+        for id_code, name_code in pairs.T.tolist()
+    ]
+    # Rows without a WACCY account share the -1 code whatever their name column says.
+    keep = [code for code, (account_id, _) in enumerate(accounts) if account_id is not None]
+    if len(keep) < len(accounts):
+        translation = np.full(len(accounts), -1, dtype=np.int32)
+        translation[keep] = np.arange(len(keep), dtype=np.int32)
+        account_codes = translation[account_codes]
+        accounts = [accounts[code] for code in keep]
+
+    statuses = _dictionary_column(table.column("status"))
+    status_translation = np.array(
+        [MAPPING_STATUSES.index(MappingStatus(value)) for value in statuses.values], dtype=np.int8
+    )
+    diagnostics = table.column("diagnostics").chunk(0) if len(table) else None
+    offsets = (
+        np.asarray(diagnostics.offsets, dtype=np.int32) - int(diagnostics.offsets[0].as_py())
+        if diagnostics is not None
+        else np.zeros(1, dtype=np.int32)
+    )
+    diagnostic_items = diagnostics.flatten().to_pylist() if diagnostics is not None else []
+
+    records = MappedRecordBatch(
+        source,
+        accounts=accounts,
+        account_codes=account_codes,
+        status_codes=status_translation[statuses.codes],
+        confidences=table.column("confidence").to_numpy(),
+        diagnostic_offsets=offsets,
+        diagnostics=[
+            construct(MappingDiagnostic, code=item["code"], message=item["message"])
+            for item in diagnostic_items
+        ],
+        override_notes={
+            row: note
+            for row, note in enumerate(table.column("override_note").to_pylist())
+            if note is not None
+        },
+    )
+    return dataset.model_copy(update={"records": records})
+
+
+def model_to_arrow(model: ThreeStatementModel) -> Any:
+    """Return a model as a long ``pyarrow.Table`` with one row per line and period."""
+    pa = _pyarrow()
+    statements = (model.income_statement, model.balance_sheet, model.cash_flow_statement)
+    statement_codes: list[np.ndarray] = []
+    line_numbers: list[np.ndarray] = []
+    line_rows: list[np.ndarray] = []
+    period_codes: list[np.ndarray] = []
+    amounts: list[Decimal] = []
+    period_labels: dict[str, int] = {}
+    line_count = 0
+    for statement_code, statement in enumerate(statements):
+        table = statement.value_table()
+        rows, columns = table.amounts.shape
+        codes = np.array(
+            [period_labels.setdefault(label, len(period_labels)) for label in table.periods],
+            dtype=np.int32,
+        )
+        if columns:
+            amounts.extend(table.amounts.reshape(-1).tolist())
+        else:
+            codes = np.full(1, -1, dtype=np.int32)
+            columns = 1
+            amounts.extend([Decimal(0)] * rows)
+        statement_codes.append(np.full(rows * columns, statement_code, dtype=np.int32))
+        line_numbers.append(np.repeat(np.arange(rows, dtype=np.int32), columns))
+        line_rows.append(np.repeat(np.arange(line_count, line_count + rows), columns))
+        period_codes.append(np.tile(codes, rows))
+        line_count += rows
+
+    lines = [line for statement in statements for line in statement.lines]
+    line_columns = pa.table(
+        {
+            "label": pa.array([line.label for line in lines], type=pa.string()),
+            "account_id": pa.array([line.account_id for line in lines], type=pa.string()),
+            "is_subtotal": pa.array([line.is_subtotal for line in lines], type=pa.bool_()),
+            "is_check": pa.array([line.is_check for line in lines], type=pa.bool_()),
+            "source_account_ids": pa.array(
+                [line.source_account_ids for line in lines], type=pa.list_(pa.string())
+            ),
+            "metadata": _json_column([line.metadata for line in lines]),
+        }
+    ).take(pa.array(np.concatenate(line_rows), type=pa.int64()))
+    coefficients, exponents, overflow = _decimal_columns(amounts)
+    columns = {
+        "statement": _dictionary(
+            np.concatenate(statement_codes), [statement.name for statement in statements]
+        ),
+        "line": pa.array(np.concatenate(line_numbers), type=pa.int32()),
+        "label": line_columns.column("label").dictionary_encode(),
+        "account_id": line_columns.column("account_id").dictionary_encode(),
+        "period_label": _dictionary(np.concatenate(period_codes), list(period_labels)),
+        "amount": _decimal128(coefficients, exponents, overflow),
+        "amount_exponent": pa.array(exponents, type=pa.int16()),
+        "is_subtotal": line_columns.column("is_subtotal"),
+        "is_check": line_columns.column("is_check"),
+        "source_account_ids": line_columns.column("source_account_ids"),
+        "metadata": line_columns.column("metadata"),
+    }
+    fields = model.model_dump(
+        mode="json", exclude={"income_statement", "balance_sheet", "cash_flow_statement"}
+    )
+    fields["statements"] = [
+        {
+            "name": statement.name,
+            "periods": [period.model_dump(mode="json") for period in statement.periods],
+        }
+        for statement in statements
+    ]
+    return pa.table(columns).replace_schema_metadata(_schema_metadata("model", fields))
+
+
+def model_from_arrow(table: Any) -> ThreeStatementModel:
+    """Rebuild a model from ``model_to_arrow`` output."""
+    fields = _dataset_fields(table, "model")
+    statements = {
+        statement["name"]: {**statement, "lines": []} for statement in fields.pop("statements")
+    }
+    table = _combined(table)
+    columns = {
+        name: table.column(name).to_pylist()
+        for name in (
+            "statement",
+            "line",
+            "label",
+            "account_id",
+            "period_label",
+            "is_subtotal",
+            "is_check",
+            "source_account_ids",
+            "metadata",
+        )
+    }
+    lines: dict[tuple[str, int], dict[str, Any]] = {}
+    for row, amount in enumerate(_amounts_from_arrow(table)):
+        key = (columns["statement"][row], columns["line"][row])
+        line = lines.get(key)
+        if line is None:
+            metadata = columns["metadata"][row]
+            line = lines[key] = {
+                "label": columns["label"][row],
+                "account_id": columns["account_id"][row],
+                "values": {},
+                "is_subtotal": columns["is_subtotal"][row],
+                "is_check": columns["is_check"][row],
+                "source_account_ids": columns["source_account_ids"][row],
+                "metadata": json.loads(metadata) if metadata is not None else {},
+            }
+            statements[key[0]]["lines"].append(line)
+        if columns["period_label"][row] is not None:
+            line["values"][columns["period_label"][row]] = amount
+    return ThreeStatementModel.model_validate(
+        {
+            **fields,
+            "income_statement": statements["Income Statement"],
+            "balance_sheet": statements["Balance Sheet"],
+            "cash_flow_statement": statements["Cash Flow Statement"],
+        }
+    )
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow as pa  # noqa: PLC0415
+    except ImportError as error:
+        raise ImportError('Arrow interchange requires pyarrow; install "waccy[arrow]".') from error
+    return pa
+
+
+def _schema_metadata(kind: str, fields: dict[str, Any]) -> dict[bytes, bytes]:
+    return {METADATA_KEY: json.dumps({"kind": kind, "fields": fields}).encode()}
+
+
+def _dataset_fields(table: Any, kind: str) -> dict[str, Any]:
+    payload = (table.schema.metadata or {}).get(METADATA_KEY)
+    if payload is None:
+        raise ValueError("Arrow table is missing WACCY schema metadata.")
+    decoded = json.loads(payload)
+    if decoded.get("kind") != kind:
+        raise ValueError(f"Arrow table holds {decoded.get('kind')!r} data, not {kind!r}.")
+    fields: dict[str, Any] = decoded["fields"]
+    return fields
+
+
+def _combined(table: Any) -> Any:
+    return table.unify_dictionaries().combine_chunks()
+
+
+def _source_batch(records: Sequence[Any]) -> SourceRecordBatch:
+    if isinstance(records, SourceRecordBatch):
+        return records
+    return SourceRecordBatch.from_records(records)
+
+
+def _source_columns(batch: SourceRecordBatch) -> dict[str, Any]:
+    pa = _pyarrow()
+    exponents = batch.amount_exponents
+    overflow_exponents: dict[int, int] = {}
+    for row, amount in batch.amount_overflow.items():
+        exponent = amount.as_tuple().exponent
+        if not isinstance(exponent, int) or not -(2**15) <= exponent < 2**15:
+            raise ValueError(f"Amount {amount} cannot be stored as decimal128.")
+        overflow_exponents[row] = exponent
+    if overflow_exponents:
+        exponents = exponents.copy()
+        exponents[list(overflow_exponents)] = list(overflow_exponents.values())
+    return {
+        "source_account_id": _dictionary(batch.account_ids.codes, batch.account_ids.values),
+        "source_account_name": _dictionary(batch.account_names.codes, batch.account_names.values),
+        "amount": _decimal128(batch.amount_coefficients, exponents, batch.amount_overflow),
+        "amount_exponent": pa.array(exponents, type=pa.int16()),
+        "period_label": _dictionary(batch.periods.codes, batch.periods.values),
+        "source_system": _dictionary(batch.source_systems.codes, batch.source_systems.values),
+        "source_id": _dictionary(batch.source_ids.codes, batch.source_ids.values),
+        "source_label": _dictionary(batch.source_labels.codes, batch.source_labels.values),
+        "unit": _dictionary(batch.units.codes, batch.units.values),
+        "statement": _dictionary(batch.statements.codes, batch.statements.values),
+        "source_account_type": _dictionary(
+            batch.source_account_types.codes, batch.source_account_types.values
+        ),
+        "metadata": _sparse_json_column(batch.metadata, len(batch)),
+        "source_metadata": _sparse_json_column(batch.source_metadata, len(batch)),
+    }
+
+
+def _source_batch_from_arrow(table: Any) -> SourceRecordBatch:
+    coefficients, exponents, overflow = _decimal_parts_from_arrow(table)
+    return SourceRecordBatch(
+        account_ids=_dictionary_column(table.column("source_account_id")),
+        account_names=_dictionary_column(table.column("source_account_name")),
+        periods=_dictionary_column(table.column("period_label")),
+        statements=_dictionary_column(table.column("statement")),
+        source_account_types=_dictionary_column(table.column("source_account_type")),
+        units=_dictionary_column(table.column("unit")),
+        source_systems=_dictionary_column(table.column("source_system")),
+        source_ids=_dictionary_column(table.column("source_id")),
+        source_labels=_dictionary_column(table.column("source_label")),
+        amount_coefficients=coefficients,
+        amount_exponents=exponents,
+        amount_overflow=overflow,
+        metadata=_sparse_json_from_arrow(table.column("metadata")),
+        source_metadata=_sparse_json_from_arrow(table.column("source_metadata")),
+    )
+
+
+def _dictionary(codes: np.ndarray, values: Sequence[str | None]) -> Any:
+    """Return a dictionary array; negative codes and ``None`` values become nulls."""
+    pa = _pyarrow()
+    null_values = np.array([value is None for value in values], dtype=bool)
+    mask = codes < 0
+    if null_values.any():
+        mask = mask | null_values[np.where(mask, 0, codes)]
+    dictionary = pa.array(["" if value is None else value for value in values], type=pa.string())
+    indices = np.asarray(codes, dtype=np.int32)
+    if not mask.any():
+        return pa.DictionaryArray.from_arrays(indices, dictionary)
+    if not len(dictionary):
+        return pa.nulls(len(indices), type=pa.dictionary(pa.int32(), pa.string()))
+    indices = np.where(mask, 0, indices).astype(np.int32)
+    return pa.DictionaryArray.from_arrays(indices, dictionary, mask=mask)
+
+
+def _dictionary_column(column: Any) -> DictionaryColumn:
+    """Return an Arrow string column as a ``DictionaryColumn``; nulls decode to ``None``."""
+    pa = _pyarrow()
+    array = column.chunk(0) if column.num_chunks else pa.array([], type=pa.string())
+    if not pa.types.is_dictionary(array.type):
+        array = array.cast(pa.string()).dictionary_encode()
+    values: list[str | None] = array.dictionary.to_pylist()
+    indices = array.indices
+    if indices.null_count:
+        indices = indices.fill_null(len(values))
+        values.append(None)
+    return DictionaryColumn(np.asarray(indices.to_numpy(), dtype=np.int32), values)
+
+
+def _decimal_columns(
+    amounts: Sequence[Decimal],
+) -> tuple[np.ndarray, np.ndarray, dict[int, Decimal]]:
+    coefficients = np.zeros(len(amounts), dtype=np.int64)
+    exponents = np.zeros(len(amounts), dtype=np.int16)
+    overflow: dict[int, Decimal] = {}
+    for row, amount in enumerate(amounts):
+        parts = split_decimal(amount)
+        if parts is None:
+            exponent = amount.as_tuple().exponent
+            if not isinstance(exponent, int) or not -(2**15) <= exponent < 2**15:
+                raise ValueError(f"Amount {amount} cannot be stored as decimal128.")
+            overflow[row] = amount
+            exponents[row] = exponent
+        else:
+            coefficients[row], exponents[row] = parts
+    return coefficients, exponents, overflow
+
+
+def _decimal128(
+    coefficients: np.ndarray,
+    exponents: np.ndarray,
+    overflow: dict[int, Decimal],
+) -> Any:
+    """Return exact ``decimal128`` amounts at the smallest scale that holds them all.
+
+    Rows whose scaled value fits int64 are written straight into the 128-bit
+    buffer; anything wider goes through pyarrow's ``Decimal`` conversion.
+    """
+    pa = _pyarrow()
+    scale = max(0, -int(exponents.min())) if len(exponents) else 0
+    if scale > _DECIMAL_PRECISION:
+        raise ValueError(f"Amounts need {scale} decimal places; decimal128 holds at most 38.")
+    decimal_type = pa.decimal128(_DECIMAL_PRECISION, scale)
+    shift = exponents.astype(np.int64) + scale
+    fits = shift <= _MAX_POWER
+    power = np.power(10, np.where(fits, shift, 0), dtype=np.int64)
+    fits &= np.abs(coefficients.astype(np.float64)) * power.astype(np.float64) < 2.0**62
+    if overflow:
+        fits[list(overflow)] = False
+    if not fits.all():
+        amounts = [
+            overflow.get(row, Decimal(int(coefficient)).scaleb(int(exponent)))
+            for row, (coefficient, exponent) in enumerate(
+                zip(coefficients.tolist(), exponents.tolist(), strict=True)
+            )
+        ]
+        try:
+            return pa.array(amounts, type=decimal_type)
+        except (pa.ArrowInvalid, OverflowError) as error:
+            raise ValueError(f"Amounts do not fit decimal128(38, {scale}).") from error
+    words = np.empty((len(coefficients), 2), dtype=np.int64)
+    words[:, 0] = coefficients * power
+    words[:, 1] = np.where(words[:, 0] < 0, -1, 0)
+    return pa.Array.from_buffers(decimal_type, len(coefficients), [None, pa.py_buffer(words)])
+
+
+def _decimal_parts_from_arrow(table: Any) -> tuple[np.ndarray, np.ndarray, dict[int, Decimal]]:
+    """Return int64 coefficients, exponents, and wide amounts from decimal columns."""
+    pa = _pyarrow()
+    amount = table.column("amount").chunk(0) if len(table) else None
+    exponents = np.asarray(table.column("amount_exponent").to_numpy(), dtype=np.int16)
+    if amount is None:
+        return np.zeros(0, dtype=np.int64), exponents, {}
+    if not pa.types.is_decimal128(amount.type) or amount.null_count:
+        raise ValueError("Arrow amount column must be a non-null decimal128 column.")
+    buffer = np.frombuffer(amount.buffers()[1], dtype=np.int64)
+    words = buffer[2 * amount.offset : 2 * (amount.offset + len(amount))].reshape(-1, 2)
+    low = words[:, 0]
+    shift = exponents.astype(np.int64) + amount.type.scale
+    narrow = (words[:, 1] == np.where(low < 0, -1, 0)) & (shift >= 0) & (shift <= _MAX_POWER)
+    power = np.power(10, np.where(narrow, shift, 0), dtype=np.int64)
+    narrow &= low % power == 0
+    coefficients = np.where(narrow, low // power, 0)
+    overflow: dict[int, Decimal] = {}
+    for row in np.flatnonzero(~narrow).tolist():
+        overflow[row] = _with_exponent(amount[row].as_py(), int(exponents[row]))
+    return coefficients, np.where(narrow, exponents, 0).astype(np.int16), overflow
+
+
+def _amounts_from_arrow(table: Any) -> list[Decimal]:
+    coefficients, exponents, overflow = _decimal_parts_from_arrow(table)
+    return [
+        overflow[row] if row in overflow else Decimal(coefficient).scaleb(exponent)
+        for row, (coefficient, exponent) in enumerate(
+            zip(coefficients.tolist(), exponents.tolist(), strict=True)
+        )
+    ]
+
+
+def _with_exponent(value: Decimal, exponent: int) -> Decimal:
+    return _EXACT.quantize(value, Decimal((0, (1,), exponent)))
+
+
+def _json_column(values: Sequence[dict[str, Any]]) -> Any:
+    pa = _pyarrow()
+    return pa.array(
+        [to_json(value).decode() if value else None for value in values], type=pa.string()
+    )
+
+
+def _sparse_json_column(values: Mapping[int, dict[str, Any]], length: int) -> Any:
+    pa = _pyarrow()
+    column: list[str | None] = [None] * length
+    for row, value in values.items():
+        if value:
+            column[row] = to_json(value).decode()
+    return pa.array(column, type=pa.string())
+
+
+def _sparse_json_from_arrow(column: Any) -> dict[int, dict[str, Any]]:
+    return {
+        row: json.loads(value) for row, value in enumerate(column.to_pylist()) if value is not None
+    }
@@ -0,0 +1,688 @@
+"""Columnar record storage for large normalized and mapped datasets.
+
+``SourceRecordBatch`` and ``MappedRecordBatch`` are drop-in stand-ins for the
+``records`` lists on ``NormalizedFinancialDataset`` and ``MappedFinancialDataset``.
+Repeated identifiers are dictionary-encoded, amounts live in contiguous integer
+columns, and pydantic row views are only created when a caller indexes or
+iterates the batch.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, overload
+
+import numpy as np
+
+from waccy.core.models import (
+    MappedFinancialRecord,
+    MappingDiagnostic,
+    MappingStatus,
+    SourceRecord,
+    SourceReference,
+)
+from waccy.core.trusted import construct
+
+ZERO = Decimal("0")
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+_EXPONENT_MIN = -(2**15)
+_EXPONENT_MAX = 2**15 - 1
+
+
+class DictionaryColumn:
+    """A dictionary-encoded column: one integer code per row into distinct values."""
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self, codes: np.ndarray, values: Sequence[Any]) -> None:
+        """Initialize the column from row codes and the distinct value table.
+
+        ``values`` is kept as given, so a snapshot can decode it on first use.
+        """
+        self.codes = codes
+        self.values = values
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Any:
+        """Return the decoded value for one row."""
+        return self.values[self.codes[index]]
+
+    def decode(self) -> list[Any]:
+        """Return every row value as a plain list."""
+        values = self.values
+        return [values[code] for code in self.codes.tolist()]
+
+    def remap(self, transform: Callable[[Any], Any]) -> DictionaryColumn:
+        """Return a column with ``transform`` applied to each distinct value.
+
+        Values that collapse onto the same result are re-encoded to a single code.
+        """
+        encoder = _DictionaryEncoder()
+        translation = np.fromiter(
+            (encoder.code(transform(value)) for value in self.values),
+            dtype=np.int32,
+            count=len(self.values),
+        )
+        codes = translation[self.codes] if len(self.codes) else self.codes.copy()
+        return DictionaryColumn(codes, encoder.values)
+
+
+class _DictionaryEncoder:
+    def __init__(self) -> None:
+        self._index: dict[Hashable, int] = {}
+        self.values: list[Any] = []
+        self.codes: list[int] = []
+
+    def code(self, value: Hashable) -> int:
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self._index[value] = code
+            self.values.append(value)
+        return code
+
+    def append(self, value: Hashable) -> None:
+        self.codes.append(self.code(value))
+
+    def finish(self) -> DictionaryColumn:
+        return DictionaryColumn(np.array(self.codes, dtype=np.int32), self.values)
+
+
+def split_decimal(value: Decimal) -> tuple[int, int] | None:
+    """Return ``(coefficient, exponent)`` when ``value`` fits an int64 coefficient."""
+    sign, digits, exponent = value.as_tuple()
+    if not isinstance(exponent, int) or not _EXPONENT_MIN <= exponent <= _EXPONENT_MAX:
+        return None
+    coefficient = 0
+    for digit in digits:
+        coefficient = coefficient * 10 + digit
+    if sign:
+        if coefficient == 0:
+            return None
+        coefficient = -coefficient
+    if not _INT64_MIN <= coefficient <= _INT64_MAX:
+        return None
+    return coefficient, exponent
+
+
+class SourceRecordBatchBuilder:
+    """Accumulate source record fields column by column."""
+
+    def __init__(self) -> None:
+        """Initialize empty column encoders."""
+        self._account_ids = _DictionaryEncoder()
+        self._account_names = _DictionaryEncoder()
+        self._periods = _DictionaryEncoder()
+        self._statements = _DictionaryEncoder()
+        self._source_account_types = _DictionaryEncoder()
+        self._units = _DictionaryEncoder()
+        self._source_systems = _DictionaryEncoder()
+        self._source_ids = _DictionaryEncoder()
+        self._source_labels = _DictionaryEncoder()
+        self._coefficients: list[int] = []
+        self._exponents: list[int] = []
+        self._amount_overflow: dict[int, Decimal] = {}
+        self._metadata: dict[int, dict[str, Any]] = {}
+        self._source_metadata: dict[int, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of appended rows."""
+        return len(self._coefficients)
+
+    def append(
+        self,
+        *,
+        source_account_id: str,
+        source_account_name: str,
+        amount: Decimal,
+        period_label: str,
+        source_system: str,
+        source_id: str,
+        source_label: str = "",
+        source_metadata: dict[str, Any] | None = None,
+        unit: str = "USD",
+        statement: str | None = None,
+        source_account_type: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Append one source record's field values."""
+        row = len(self._coefficients)
+        self._account_ids.append(source_account_id)
+        self._account_names.append(source_account_name)
+        self._periods.append(period_label)
+        self._statements.append(statement)
+        self._source_account_types.append(source_account_type)
+        self._units.append(unit)
+        self._source_systems.append(source_system)
+        self._source_ids.append(source_id)
+        self._source_labels.append(source_label)
+        split = split_decimal(amount)
+        if split is None:
+            self._amount_overflow[row] = amount
+            split = (0, 0)
+        self._coefficients.append(split[0])
+        self._exponents.append(split[1])
+        if metadata:
+            self._metadata[row] = metadata
+        if source_metadata:
+            self._source_metadata[row] = source_metadata
+
+    def append_record(self, record: SourceRecord) -> None:
+        """Append the fields of an existing source record."""
+        self.append(
+            source_account_id=record.source_account_id,
+            source_account_name=record.source_account_name,
+            amount=record.amount,
+            period_label=record.period_label,
+            source_system=record.source.source_system,
+            source_id=record.source.source_id,
+            source_label=record.source.source_label,
+            source_metadata=record.source.metadata,
+            unit=record.unit,
+            statement=record.statement,
+            source_account_type=record.source_account_type,
+            metadata=record.metadata,
+        )
+
+    def build(self) -> SourceRecordBatch:
+        """Return the accumulated rows as a batch."""
+        return SourceRecordBatch(
+            account_ids=self._account_ids.finish(),
+            account_names=self._account_names.finish(),
+            periods=self._periods.finish(),
+            statements=self._statements.finish(),
+            source_account_types=self._source_account_types.finish(),
+            units=self._units.finish(),
+            source_systems=self._source_systems.finish(),
+            source_ids=self._source_ids.finish(),
+            source_labels=self._source_labels.finish(),
+            amount_coefficients=np.array(self._coefficients, dtype=np.int64),
+            amount_exponents=np.array(self._exponents, dtype=np.int16),
+            amount_overflow=self._amount_overflow,
+            metadata=self._metadata,
+            source_metadata=self._source_metadata,
+        )
+
+
+class SourceRecordBatch(Sequence[SourceRecord]):
+    """Struct-of-arrays storage for ``SourceRecord`` rows.
+
+    Amounts are stored as an int64 coefficient column plus an exponent column so
+    that row views reproduce the original ``Decimal`` exactly. Values that do not
+    fit are kept in a sparse ``amount_overflow`` sidecar, as are non-empty
+    record and source metadata dictionaries.
+    """
+
+    def __init__(
+        self,
+        *,
+        account_ids: DictionaryColumn,
+        account_names: DictionaryColumn,
+        periods: DictionaryColumn,
+        statements: DictionaryColumn,
+        source_account_types: DictionaryColumn,
+        units: DictionaryColumn,
+        source_systems: DictionaryColumn,
+        source_ids: DictionaryColumn,
+        source_labels: DictionaryColumn,
+        amount_coefficients: np.ndarray,
+        amount_exponents: np.ndarray,
+        amount_overflow: dict[int, Decimal] | None = None,
+        metadata: Mapping[int, dict[str, Any]] | None = None,
+        source_metadata: Mapping[int, dict[str, Any]] | None = None,
+    ) -> None:
+        """Initialize the batch from prebuilt columns."""
+        self.account_ids = account_ids
+        self.account_names = account_names
+        self.periods = periods
+        self.statements = statements
+        self.source_account_types = source_account_types
+        self.units = units
+        self.source_systems = source_systems
+        self.source_ids = source_ids
+        self.source_labels = source_labels
+        self.amount_coefficients = amount_coefficients
+        self.amount_exponents = amount_exponents
+        self.amount_overflow = amount_overflow or {}
+        self.metadata = metadata or {}
+        self.source_metadata = source_metadata or {}
+
+    @classmethod
+    def from_records(cls, records: Iterable[SourceRecord]) -> SourceRecordBatch:
+        """Encode existing source records into columns."""
+        builder = SourceRecordBatchBuilder()
+        for record in records:
+            builder.append_record(record)
+        return builder.build()
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.amount_coefficients)
+
+    @overload
+    def __getitem__(self, index: int) -> SourceRecord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[SourceRecord]: ...
+
+    def __getitem__(self, index: int | slice) -> SourceRecord | list[SourceRecord]:
+        """Return a lazily created row view, or a list of views for a slice."""
+        if isinstance(index, slice):
+            return [self.row(row) for row in range(*index.indices(len(self)))]
+        return self.row(_normalize_index(index, len(self)))
+
+    def __iter__(self) -> Iterator[SourceRecord]:
+        """Iterate over row views."""
+        for row in range(len(self)):
+            yield self.row(row)
+
+    def __repr__(self) -> str:
+        """Return a compact representation."""
+        return f"{type(self).__name__}(rows={len(self)})"
+
+    def amount(self, row: int) -> Decimal:
+        """Return one row's amount as an exact ``Decimal``."""
+        overflow = self.amount_overflow.get(row)
+        if overflow is not None:
+            return overflow
+        return Decimal(int(self.amount_coefficients[row])).scaleb(int(self.amount_exponents[row]))
+
+    def amounts(self) -> list[Decimal]:
+        """Return every amount as an exact ``Decimal``."""
+        overflow = self.amount_overflow
+        return [
+            overflow[row] if row in overflow else Decimal(coefficient).scaleb(exponent)
+            for row, (coefficient, exponent) in enumerate(
+                zip(
+                    self.amount_coefficients.tolist(),
+                    self.amount_exponents.tolist(),
+                    strict=True,
+                )
+            )
+        ]
+
+    def row(self, row: int) -> SourceRecord:
+        """Build the pydantic view for one row without re-validating it."""
+        return construct(
+            SourceRecord,
+            source_account_id=self.account_ids[row],
+            source_account_name=self.account_names[row],
+            amount=self.amount(row),
+            period_label=self.periods[row],
+            source=construct(
+                SourceReference,
+                source_system=self.source_systems[row],
+                source_id=self.source_ids[row],
+                source_label=self.source_labels[row],
+                metadata=self.source_metadata.get(row, {}),
+            ),
+            unit=self.units[row],
+            statement=self.statements[row],
+            source_account_type=self.source_account_types[row],
+            metadata=self.metadata.get(row, {}),
+        )
+
+    def to_records(self) -> list[SourceRecord]:
+        """Materialize every row view."""
+        return list(self)
+
+    def with_period_labels(self, labels: dict[str, str]) -> SourceRecordBatch:
+        """Return a batch with period labels rewritten through ``labels``.
+
+        Only the period dictionary is touched; every other column is shared.
+        """
+        return SourceRecordBatch(
+            account_ids=self.account_ids,
+            account_names=self.account_names,
+            periods=self.periods.remap(lambda label: labels.get(label, label)),
+            statements=self.statements,
+            source_account_types=self.source_account_types,
+            units=self.units,
+            source_systems=self.source_systems,
+            source_ids=self.source_ids,
+            source_labels=self.source_labels,
+            amount_coefficients=self.amount_coefficients,
+            amount_exponents=self.amount_exponents,
+            amount_overflow=self.amount_overflow,
+            metadata=self.metadata,
+            source_metadata=self.source_metadata,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class MappingDecision:
+    """One mapping outcome shared by every record with the same mapping key."""
+
+    status: MappingStatus
+    confidence: float
+    account_id: str | None = None
+    account_name: str | None = None
+    diagnostics: tuple[MappingDiagnostic, ...] = ()
+    override_note: str | None = None
+
+    def to_record(self, source_record: SourceRecord) -> MappedFinancialRecord:
+        """Return the mapped record for one already-validated source record."""
+        return construct(
+            MappedFinancialRecord,
+            source_record=source_record,
+            account_id=self.account_id,
+            account_name=self.account_name,
+            status=self.status,
+            confidence=self.confidence,
+            diagnostics=list(self.diagnostics),
+            override_note=self.override_note,
+        )
+
+
+@dataclass(slots=True)
+class AccountPeriodTotals:
+    """Per-period totals and contributing source accounts for one WACCY account."""
+
+    values: dict[str, Decimal]
+    source_account_ids: set[str] = field(default_factory=set)
+
+
+MAPPING_STATUSES: tuple[MappingStatus, ...] = tuple(MappingStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(MAPPING_STATUSES)}
+_ISSUE_STATUS_CODES = [
+    _STATUS_CODES[MappingStatus.UNMAPPED],
+    _STATUS_CODES[MappingStatus.AMBIGUOUS],
+    _STATUS_CODES[MappingStatus.OVERRIDDEN],
+]
+
+
+class MappedRecordBatch(Sequence[MappedFinancialRecord]):
+    """Mapping results stored as parallel arrays indexed against normalized records.
+
+    Row ``i`` maps ``source[i]``, which is either a ``SourceRecordBatch`` or the
+    normalized record list itself, so source records are never copied.
+    ``account_codes`` indexes ``accounts`` (``-1`` for no account),
+    ``status_codes`` indexes ``MAPPING_STATUSES``, and the row's diagnostics are
+    ``diagnostics[diagnostic_offsets[i]:diagnostic_offsets[i + 1]]``.
+    """
+
+    def __init__(
+        self,
+        source: Sequence[SourceRecord],
+        *,
+        accounts: Sequence[tuple[str, str | None]],
+        account_codes: np.ndarray,
+        status_codes: np.ndarray,
+        confidences: np.ndarray,
+        diagnostic_offsets: np.ndarray,
+        diagnostics: Sequence[MappingDiagnostic] = (),
+        override_notes: dict[int, str] | None = None,
+    ) -> None:
+        """Initialize the batch from per-row mapping arrays."""
+        rows = len(source)
+        if not len(account_codes) == len(status_codes) == len(confidences) == rows:
+            raise ValueError("Mapped record batch needs one mapping entry per source row.")
+        if len(diagnostic_offsets) != rows + 1:
+            raise ValueError("Mapped record batch needs one diagnostic offset per row plus one.")
+        self.source = source
+        self.accounts = list(accounts)
+        self.account_codes = account_codes
+        self.status_codes = status_codes
+        self.confidences = confidences
+        self.diagnostic_offsets = diagnostic_offsets
+        self.diagnostics = diagnostics
+        self.override_notes = override_notes or {}
+        self._totals: dict[tuple[str, ...], dict[str, AccountPeriodTotals]] = {}
+
+    @classmethod
+    def from_decisions(
+        cls,
+        source: Sequence[SourceRecord],
+        decisions: Sequence[MappingDecision],
+        decision_codes: np.ndarray,
+    ) -> MappedRecordBatch:
+        """Expand shared mapping decisions into per-row arrays."""
+        if len(decision_codes) != len(source):
+            raise ValueError("Mapped record batch needs one decision code per source row.")
+        account_lookup: dict[tuple[str, str | None], int] = {}
+        decision_accounts = np.array(
+            [
+                -1
+                if decision.account_id is None
+                else account_lookup.setdefault(
+                    (decision.account_id, decision.account_name), len(account_lookup)
+                )
+                for decision in decisions
+            ],
+            dtype=np.int32,
+        )
+        decision_statuses = np.array(
+            [_STATUS_CODES[decision.status] for decision in decisions], dtype=np.int8
+        )
+        decision_confidences = np.array(
+            [decision.confidence for decision in decisions], dtype=np.float64
+        )
+        decision_diagnostic_counts = np.array(
+            [len(decision.diagnostics) for decision in decisions], dtype=np.int32
+        )
+
+        counts = decision_diagnostic_counts[decision_codes]
+        diagnostic_offsets = np.zeros(len(decision_codes) + 1, dtype=np.int32)
+        np.cumsum(counts, out=diagnostic_offsets[1:])
+        diagnostics: list[MappingDiagnostic] = []
+        for code in decision_codes[counts > 0].tolist():
+            diagnostics.extend(decisions[code].diagnostics)
+
+        noted = np.array([decision.override_note is not None for decision in decisions], dtype=bool)
+        override_notes: dict[int, str] = {}
+        if len(decisions) and noted.any():
+            for row in np.flatnonzero(noted[decision_codes]).tolist():
+                note = decisions[int(decision_codes[row])].override_note
+                if note is not None:
+                    override_notes[row] = note
+
+        return cls(
+            source,
+            accounts=list(account_lookup),
+            account_codes=decision_accounts[decision_codes],
+            status_codes=decision_statuses[decision_codes],
+            confidences=decision_confidences[decision_codes],
+            diagnostic_offsets=diagnostic_offsets,
+            diagnostics=diagnostics,
+            override_notes=override_notes,
+        )
+
+    @classmethod
+    def from_records(cls, records: Sequence[MappedFinancialRecord]) -> MappedRecordBatch:
+        """Build a batch from mapped records, keeping their source records by reference."""
+        decisions: list[MappingDecision] = []
+        decision_lookup: dict[tuple[Any, ...], int] = {}
+        codes = []
+        for record in records:
+            key = (
+                record.status,
+                record.confidence,
+                record.account_id,
+                record.account_name,
+                tuple((diagnostic.code, diagnostic.message) for diagnostic in record.diagnostics),
+                record.override_note,
+            )
+            code = decision_lookup.get(key)
+            if code is None:
+                code = decision_lookup[key] = len(decisions)
+                decisions.append(
+                    MappingDecision(
+                        status=record.status,
+                        confidence=record.confidence,
+                        account_id=record.account_id,
+                        account_name=record.account_name,
+                        diagnostics=tuple(record.diagnostics),
+                        override_note=record.override_note,
+                    )
+                )
+            codes.append(code)
+        return cls.from_decisions(
+            [record.source_record for record in records],
+            decisions,
+            np.array(codes, dtype=np.int32),
+        )
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.status_codes)
+
+    @overload
+    def __getitem__(self, index: int) -> MappedFinancialRecord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[MappedFinancialRecord]: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> MappedFinancialRecord | list[MappedFinancialRecord]:
+        """Return a lazily created row view, or a list of views for a slice."""
+        if isinstance(index, slice):
+            return [self.row(row) for row in range(*index.indices(len(self)))]
+        return self.row(_normalize_index(index, len(self)))
+
+    def __iter__(self) -> Iterator[MappedFinancialRecord]:
+        """Iterate over row views."""
+        for row in range(len(self)):
+            yield self.row(row)
+
+    def __repr__(self) -> str:
+        """Return a compact representation."""
+        return f"{type(self).__name__}(rows={len(self)}, accounts={len(self.accounts)})"
+
+    def account_id(self, row: int) -> str | None:
+        """Return the WACCY account id for one row."""
+        code = int(self.account_codes[row])
+        return self.accounts[code][0] if code >= 0 else None
+
+    def account_ids(self) -> list[str | None]:
+        """Return the WACCY account id for every row."""
+        account_ids = [account_id for account_id, _ in self.accounts]
+        return [account_ids[code] if code >= 0 else None for code in self.account_codes.tolist()]
+
+    def status(self, row: int) -> MappingStatus:
+        """Return the mapping status for one row."""
+        return MAPPING_STATUSES[int(self.status_codes[row])]
+
+    def issue_rows(self) -> np.ndarray:
+        """Return a mask of rows whose mapping status or account needs validation."""
+        mask: np.ndarray = np.isin(self.status_codes, _ISSUE_STATUS_CODES) | (
+            self.account_codes < 0
+        )
+        return mask
+
+    def decision(self, row: int) -> MappingDecision:
+        """Return the mapping decision for one row."""
+        code = int(self.account_codes[row])
+        account_id, account_name = self.accounts[code] if code >= 0 else (None, None)
+        start, end = self.diagnostic_offsets[row : row + 2].tolist()
+        return MappingDecision(
+            status=self.status(row),
+            confidence=float(self.confidences[row]),
+            account_id=account_id,
+            account_name=account_name,
+            diagnostics=tuple(self.diagnostics[start:end]),
+            override_note=self.override_notes.get(row),
+        )
+
+    def row(self, row: int) -> MappedFinancialRecord:
+        """Build the pydantic view for one row without re-validating it."""
+        source_record = (
+            self.source.row(row) if isinstance(self.source, SourceRecordBatch) else self.source[row]
+        )
+        return self.decision(row).to_record(source_record)
+
+    def to_records(self) -> list[MappedFinancialRecord]:
+        """Materialize every row view."""
+        return list(self)
+
+    def to_columns(self) -> dict[str, Any]:
+        """Return the JSON-compatible reference form, indexed by normalized record row."""
+        return {
+            "accounts": [list(account) for account in self.accounts],
+            "account_codes": self.account_codes.tolist(),
+            "statuses": [status.value for status in MAPPING_STATUSES],
+            "status_codes": self.status_codes.tolist(),
+            "confidences": self.confidences.tolist(),
+            "diagnostic_offsets": self.diagnostic_offsets.tolist(),
+            "diagnostics": [diagnostic.model_dump(mode="json") for diagnostic in self.diagnostics],
+            "override_notes": {str(row): note for row, note in self.override_notes.items()},
+        }
+
+    @classmethod
+    def from_columns(
+        cls,
+        source: Sequence[SourceRecord],
+        columns: dict[str, Any],
+    ) -> MappedRecordBatch:
+        """Rebuild a batch from ``to_columns`` output and its normalized records."""
+        statuses = [MappingStatus(value) for value in columns["statuses"]]
+        return cls(
+            source,
+            accounts=[
+                (account_id, account_name) for account_id, account_name in columns["accounts"]
+            ],
+            account_codes=np.array(columns["account_codes"], dtype=np.int32),
+            status_codes=np.array(
+                [_STATUS_CODES[statuses[code]] for code in columns["status_codes"]],
+                dtype=np.int8,
+            ),
+            confidences=np.array(columns["confidences"], dtype=np.float64),
+            diagnostic_offsets=np.array(columns["diagnostic_offsets"], dtype=np.int32),
+            diagnostics=[
+                MappingDiagnostic.model_validate(diagnostic)
+                for diagnostic in columns["diagnostics"]
+            ],
+            override_notes={int(row): note for row, note in columns["override_notes"].items()},
+        )
+
+    def account_period_totals(self, period_labels: Sequence[str]) -> dict[str, AccountPeriodTotals]:
+        """Return per-account totals over ``period_labels``, computed once per label set."""
+        key = tuple(period_labels)
+        cached = self._totals.get(key)
+        if cached is not None:
+            return cached
+
+        wanted = set(period_labels)
+        account_ids = [account_id for account_id, _ in self.accounts]
+        totals: dict[str, AccountPeriodTotals] = {}
+        for account_code, (period_label, amount, source_account_id) in zip(
+            self.account_codes.tolist(), self._source_amounts(), strict=True
+        ):
+            if account_code < 0 or period_label not in wanted:
+                continue
+            account_id = account_ids[account_code]
+            entry = totals.get(account_id)
+            if entry is None:
+                entry = AccountPeriodTotals(values=dict.fromkeys(period_labels, ZERO))
+                totals[account_id] = entry
+            entry.values[period_label] += amount
+            entry.source_account_ids.add(source_account_id)
+        self._totals[key] = totals
+        return totals
+
+    def _source_amounts(self) -> Iterator[tuple[str, Decimal, str]]:
+        if isinstance(self.source, SourceRecordBatch):
+            source = self.source
+            yield from zip(
+                source.periods.decode(),
+                source.amounts(),
+                source.account_ids.decode(),
+                strict=True,
+            )
+            return
+        for record in self.source:
+            yield record.period_label, record.amount, record.source_account_id
+
+
+def _normalize_index(index: int, length: int) -> int:
+    if index < 0:
+        index += length
+    if not 0 <= index < length:
+        raise IndexError("record batch index out of range")
+    return index
@@ -0,0 +1,129 @@
+"""Trigram index for approximate account-name lookup.
+
+Every alias is split into lowercase words, and each word padded to ``"  word "``
+contributes its character trigrams, as PostgreSQL's ``pg_trgm`` does. Postings
+map each trigram to the aliases containing it, so a query only touches the
+aliases that share at least one trigram with it and scores them with the Dice
+coefficient of the two trigram sets.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+@dataclass(frozen=True, slots=True)
+class FuzzyMatch:
+    """A candidate account for an approximate name match."""
+
+    account_id: str
+    alias: str
+    score: float
+
+
+class TrigramIndex:
+    """Inverted trigram index over ``(alias, account_id)`` entries.
+
+    Aliases are normalized and postings built on the first search, so compiling
+    an ontology does not pay for an index that only the fuzzy mapping tier uses.
+    """
+
+    __slots__ = ("_account_ids", "_aliases", "_entries", "_postings", "_sizes", "_version")
+
+    def __init__(self, entries: Iterable[tuple[str, str]]) -> None:
+        """Index ``entries``; aliases that normalize alike share one entry."""
+        self._entries = list(entries)
+        self._aliases: list[str] = []
+        self._account_ids: list[tuple[str, ...]] = []
+        self._postings: dict[str, np.ndarray] | None = None
+        self._sizes = np.empty(0, dtype=np.int32)
+        self._version: str | None = None
+
+    def __len__(self) -> int:
+        """Return the number of distinct normalized aliases."""
+        if self._postings is None:
+            self._build()
+        return len(self._aliases)
+
+    @property
+    def version(self) -> str:
+        """Return a digest of the indexed entries, which decide every search result."""
+        if self._version is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for alias, account_id in self._entries:
+                digest.update(f"{alias}\0{account_id}\0".encode())
+            self._version = digest.hexdigest()
+        return self._version
+
+    def search(self, text: str, limit: int = 5, min_score: float = 0.3) -> list[FuzzyMatch]:
+        """Return up to ``limit`` accounts whose aliases resemble ``text``.
+
+        Each account is scored by its closest alias; matches are ordered by score,
+        best first, and those scoring below ``min_score`` are dropped.
+        """
+        postings = self._postings if self._postings is not None else self._build()
+        grams = trigrams(text)
+        hits = [postings[gram] for gram in grams if gram in postings]
+        if not hits or limit <= 0:
+            return []
+        shared = np.bincount(np.concatenate(hits), minlength=len(self._aliases))
+        positions = np.flatnonzero(shared)
+        scores = 2 * shared[positions] / (len(grams) + self._sizes[positions])
+        keep = scores >= min_score
+        positions = positions[keep]
+        scores = scores[keep]
+
+        matches: dict[str, FuzzyMatch] = {}
+        for row in np.lexsort((positions, -scores)).tolist():
+            alias = self._aliases[positions[row]]
+            for account_id in self._account_ids[positions[row]]:
+                if account_id not in matches:
+                    matches[account_id] = FuzzyMatch(
+                        account_id, alias, round(float(scores[row]), 4)
+                    )
+            if len(matches) >= limit:
+                break
+        return list(matches.values())[:limit]
+
+    def _build(self) -> dict[str, np.ndarray]:
+        accounts: dict[str, dict[str, None]] = {}
+        for alias, account_id in self._entries:
+            key = " ".join(_words(alias))
+            if key:
+                accounts.setdefault(key, {})[account_id] = None
+        self._aliases = list(accounts)
+        self._account_ids = [tuple(account_ids) for account_ids in accounts.values()]
+
+        postings: dict[str, list[int]] = {}
+        sizes = np.empty(len(self._aliases), dtype=np.int32)
+        for position, alias in enumerate(self._aliases):
+            grams = trigrams(alias)
+            sizes[position] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+        self._sizes = sizes
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        return self._postings
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """Return the padded word trigrams of ``text``."""
+    grams: set[str] = set()
+    for word in _words(text):
+        padded = f"  {word} "
+        grams.update(padded[start : start + 3] for start in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def _words(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
@@ -0,0 +1,106 @@
+"""Shared string objects for identifiers repeated across pipeline records.
+
+Period labels, source systems, account ids and names, statements, and units are
+a few hundred distinct strings repeated across every record of a dataset. The
+extractors, ``source_record_from_dict``, and the mapper pass them through the
+active ``StringPool`` so each distinct identifier is held once. Outside a
+``string_pool()`` block nothing is interned, and extraction and normalization
+open a fresh pool of their own with ``dataset_string_pool()``, so the pool is
+freed with the dataset rather than growing for the life of the process. Pass
+``None`` to ``string_pool()`` to keep strings as they were parsed.
+"""
+
+from __future__ import annotations
+
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, overload
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class StringPool:
+    """Canonical string objects keyed by value."""
+
+    __slots__ = ("_strings",)
+
+    def __init__(self) -> None:
+        """Initialize an empty pool."""
+        self._strings: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        """Return the number of distinct strings held."""
+        return len(self._strings)
+
+    def __contains__(self, value: object) -> bool:
+        """Return whether ``value`` is held by the pool."""
+        return value in self._strings
+
+    @overload
+    def intern(self, value: str) -> str: ...
+
+    @overload
+    def intern(self, value: None) -> None: ...
+
+    def intern(self, value: str | None) -> str | None:
+        """Return the pooled object equal to ``value``, adding it if it is new."""
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
+
+    def nbytes(self) -> int:
+        """Return the memory held by the pooled strings and the pool's table."""
+        return sys.getsizeof(self._strings) + sum(map(sys.getsizeof, self._strings))
+
+    def clear(self) -> None:
+        """Release every pooled string."""
+        self._strings.clear()
+
+
+# Unset outside any string_pool() block; set to None when interning is turned off.
+_active_pool: ContextVar[StringPool | None] = ContextVar("waccy_string_pool")
+
+
+def active_string_pool() -> StringPool | None:
+    """Return the pool identifiers are interned into, or ``None`` when there is none."""
+    return _active_pool.get(None)
+
+
+@contextmanager
+def string_pool(pool: StringPool | None) -> Iterator[StringPool | None]:
+    """Intern identifiers into ``pool`` for a block; ``None`` turns interning off."""
+    token = _active_pool.set(pool)
+    try:
+        yield pool
+    finally:
+        _active_pool.reset(token)
+
+
+@contextmanager
+def dataset_string_pool() -> Iterator[StringPool | None]:
+    """Intern into the active pool for a block, or into a new pool when none is set.
+
+    A block inside ``string_pool(None)`` keeps interning off.
+    """
+    try:
+        pool = _active_pool.get()
+    except LookupError:
+        pool = StringPool()
+    with string_pool(pool):
+        yield pool
+
+
+@overload
+def intern_identifier(value: str) -> str: ...
+
+
+@overload
+def intern_identifier(value: None) -> None: ...
+
+
+def intern_identifier(value: str | None) -> str | None:
+    """Return the active pool's object for ``value``."""
+    pool = _active_pool.get(None)
+    return value if pool is None else pool.intern(value)
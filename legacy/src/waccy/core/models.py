@@ -2,14 +2,25 @@
 
 from __future__ import annotations
 
+from collections.abc import MutableMapping, Sequence  # noqa: TC003
 from datetime import date  # noqa: TC003
 from decimal import Decimal  # noqa: TC003
 from enum import Enum
-from typing import Any, Literal
+from pathlib import Path  # noqa: TC003
+from typing import IO, Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import (
+    BaseModel,
+    Field,
+    SerializerFunctionWrapHandler,
+    ValidatorFunctionWrapHandler,
+    field_serializer,
+    field_validator,
+)
 
-CONTRACT_SCHEMA_VERSION = "1.0.0"
+from waccy.core.statement_values import PeriodIndex, PeriodValues, StatementValues
+
+CONTRACT_SCHEMA_VERSION = "1.1.0"
 
 
 class PeriodType(str, Enum):
@@ -69,15 +80,112 @@ class SourceRecord(BaseModel):
     metadata: dict[str, Any] = Field(default_factory=dict)
 
 
-class NormalizedFinancialDataset(BaseModel):
+class SourceAccount(BaseModel):
+    """A source-native account or concept shared by every record that references it."""
+
+    source_account_id: str
+    source_account_name: str
+    source_account_type: str | None = None
+    metadata: dict[str, Any] = Field(default_factory=dict)
+
+
+def _accounts_by_id(value: Any) -> Any:
+    if isinstance(value, list):
+        accounts = [
+            account if isinstance(account, SourceAccount) else _source_account(account)
+            for account in value
+        ]
+        return {account.source_account_id: account for account in accounts}
+    return value
+
+
+def _source_account(payload: Any) -> SourceAccount:
+    """Read a ``SourceAccount`` or a raw source payload such as a QBO ``Account``."""
+    if not isinstance(payload, dict) or "source_account_id" in payload:
+        return SourceAccount.model_validate(payload)
+    account_id = payload.get("account_id") or payload.get("Id") or payload.get("id")
+    if account_id is None:
+        raise ValueError(f"Source account is missing an id. Account: {payload!r}")
+    name = (
+        payload.get("source_account_name")
+        or payload.get("name")
+        or payload.get("Name")
+        or payload.get("FullyQualifiedName")
+        or account_id
+    )
+    account_type = (
+        payload.get("source_account_type")
+        or payload.get("account_type")
+        or payload.get("AccountType")
+        or payload.get("Classification")
+    )
+    return SourceAccount(
+        source_account_id=str(account_id),
+        source_account_name=str(name),
+        source_account_type=str(account_type) if account_type else None,
+        metadata=payload,
+    )
+
+
+def _is_record_batch(value: Any) -> bool:
+    from waccy.core.batch import MappedRecordBatch, SourceRecordBatch  # noqa: PLC0415
+
+    return isinstance(value, SourceRecordBatch | MappedRecordBatch)
+
+
+class _RecordBatchFields(BaseModel):
+    """Let record fields hold a columnar batch in place of a validated list."""
+
+    @field_validator("records", "source_records", mode="wrap", check_fields=False)
+    @classmethod
+    def _keep_record_batches(cls, value: Any, handler: ValidatorFunctionWrapHandler) -> Any:
+        if _is_record_batch(value):
+            return value
+        return handler(value)
+
+    @field_serializer("records", "source_records", mode="wrap", check_fields=False)
+    def _serialize_record_batches(
+        self, value: Any, handler: SerializerFunctionWrapHandler
+    ) -> Any:
+        if _is_record_batch(value):
+            return handler(value.to_records())
+        return handler(value)
+
+
+class NormalizedFinancialDataset(_RecordBatchFields):
     """Source-agnostic records with source-native account/concept identity preserved."""
 
     schema_version: str = CONTRACT_SCHEMA_VERSION
     entity_name: str
     periods: list[ReportingPeriod]
-    records: list[SourceRecord]
+    # A SourceRecordBatch stands in for the list on large imports.
+    records: Sequence[SourceRecord]
+    # Source accounts keyed by ``SourceRecord.source_account_id``.
+    accounts: dict[str, SourceAccount] = Field(default_factory=dict)
     metadata: dict[str, Any] = Field(default_factory=dict)
 
+    @field_validator("accounts", mode="before")
+    @classmethod
+    def _key_accounts(cls, value: Any) -> Any:
+        return _accounts_by_id(value)
+
+    def account_for(self, record: SourceRecord) -> SourceAccount | None:
+        """Return the shared source account a record references, if any."""
+        return self.accounts.get(record.source_account_id)
+
+    def to_arrow(self) -> Any:
+        """Return the dataset as a ``pyarrow.Table``; requires ``waccy[arrow]``."""
+        from waccy.core.arrow import normalized_dataset_to_arrow  # noqa: PLC0415
+
+        return normalized_dataset_to_arrow(self)
+
+    @classmethod
+    def from_arrow(cls, table: Any) -> NormalizedFinancialDataset:
+        """Rebuild a dataset from ``to_arrow`` output, backed by a ``SourceRecordBatch``."""
+        from waccy.core.arrow import normalized_dataset_from_arrow  # noqa: PLC0415
+
+        return normalized_dataset_from_arrow(table)
+
 
 class MappingDiagnostic(BaseModel):
     """Explanation for a mapping decision or issue."""
@@ -105,15 +213,29 @@ class MappedFinancialRecord(BaseModel):
     override_note: str | None = None
 
 
-class MappedFinancialDataset(BaseModel):
+class MappedFinancialDataset(_RecordBatchFields):
     """Normalized financial data after source-to-standard account mapping."""
 
     schema_version: str = CONTRACT_SCHEMA_VERSION
     entity_name: str
     periods: list[ReportingPeriod]
-    records: list[MappedFinancialRecord]
+    # A MappedRecordBatch when the mapper ran over a SourceRecordBatch.
+    records: Sequence[MappedFinancialRecord]
     metadata: dict[str, Any] = Field(default_factory=dict)
 
+    def to_arrow(self) -> Any:
+        """Return the dataset as a ``pyarrow.Table``; requires ``waccy[arrow]``."""
+        from waccy.core.arrow import mapped_dataset_to_arrow  # noqa: PLC0415
+
+        return mapped_dataset_to_arrow(self)
+
+    @classmethod
+    def from_arrow(cls, table: Any) -> MappedFinancialDataset:
+        """Rebuild a dataset from ``to_arrow`` output, backed by a ``MappedRecordBatch``."""
+        from waccy.core.arrow import mapped_dataset_from_arrow  # noqa: PLC0415
+
+        return mapped_dataset_from_arrow(table)
+
 
 class ValidationIssue(BaseModel):
     """A validation or reconciliation issue."""
@@ -138,6 +260,35 @@ class ValidatedFinancialDataset(BaseModel):
         """Return whether the dataset has no error-level issues."""
         return not any(issue.severity == IssueSeverity.ERROR for issue in self.issues)
 
+    def to_snapshot(self, path: str | Path) -> None:
+        """Write the dataset as a memory-mappable snapshot; requires ``waccy[arrow]``."""
+        from waccy.core.snapshot import validated_dataset_to_snapshot  # noqa: PLC0415
+
+        validated_dataset_to_snapshot(self, path)
+
+    @classmethod
+    def from_snapshot(cls, path: str | Path) -> ValidatedFinancialDataset:
+        """Open a ``to_snapshot`` file; record columns are read lazily from the mapping."""
+        from waccy.core.snapshot import validated_dataset_from_snapshot  # noqa: PLC0415
+
+        return validated_dataset_from_snapshot(path)
+
+    def write_json(
+        self,
+        target: str | Path | IO[str],
+        *,
+        indent: int | None = 2,
+        sort_keys: bool = True,
+    ) -> None:
+        """Stream the JSON document to a path or text stream with bounded memory.
+
+        The output matches ``json.dumps(self.model_dump(mode="json"), ...)`` byte
+        for byte; the defaults match the conformance fixtures.
+        """
+        from waccy.core.streaming import write_json  # noqa: PLC0415
+
+        write_json(self, target, indent=indent, sort_keys=sort_keys)
+
 
 class ExtractedTransaction(BaseModel):
     """Legacy transaction format retained for compatibility."""
@@ -150,16 +301,23 @@ class ExtractedTransaction(BaseModel):
     confidence: float = Field(default=1.0, ge=0.0, le=1.0)
 
 
-class ExtractedData(BaseModel):
+class ExtractedData(_RecordBatchFields):
     """Extractor output that can carry source records into the layered contract."""
 
     transactions: list[ExtractedTransaction] = Field(default_factory=list)
-    accounts: list[dict[str, Any]] = Field(default_factory=list)
+    # Source accounts keyed by ``SourceRecord.source_account_id``. A list is keyed on input,
+    # and its raw payloads, such as QBO ``Account`` objects, are kept as account metadata.
+    accounts: dict[str, SourceAccount] = Field(default_factory=dict)
     metadata: dict[str, Any] = Field(default_factory=dict)
     quality_score: float = Field(default=1.0, ge=0.0, le=1.0)
     entity_name: str = "Unknown Entity"
     periods: list[ReportingPeriod] = Field(default_factory=list)
-    source_records: list[SourceRecord] = Field(default_factory=list)
+    source_records: Sequence[SourceRecord] = Field(default_factory=list)
+
+    @field_validator("accounts", mode="before")
+    @classmethod
+    def _key_accounts(cls, value: Any) -> Any:
+        return _accounts_by_id(value)
 
     def generate_quality_report(self) -> dict[str, Any]:
         """Generate a basic quality report for extracted data."""
@@ -187,12 +345,26 @@ class StatementLine(BaseModel):
 
     label: str
     account_id: str | None = None
-    values: dict[str, Decimal] = Field(default_factory=dict)
+    # Built statements hold a PeriodValues row view of the statement's value table.
+    values: MutableMapping[str, Decimal] = Field(default_factory=dict)
     is_subtotal: bool = False
     is_check: bool = False
     source_account_ids: list[str] = Field(default_factory=list)
     metadata: dict[str, Any] = Field(default_factory=dict)
 
+    @field_validator("values", mode="wrap")
+    @classmethod
+    def _keep_period_values(cls, value: Any, handler: ValidatorFunctionWrapHandler) -> Any:
+        if isinstance(value, PeriodValues):
+            return value
+        return handler(value)
+
+    @field_serializer("values", mode="wrap")
+    def _serialize_period_values(self, value: Any, handler: SerializerFunctionWrapHandler) -> Any:
+        if isinstance(value, PeriodValues):
+            return handler(value.to_dict())
+        return handler(value)
+
 
 class FinancialStatement(BaseModel):
     """A financial statement composed of ordered line items."""
@@ -201,6 +373,13 @@ class FinancialStatement(BaseModel):
     periods: list[ReportingPeriod]
     lines: list[StatementLine]
 
+    def value_table(self) -> StatementValues:
+        """Return line amounts as one ``(lines x periods)`` array over ``periods``."""
+        return StatementValues.from_lines(
+            PeriodIndex(period.label for period in self.periods),
+            [line.values for line in self.lines],
+        )
+
 
 class ThreeStatementModel(BaseModel):
     """Source-agnostic three-statement model output."""
@@ -213,3 +392,45 @@ class ThreeStatementModel(BaseModel):
     cash_flow_statement: FinancialStatement
     validation_issues: list[ValidationIssue] = Field(default_factory=list)
     metadata: dict[str, Any] = Field(default_factory=dict)
+
+    def to_arrow(self) -> Any:
+        """Return one ``pyarrow.Table`` row per statement line and period."""
+        from waccy.core.arrow import model_to_arrow  # noqa: PLC0415
+
+        return model_to_arrow(self)
+
+    @classmethod
+    def from_arrow(cls, table: Any) -> ThreeStatementModel:
+        """Rebuild a model from ``to_arrow`` output."""
+        from waccy.core.arrow import model_from_arrow  # noqa: PLC0415
+
+        return model_from_arrow(table)
+
+    def to_snapshot(self, path: str | Path) -> None:
+        """Write the model as a binary snapshot; requires ``waccy[arrow]``."""
+        from waccy.core.snapshot import model_to_snapshot  # noqa: PLC0415
+
+        model_to_snapshot(self, path)
+
+    @classmethod
+    def from_snapshot(cls, path: str | Path) -> ThreeStatementModel:
+        """Read a model written by ``to_snapshot``."""
+        from waccy.core.snapshot import model_from_snapshot  # noqa: PLC0415
+
+        return model_from_snapshot(path)
+
+    def write_json(
+        self,
+        target: str | Path | IO[str],
+        *,
+        indent: int | None = 2,
+        sort_keys: bool = True,
+    ) -> None:
+        """Stream the JSON document to a path or text stream with bounded memory.
+
+        The output matches ``json.dumps(self.model_dump(mode="json"), ...)`` byte
+        for byte; the defaults match the conformance fixtures.
+        """
+        from waccy.core.streaming import write_json  # noqa: PLC0415
+
+        write_json(self, target, indent=indent, sort_keys=sort_keys)
@@ -2,10 +2,23 @@
 
 from __future__ import annotations
 
+import hashlib
+from dataclasses import dataclass
 from enum import Enum
+from functools import cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
 
+import numpy as np
 from pydantic import BaseModel, Field
 
+from waccy.core.fuzzy import TrigramIndex
+from waccy.core.substrings import SubstringIndex
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
+    from pathlib import Path
+
 
 class AccountType(str, Enum):
     """Top-level account categories."""
@@ -38,68 +51,504 @@ def _key(value: str) -> str:
     return "".join(ch for ch in value.lower() if ch.isalnum())
 
 
+def account_keys(account: AccountCategory) -> list[str]:
+    """Return the normalized lookup keys of an account's id, name, and aliases."""
+    return [_key(account.id), _key(account.name), *map(_key, account.aliases)]
+
+
+@dataclass(frozen=True, slots=True)
+class AccountHierarchy:
+    """Nested-set index over the account tree.
+
+    Accounts are laid out in pre-order with siblings in ``sort_order``, so each
+    account and its descendants occupy the contiguous positions
+    ``positions[id]`` to ``ends[id]`` (exclusive). Totals held as rows in that
+    order roll up to every level of the tree with one range reduction.
+    """
+
+    account_ids: tuple[str, ...]
+    positions: Mapping[str, int]
+    ends: Mapping[str, int]
+    depths: Mapping[str, int]
+
+    @classmethod
+    def from_accounts(cls, accounts: Mapping[str, AccountCategory]) -> AccountHierarchy:
+        """Index ``accounts`` by their ``parent_id`` links."""
+        children: dict[str | None, list[AccountCategory]] = {}
+        for account in accounts.values():
+            if account.parent_id is not None and account.parent_id not in accounts:
+                raise ValueError(
+                    f"Account {account.id!r} has unknown parent {account.parent_id!r}."
+                )
+            children.setdefault(account.parent_id, []).append(account)
+        for siblings in children.values():
+            siblings.sort(key=lambda account: account.sort_order)
+
+        order: list[str] = []
+        ends: dict[str, int] = {}
+        depths: dict[str, int] = {}
+        # Each entry is (account, depth, exiting); exits close the account's range.
+        stack = [(account, 0, False) for account in reversed(children.get(None, []))]
+        while stack:
+            account, depth, exiting = stack.pop()
+            if exiting:
+                ends[account.id] = len(order)
+                continue
+            depths[account.id] = depth
+            order.append(account.id)
+            stack.append((account, depth, True))
+            stack.extend(
+                (child, depth + 1, False) for child in reversed(children.get(account.id, []))
+            )
+        if len(order) != len(accounts):
+            unreachable = sorted(set(accounts) - set(order))
+            raise ValueError(f"Account parents form a cycle through {unreachable!r}.")
+        return cls(
+            account_ids=tuple(order),
+            positions=MappingProxyType({account_id: row for row, account_id in enumerate(order)}),
+            ends=MappingProxyType(ends),
+            depths=MappingProxyType(depths),
+        )
+
+    def __len__(self) -> int:
+        """Return the number of accounts in the tree."""
+        return len(self.account_ids)
+
+    def __contains__(self, account_id: object) -> bool:
+        """Return whether ``account_id`` is in the tree."""
+        return account_id in self.positions
+
+    def span(self, account_id: str) -> tuple[int, int]:
+        """Return the ``[start, end)`` positions of an account's subtree."""
+        return self.positions[account_id], self.ends[account_id]
+
+    def subtree(self, account_id: str) -> tuple[str, ...]:
+        """Return an account followed by all of its descendants, in pre-order."""
+        start, end = self.span(account_id)
+        return self.account_ids[start:end]
+
+    def layout(self, account_ids: Iterable[str]) -> tuple[str, ...]:
+        """Return the tree's accounts followed by those of ``account_ids`` outside it."""
+        extra = (account_id for account_id in account_ids if account_id not in self.positions)
+        return (*self.account_ids, *dict.fromkeys(extra))
+
+    def rollup(self, rows: np.ndarray, reduce: np.ufunc = np.add) -> np.ndarray:
+        """Reduce per-account ``rows`` over every subtree.
+
+        ``rows`` holds one row per account in ``layout`` order; row ``i`` of the
+        result reduces the rows of account ``i`` and all of its descendants. Rows
+        after the tree belong to accounts outside it and are returned unchanged.
+        """
+        if len(rows) < len(self):
+            raise ValueError(f"Expected at least {len(self)} account rows, got {len(rows)}.")
+        result = rows.copy()
+        if not len(self):
+            return result
+        # ``reduceat`` reduces between consecutive indices; interleaving each
+        # subtree's start and end and keeping every other result gives the ranges.
+        # The padding row makes ``end == len(self)`` a valid index.
+        tree = rows[: len(self)]
+        padded = np.concatenate([tree, tree[:1]])
+        bounds = np.empty(2 * len(self), dtype=np.intp)
+        bounds[0::2] = np.arange(len(self))
+        bounds[1::2] = [self.ends[account_id] for account_id in self.account_ids]
+        result[: len(self)] = reduce.reduceat(padded, bounds, axis=0)[0::2]
+        return result
+
+    def rollup_sets(self, rows: Sequence[set[str]]) -> list[set[str]]:
+        """Union per-account ``rows`` over every subtree, as ``rollup`` does."""
+        result = [set(row) for row in rows]
+        for account_id, start in self.positions.items():
+            for row in rows[start + 1 : self.ends[account_id]]:
+                result[start].update(row)
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledOntology:
+    """Read-only lookup tables derived once from a chart of accounts.
+
+    ``alias_index`` maps normalized alias keys to candidate accounts in definition
+    order, ``alias_keys`` holds each account's normalized keys, and
+    ``statement_accounts`` groups accounts by statement in ``sort_order``.
+    ``statement_resolutions`` maps ``(key, statement)``, for every key with several
+    candidates, to the candidates on that statement, and ``ambiguous_keys`` maps
+    the keys that a statement does not always narrow to one account to their
+    candidate ids. ``hierarchy`` indexes the ``parent_id`` tree for subtree
+    rollups, ``fuzzy_index`` finds accounts whose names or aliases resemble a
+    source account, and ``substring_index`` finds the accounts with alias keys
+    that occur in a source key. ``version`` is a digest of the accounts, so it
+    changes whenever any account does. Account categories are shared by every
+    user of the compiled ontology and must not be modified.
+    """
+
+    accounts: Mapping[str, AccountCategory]
+    alias_index: Mapping[str, tuple[AccountCategory, ...]]
+    alias_keys: Mapping[str, frozenset[str]]
+    statement_accounts: Mapping[str, tuple[AccountCategory, ...]]
+    statement_resolutions: Mapping[tuple[str, str], tuple[AccountCategory, ...]]
+    ambiguous_keys: Mapping[str, tuple[str, ...]]
+    sorted_accounts: tuple[AccountCategory, ...]
+    hierarchy: AccountHierarchy
+    fuzzy_index: TrigramIndex
+    substring_index: SubstringIndex
+    version: str
+
+    @classmethod
+    def from_accounts(
+        cls,
+        accounts: Iterable[AccountCategory],
+        normalized_keys: Iterable[Sequence[str]] | None = None,
+    ) -> CompiledOntology:
+        """Compile lookup tables for ``accounts``.
+
+        ``normalized_keys`` may supply each account's ``account_keys`` in the same
+        order, as read back from a compiled ontology cache.
+        """
+        by_id: dict[str, AccountCategory] = {}
+        alias_index: dict[str, dict[str, AccountCategory]] = {}
+        alias_keys: dict[str, frozenset[str]] = {}
+        accounts = list(accounts)
+        if normalized_keys is None:
+            normalized_keys = map(account_keys, accounts)
+        for account, keys in zip(accounts, normalized_keys, strict=True):
+            by_id[account.id] = account
+            for key in keys:
+                alias_index.setdefault(key, {}).setdefault(account.id, account)
+            alias_keys[account.id] = frozenset(keys)
+
+        sorted_accounts = tuple(sorted(by_id.values(), key=lambda account: account.sort_order))
+        statement_accounts: dict[str, list[AccountCategory]] = {}
+        for account in sorted_accounts:
+            if account.statement is not None:
+                statement_accounts.setdefault(account.statement, []).append(account)
+        statement_resolutions, ambiguous_keys = _resolve_collisions(alias_index)
+        return cls(
+            accounts=MappingProxyType(by_id),
+            alias_index=MappingProxyType(
+                {key: tuple(candidates.values()) for key, candidates in alias_index.items()}
+            ),
+            alias_keys=MappingProxyType(alias_keys),
+            statement_accounts=MappingProxyType(
+                {statement: tuple(group) for statement, group in statement_accounts.items()}
+            ),
+            statement_resolutions=MappingProxyType(statement_resolutions),
+            ambiguous_keys=MappingProxyType(ambiguous_keys),
+            sorted_accounts=sorted_accounts,
+            hierarchy=AccountHierarchy.from_accounts(by_id),
+            fuzzy_index=TrigramIndex(_alias_entries(by_id.values())),
+            substring_index=SubstringIndex(alias_keys),
+            version=hashlib.sha256(
+                b"\n".join(account.model_dump_json().encode() for account in accounts)
+            ).hexdigest(),
+        )
+
+
+def _resolve_collisions(
+    alias_index: Mapping[str, Mapping[str, AccountCategory]],
+) -> tuple[
+    dict[tuple[str, str], tuple[AccountCategory, ...]],
+    dict[str, tuple[str, ...]],
+]:
+    resolutions: dict[tuple[str, str], tuple[AccountCategory, ...]] = {}
+    ambiguous: dict[str, tuple[str, ...]] = {}
+    for key, candidates in alias_index.items():
+        if len(candidates) < 2:
+            continue
+        by_statement: dict[str | None, list[AccountCategory]] = {}
+        for account in candidates.values():
+            by_statement.setdefault(account.statement, []).append(account)
+        for statement, group in by_statement.items():
+            if statement is not None:
+                resolutions[key, statement] = tuple(group)
+        if None in by_statement or any(len(group) > 1 for group in by_statement.values()):
+            ambiguous[key] = tuple(candidates)
+    return resolutions, ambiguous
+
+
+type CandidateKey = tuple[str | None, str, str | None]
+
+
+@dataclass(frozen=True, slots=True)
+class CandidateMatches:
+    """Candidate accounts for a batch of lookups, resolved once per distinct key.
+
+    ``keys`` holds each distinct ``(source_system, source_account, statement)``
+    in first-seen order with its candidates at the same position in
+    ``candidates``; ``codes`` maps every input row to its key.
+    """
+
+    keys: tuple[CandidateKey, ...]
+    candidates: tuple[tuple[AccountCategory, ...], ...]
+    codes: np.ndarray
+
+    def __len__(self) -> int:
+        """Return the number of input rows."""
+        return len(self.codes)
+
+    def __getitem__(self, row: int) -> tuple[AccountCategory, ...]:
+        """Return the candidates for one input row."""
+        return self.candidates[self.codes[row]]
+
+    def counts(self) -> np.ndarray:
+        """Return the number of candidates for every input row."""
+        counts = np.array([len(candidates) for candidates in self.candidates], dtype=np.int32)
+        result: np.ndarray = counts[self.codes]
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class ConceptTable:
+    """Static lookup from taxonomy concepts to standard accounts.
+
+    Sized for a full taxonomy element list such as US-GAAP or IFRS. Normalized
+    concept keys are stored back to back in one UTF-8 buffer, ordered by a 64-bit
+    hash, so a lookup is a binary search over ``hashes`` and one byte comparison.
+    Each concept costs 14 bytes of arrays plus its key, and ``save`` and ``load``
+    move the arrays without rebuilding anything.
+    """
+
+    hashes: np.ndarray
+    offsets: np.ndarray
+    keys: bytes
+    codes: np.ndarray
+    account_ids: tuple[str, ...]
+
+    @classmethod
+    def from_concepts(cls, concepts: Iterable[tuple[str, str]]) -> ConceptTable:
+        """Build a table from ``(concept, account_id)`` pairs."""
+        by_key: dict[bytes, str] = {}
+        for concept, account_id in concepts:
+            key = _key(concept).encode()
+            if not key:
+                continue
+            if by_key.setdefault(key, account_id) != account_id:
+                raise ValueError(
+                    f"Concept {concept!r} maps to both {by_key[key]!r} and {account_id!r}."
+                )
+        account_ids = tuple(dict.fromkeys(by_key.values()))
+        account_codes = {account_id: code for code, account_id in enumerate(account_ids)}
+        keys = list(by_key)
+        hashes = np.fromiter(map(_concept_hash, keys), dtype=np.uint64, count=len(keys))
+        order = np.argsort(hashes, kind="stable")
+        ordered = [keys[row] for row in order.tolist()]
+        offsets = np.zeros(len(ordered) + 1, dtype=np.uint32)
+        np.cumsum([len(key) for key in ordered], out=offsets[1:])
+        codes = np.array([account_codes[by_key[key]] for key in ordered], dtype=np.uint16)
+        return cls(
+            hashes=hashes[order],
+            offsets=offsets,
+            keys=b"".join(ordered),
+            codes=codes,
+            account_ids=account_ids,
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> ConceptTable:
+        """Read a table written by ``save``."""
+        with np.load(path, allow_pickle=False) as arrays:
+            return cls(
+                hashes=arrays["hashes"],
+                offsets=arrays["offsets"],
+                keys=arrays["keys"].tobytes(),
+                codes=arrays["codes"],
+                account_ids=tuple(arrays["account_ids"].tolist()),
+            )
+
+    def save(self, path: str | Path) -> None:
+        """Write the table as an uncompressed ``.npz`` file."""
+        np.savez(
+            path,
+            hashes=self.hashes,
+            offsets=self.offsets,
+            keys=np.frombuffer(self.keys, dtype=np.uint8),
+            codes=self.codes,
+            account_ids=np.array(self.account_ids, dtype=str),
+        )
+
+    def __len__(self) -> int:
+        """Return the number of distinct concepts."""
+        return len(self.hashes)
+
+    def get(self, concept: str) -> str | None:
+        """Return the account id ``concept`` maps to, if any."""
+        key = _key(concept).encode()
+        target = _concept_hash(key)
+        hashes, offsets = self.hashes, self.offsets
+        row = int(hashes.searchsorted(np.uint64(target)))
+        # Distinct keys may share a hash; their rows are adjacent.
+        while row < len(hashes) and hashes.item(row) == target:
+            if self.keys[offsets.item(row) : offsets.item(row + 1)] == key:
+                return self.account_ids[int(self.codes[row])]
+            row += 1
+        return None
+
+
+@cache
+def compiled_ontology() -> CompiledOntology:
+    """Return the standard ontology, compiled once per process."""
+    return CompiledOntology.from_accounts(_standard_accounts())
+
+
 class StandardChartOfAccounts:
     """WACCY standardized chart of accounts."""
 
-    def __init__(self) -> None:
-        """Initialize the standard chart of accounts."""
-        self.accounts: dict[str, AccountCategory] = {}
+    def __init__(
+        self, compiled: CompiledOntology | None = None, concepts: ConceptTable | None = None
+    ) -> None:
+        """Initialize the chart over the process-wide compiled ontology by default.
+
+        ``concepts`` maps taxonomy concepts that no alias matches to accounts.
+        """
+        self.compiled = compiled or compiled_ontology()
+        self.concepts = concepts
+        self.accounts: dict[str, AccountCategory] = dict(self.compiled.accounts)
+        # Alias keys added to this instance, checked before the shared index.
         self._aliases: dict[str, list[str]] = {}
-        self._initialize_standard_accounts()
-
-    def _add_account(self, account: AccountCategory) -> None:
-        self.accounts[account.id] = account
-        self._aliases.setdefault(_key(account.id), []).append(account.id)
-        self._aliases.setdefault(_key(account.name), []).append(account.id)
-        for alias in account.aliases:
-            self._aliases.setdefault(_key(alias), []).append(account.id)
-
-    def _initialize_standard_accounts(self) -> None:
-        """Initialize the minimum chart of accounts for v0.1.0."""
-        account_specs = [
-            ("revenue", "Revenue", AccountType.REVENUE, "income_statement", "credit", None, 100, ["sales", "sales revenue", "total revenue", "income", "us-gaap:revenues", "us-gaap:revenuefromcontractwithcustomerexcludingassessedtax", "us-gaap:salesrevenuenet", "revenues"]),
-            ("cogs", "Cost of Goods Sold", AccountType.EXPENSE, "income_statement", "debit", None, 200, ["cost of goods sold", "cost of revenue", "cost of sales", "us-gaap:costofrevenue", "us-gaap:costofgoodsandservicessold", "us-gaap:costofgoodsandserviceexcludingdepreciationdepletionandamortization"]),
-            ("operating_expenses", "Operating Expenses", AccountType.EXPENSE, "income_statement", "debit", None, 300, ["opex", "operating expense", "operating expenses", "general and administrative", "sg&a", "us-gaap:operatingexpenses", "us-gaap:sellinggeneralandadministrativeexpense"]),
-            ("depreciation_amortization", "Depreciation & Amortization", AccountType.EXPENSE, "income_statement", "debit", None, 350, ["depreciation", "amortization", "d&a", "us-gaap:depreciationdepletionandamortization", "us-gaap:depreciationdepletionandamortizationexpense"]),
-            ("interest_expense", "Interest Expense", AccountType.EXPENSE, "income_statement", "debit", None, 400, ["interest", "interest expense", "us-gaap:interestexpense", "us-gaap:interestexpensenonoperating"]),
-            ("tax_expense", "Tax Expense", AccountType.EXPENSE, "income_statement", "debit", None, 500, ["tax", "income tax", "income tax expense", "us-gaap:incometaxexpensebenefit"]),
-            ("cash", "Cash", AccountType.ASSET, "balance_sheet", "debit", None, 1000, ["bank", "cash and cash equivalents", "checking", "savings", "undeposited funds", "us-gaap:cashandcashequivalentsatcarryingvalue", "us-gaap:cashcashequivalentsrestrictedcashandrestrictedcashequivalents"]),
-            ("accounts_receivable", "Accounts Receivable", AccountType.ASSET, "balance_sheet", "debit", None, 1100, ["accounts receivable", "accounts receivable a/r", "ar", "a/r", "us-gaap:accountsreceivablenetcurrent"]),
-            ("inventory", "Inventory", AccountType.ASSET, "balance_sheet", "debit", None, 1200, ["inventory", "inventory asset", "stock", "us-gaap:inventorynet"]),
-            ("ppe", "Property, Plant & Equipment", AccountType.ASSET, "balance_sheet", "debit", None, 1300, ["fixed assets", "original cost", "property plant and equipment", "ppe", "pp&e", "us-gaap:propertyplantandequipmentnet"]),
-            ("accumulated_depreciation", "Accumulated Depreciation", AccountType.ASSET, "balance_sheet", "credit", None, 1350, ["accumulated depreciation", "us-gaap:accumulateddepreciationdepletionandamortizationpropertyplantandequipment"]),
-            ("accounts_payable", "Accounts Payable", AccountType.LIABILITY, "balance_sheet", "credit", None, 2000, ["accounts payable", "accounts payable a/p", "ap", "a/p", "us-gaap:accountspayablecurrent"]),
-            ("accrued_expenses", "Accrued Expenses", AccountType.LIABILITY, "balance_sheet", "credit", None, 2100, ["accrued expenses", "accruals", "accrued liabilities", "arizona dept of revenue payable", "board of equalization payable", "tax payable", "sales tax payable", "us-gaap:accruedliabilitiescurrent", "us-gaap:accruedincometaxescurrent"]),
-            ("debt", "Debt", AccountType.LIABILITY, "balance_sheet", "credit", None, 2200, ["loan", "loans", "loan payable", "mastercard", "credit card", "notes payable", "debt", "long-term debt", "us-gaap:longtermdebtcurrent", "us-gaap:longtermdebtnoncurrent", "us-gaap:longtermdebtandfinanceleaseobligationscurrent", "us-gaap:longtermdebtandfinanceleaseobligationsnoncurrent"]),
-            ("equity", "Equity", AccountType.EQUITY, "balance_sheet", "credit", None, 3000, ["owners equity", "owner's equity", "opening balance equity", "members equity", "stockholders equity", "us-gaap:stockholdersequity", "us-gaap:stockholdersequityincludingportionattributabletononcontrollinginterest"]),
-            ("retained_earnings", "Retained Earnings", AccountType.EQUITY, "balance_sheet", "credit", None, 3100, ["retained earnings", "us-gaap:retainedearningsaccumulateddeficit"]),
-            ("net_income", "Net Income", AccountType.CASH_FLOW, "cash_flow_statement", "credit", "operating", 4000, ["net income", "net earnings", "profit", "us-gaap:netincomeloss"]),
-            ("depreciation_addback", "Depreciation Add-back", AccountType.CASH_FLOW, "cash_flow_statement", "credit", "operating", 4100, ["depreciation addback", "depreciation and amortization", "us-gaap:depreciationdepletionandamortization", "us-gaap:depreciationdepletionandamortizationexpense"]),
-            ("working_capital_movement", "Working Capital Movement", AccountType.CASH_FLOW, "cash_flow_statement", "credit", "operating", 4200, ["change in working capital", "changes in operating assets and liabilities", "us-gaap:increasedecreaseinoperatingassetsandliabilitiesnetofacquisitions", "us-gaap:netcashprovidedbyusedinoperatingactivities"]),
-            ("capex", "Capital Expenditures", AccountType.CASH_FLOW, "cash_flow_statement", "debit", "investing", 5000, ["capex", "capital expenditures", "purchase of property and equipment", "us-gaap:paymentstoacquirepropertyplantandequipment"]),
-            ("financing_movement", "Financing Movement", AccountType.CASH_FLOW, "cash_flow_statement", "credit", "financing", 6000, ["financing activities", "debt proceeds", "debt repayment", "us-gaap:proceedsfromissuanceofdebt", "us-gaap:proceedsfromissuanceoflongtermdebt", "us-gaap:repaymentsofdebt"]),
+        self._version: tuple[tuple[Any, ...], str] | None = None
+
+    @classmethod
+    def from_file(
+        cls, path: str | Path, *, cache_dir: str | Path | None = None
+    ) -> StandardChartOfAccounts:
+        """Load a chart of accounts from a JSON or YAML ontology file.
+
+        See ``waccy.core.ontology_files.load_ontology`` for the file format and the
+        compiled cache kept in ``cache_dir``.
+        """
+        from waccy.core.ontology_files import load_ontology  # noqa: PLC0415
+
+        return cls(load_ontology(path, cache_dir=cache_dir))
+
+    @property
+    def version(self) -> str:
+        """Return a digest of the chart's accounts, aliases, and concept table.
+
+        Results derived from the chart, such as cached classifications, can be
+        keyed by it and stay valid while it is unchanged. Accounts added to,
+        replaced in, or removed from ``accounts`` and aliases added to this
+        instance change it.
+        """
+        # Tuples compare their items by identity first, so an unchanged chart
+        # is recognized without comparing account models field by field.
+        state = (
+            tuple(self.accounts.items()),
+            tuple((key, tuple(account_ids)) for key, account_ids in self._aliases.items()),
+        )
+        if self._version is None or self._version[0] != state:
+            self._version = (state, self._digest())
+        return self._version[1]
+
+    def _digest(self) -> str:
+        digest = hashlib.blake2b(self.compiled.version.encode(), digest_size=16)
+        if self.concepts is not None:
+            digest.update(self.concepts.hashes.tobytes())
+            digest.update(self.concepts.codes.tobytes())
+            digest.update("\n".join(self.concepts.account_ids).encode())
+        compiled = self.compiled.accounts
+        for account_id, account in self.accounts.items():
+            if compiled.get(account_id) is not account:
+                digest.update(b"+" + account.model_dump_json().encode())
+        for account_id in compiled.keys() - self.accounts.keys():
+            digest.update(f"-{account_id}".encode())
+        for key, account_ids in sorted(self._aliases.items()):
+            digest.update(f"={key}:{','.join(account_ids)}".encode())
+        return digest.hexdigest()
+
+    def map_candidates(
+        self,
+        source_account: str,
+        source_system: str | None = None,
+        statement: str | None = None,
+    ) -> list[AccountCategory]:
+        """Return possible standard accounts for a source account.
+
+        When several accounts match, ``statement`` narrows them to the accounts on
+        that statement, if any are.
+        """
+        del source_system
+        return list(self._candidates(_key(source_account), statement))
+
+    def map_candidates_many(self, keys: Iterable[CandidateKey]) -> CandidateMatches:
+        """Return candidates for ``(source_system, source_account, statement)`` rows.
+
+        Each distinct key is normalized and looked up once, however many rows
+        repeat it; ``CandidateMatches.codes`` broadcasts the results back.
+        """
+        lookup: dict[CandidateKey, int] = {}
+        codes: list[int] = []
+        for key in keys:
+            code = lookup.get(key)
+            if code is None:
+                code = lookup[key] = len(lookup)
+            codes.append(code)
+
+        alias_keys: dict[str, str] = {}
+        candidates: list[tuple[AccountCategory, ...]] = []
+        for _, source_account, statement in lookup:
+            alias_key = alias_keys.get(source_account)
+            if alias_key is None:
+                alias_key = alias_keys[source_account] = _key(source_account)
+            candidates.append(self._candidates(alias_key, statement))
+        return CandidateMatches(
+            keys=tuple(lookup),
+            candidates=tuple(candidates),
+            codes=np.array(codes, dtype=np.int32),
+        )
+
+    def alias_entries(self) -> list[tuple[str, str]]:
+        """Return ``(alias, account_id)`` for every account id, name, and alias."""
+        return [
+            *_alias_entries(self.accounts.values()),
+            *(
+                (key, account_id)
+                for key, account_ids in self._aliases.items()
+                for account_id in account_ids
+            ),
         ]
-        for account_id, name, account_type, statement, normal_balance, cf_section, order, aliases in account_specs:
-            self._add_account(
-                AccountCategory(
-                    id=account_id,
-                    name=name,
-                    type=account_type,
-                    level=1,
-                    description=name,
-                    statement=statement,
-                    normal_balance=normal_balance,
-                    cash_flow_section=cf_section,
-                    sort_order=order,
-                    aliases=aliases,
-                )
+
+    def alias_overrides(self) -> dict[str, list[str]]:
+        """Return a copy of the alias keys added to this instance and their account ids."""
+        return {key: list(account_ids) for key, account_ids in self._aliases.items()}
+
+    def add_aliases(self, aliases: Mapping[str, Iterable[str]]) -> None:
+        """Map each alias to its account ids on this instance, ahead of the shared index.
+
+        Aliases are normalized like source account names, and an alias given
+        again replaces its earlier account ids.
+        """
+        for alias, account_ids in aliases.items():
+            self._aliases[_key(alias)] = list(account_ids)
+
+    def fuzzy_index(self) -> TrigramIndex:
+        """Return a trigram index over ``alias_entries``."""
+        if not self._aliases:
+            return self.compiled.fuzzy_index
+        return TrigramIndex(self.alias_entries())
+
+    def _candidates(self, key: str, statement: str | None) -> tuple[AccountCategory, ...]:
+        account_ids = self._aliases.get(key)
+        if account_ids is not None:
+            # Instance aliases are not in the compiled statement resolutions.
+            candidates = tuple(
+                self.accounts[account_id] for account_id in dict.fromkeys(account_ids)
             )
+            if len(candidates) > 1 and statement:
+                on_statement = tuple(
+                    account for account in candidates if account.statement == statement
+                )
+                if on_statement:
+                    return on_statement
+            return candidates
 
-    def map_candidates(self, source_account: str, source_system: str | None = None) -> list[AccountCategory]:
-        """Return possible standard accounts for a source account."""
-        del source_system
-        account_ids = self._aliases.get(_key(source_account), [])
-        return [self.accounts[account_id] for account_id in dict.fromkeys(account_ids)]
+        candidates = self.compiled.alias_index.get(key, ())
+        if len(candidates) > 1 and statement:
+            return self.compiled.statement_resolutions.get((key, statement), candidates)
+        if not candidates and self.concepts is not None:
+            account_id = self.concepts.get(key)
+            if account_id is not None and account_id in self.accounts:
+                candidates = (self.accounts[account_id],)
+        return candidates
 
     def map_account(
         self, source_account: str, source_system: str
@@ -116,7 +565,113 @@ class StandardChartOfAccounts:
 
     def list_accounts(self, account_type: AccountType | None = None) -> list[AccountCategory]:
         """List all accounts, optionally filtered by type."""
-        accounts = sorted(self.accounts.values(), key=lambda account: account.sort_order)
+        accounts: Sequence[AccountCategory] = self.compiled.sorted_accounts
+        compiled = self.compiled.accounts
+        if len(self.accounts) != len(compiled) or any(
+            compiled.get(account_id) is not account
+            for account_id, account in self.accounts.items()
+        ):
+            accounts = sorted(self.accounts.values(), key=lambda account: account.sort_order)
         if account_type is None:
-            return accounts
+            return list(accounts)
         return [acc for acc in accounts if acc.type == account_type]
+
+    def alias_keys(self, account_id: str) -> frozenset[str]:
+        """Return the normalized id, name, and alias keys of one account.
+
+        Accounts added to or replaced in ``accounts`` are keyed from the instance
+        account rather than the compiled one.
+        """
+        account = self.accounts.get(account_id)
+        if account is None:
+            return frozenset()
+        if self.compiled.accounts.get(account_id) is not account:
+            return frozenset(account_keys(account))
+        return self.compiled.alias_keys[account_id]
+
+    def statement_accounts(self, statement: str) -> tuple[AccountCategory, ...]:
+        """Return the accounts on one statement in ``sort_order``."""
+        return self.compiled.statement_accounts.get(statement, ())
+
+    def descendants(self, account_id: str) -> tuple[str, ...]:
+        """Return the ids of the accounts that roll up into ``account_id``."""
+        hierarchy = self.compiled.hierarchy
+        if account_id not in hierarchy:
+            return ()
+        return hierarchy.subtree(account_id)[1:]
+
+
+def _concept_hash(key: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def _alias_entries(accounts: Iterable[AccountCategory]) -> Iterator[tuple[str, str]]:
+    for account in accounts:
+        for alias in (account.id, account.name, *account.aliases):
+            yield alias, account.id
+
+
+def _standard_accounts() -> list[AccountCategory]:
+    """Return the minimum chart of accounts for v0.1.0."""
+    account_specs = [
+        ("revenue", "Revenue", AccountType.REVENUE, "income_statement", "credit", None, 100, ["sales", "sales revenue", "total revenue", "income", "us-gaap:revenues", "us-gaap:revenuefromcontractwithcustomerexcludingassessedtax", "us-gaap:salesrevenuenet", "revenues"]),
+        ("cogs", "Cost of Goods Sold", AccountType.EXPENSE, "income_statement", "debit", None, 200, ["cost of goods sold", "cost of revenue", "cost of sales", "us-gaap:costofrevenue", "us-gaap:costofgoodsandservicessold", "us-gaap:costofgoodsandserviceexcludingdepreciationdepletionandamortization"]),
+        ("operating_expenses", "Operating Expenses", AccountType.EXPENSE, "income_statement", "debit", None, 300, ["opex", "operating expense", "operating expenses", "general and administrative", "sg&a", "us-gaap:operatingexpenses", "us-gaap:sellinggeneralandadministrativeexpense"]),
+        ("depreciation_amortization", "Depreciation & Amortization", AccountType.EXPENSE, "income_statement", "debit", None, 350, ["depreciation", "amortization", "d&a", "us-gaap:depreciationdepletionandamortization", "us-gaap:depreciationdepletionandamortizationexpense"]),
+        ("interest_expense", "Interest Expense", AccountType.EXPENSE, "income_statement", "debit", None, 400, ["interest", "interest expense", "us-gaap:interestexpense", "us-gaap:interestexpensenonoperating"]),
+        ("tax_expense", "Tax Expense", AccountType.EXPENSE, "income_statement", "debit", None, 500, ["tax", "income tax", "income tax expense", "us-gaap:incometaxexpensebenefit"]),
+        ("cash", "Cash", AccountType.ASSET, "balance_sheet", "debit", None, 1000, ["bank", "cash and cash equivalents", "checking", "savings", "undeposited funds", "us-gaap:cashandcashequivalentsatcarryingvalue", "us-gaap:cashcashequivalentsrestrictedcashandrestrictedcashequivalents"]),
+        ("accounts_receivable", "Accounts Receivable", AccountType.ASSET, "balance_sheet", "debit", None, 1100, ["accounts receivable", "accounts receivable a/r", "ar", "a/r", "us-gaap:accountsreceivablenetcurrent"]),
+        ("inventory", "Inventory", AccountType.ASSET, "balance_sheet", "debit", None, 1200, ["inventory", "inventory asset", "stock", "us-gaap:inventorynet"]),
+        ("ppe", "Property, Plant & Equipment", AccountType.ASSET, "balance_sheet", "debit", None, 1300, ["fixed assets", "original cost", "property plant and equipment", "ppe", "pp&e", "us-gaap:propertyplantandequipmentnet"]),
+        ("accumulated_depreciation", "Accumulated Depreciation", AccountType.ASSET, "balance_sheet", "credit", None, 1350, ["accumulated depreciation", "us-gaap:accumulateddepreciationdepletionandamortizationpropertyplantandequipment"]),
+        ("accounts_payable", "Accounts Payable", AccountType.LIABILITY, "balance_sheet", "credit", None, 2000, ["accounts payable", "accounts payable a/p", "ap", "a/p", "us-gaap:accountspayablecurrent"]),
+        ("accrued_expenses", "Accrued Expenses", AccountType.LIABILITY, "balance_sheet", "credit", None, 2100, ["accrued expenses", "accruals", "accrued liabilities", "arizona dept of revenue payable", "board of equalization payable", "tax payable", "sales tax payable", "us-gaap:accruedliabilitiescurrent", "us-gaap:accruedincometaxescurrent"]),
+        ("debt", "Debt", AccountType.LIABILITY, "balance_sheet", "credit", None, 2200, ["loan", "loans", "loan payable", "mastercard", "credit card", "notes payable", "debt", "long-term debt", "us-gaap:longtermdebtcurrent", "us-gaap:longtermdebtnoncurrent", "us-gaap:longtermdebtandfinanceleaseobligationscurrent", "us-gaap:longtermdebtandfinanceleaseobligationsnoncurrent"]),
+        ("equity", "Equity", AccountType.EQUITY, "balance_sheet", "credit", None, 3000, ["owners equity", "owner's equity", "opening balance equity", "members equity", "stockholders equity", "us-gaap:stockholdersequity", "us-gaap:stockholdersequityincludingportionattributabletononcontrollinginterest"]),
+        ("retained_earnings", "Retained Earnings", AccountType.EQUITY, "balance_sheet", "credit", None, 3100, ["retained earnings", "us-gaap:retainedearningsaccumulateddeficit"]),
+        ("net_income", "Net Income", AccountType.CASH_FLOW, "cash_flow_statement", "credit", "operating", 4000, ["net income", "net earnings", "profit", "us-gaap:netincomeloss"]),
+        ("depreciation_addback", "Depreciation Add-back", AccountType.CASH_FLOW, "cash_flow_statement", "credit", "operating", 4100, ["depreciation addback", "depreciation and amortization", "us-gaap:depreciationdepletionandamortization", "us-gaap:depreciationdepletionandamortizationexpense"]),
+        ("working_capital_movement", "Working Capital Movement", AccountType.CASH_FLOW, "cash_flow_statement", "credit", "operating", 4200, ["change in working capital", "changes in operating assets and liabilities", "us-gaap:increasedecreaseinoperatingassetsandliabilitiesnetofacquisitions", "us-gaap:netcashprovidedbyusedinoperatingactivities"]),
+        ("capex", "Capital Expenditures", AccountType.CASH_FLOW, "cash_flow_statement", "debit", "investing", 5000, ["capex", "capital expenditures", "purchase of property and equipment", "us-gaap:paymentstoacquirepropertyplantandequipment"]),
+        ("financing_movement", "Financing Movement", AccountType.CASH_FLOW, "cash_flow_statement", "credit", "financing", 6000, ["financing activities", "debt proceeds", "debt repayment", "us-gaap:proceedsfromissuanceofdebt", "us-gaap:proceedsfromissuanceoflongtermdebt", "us-gaap:repaymentsofdebt"]),
+    ]
+    # Sub-accounts roll up into their parent's statement line.
+    sub_account_specs = [
+        ("payroll", "operating_expenses", "Payroll", AccountType.EXPENSE, "income_statement", "debit", None, 310, ["payroll", "payroll expenses", "salaries", "salaries and wages", "wages", "us-gaap:laborandrelatedexpense"]),
+        ("rent", "operating_expenses", "Rent", AccountType.EXPENSE, "income_statement", "debit", None, 320, ["rent", "rent expense", "rent or lease", "lease expense", "us-gaap:operatingleaseexpense"]),
+        ("software", "operating_expenses", "Software", AccountType.EXPENSE, "income_statement", "debit", None, 330, ["software", "software subscriptions", "computer software"]),
+    ]
+    return [
+        *(
+            AccountCategory(
+                id=account_id,
+                name=name,
+                type=account_type,
+                level=1,
+                description=name,
+                statement=statement,
+                normal_balance=normal_balance,
+                cash_flow_section=cf_section,
+                sort_order=order,
+                aliases=aliases,
+            )
+            for account_id, name, account_type, statement, normal_balance, cf_section, order, aliases in account_specs
+        ),
+        *(
+            AccountCategory(
+                id=account_id,
+                name=name,
+                type=account_type,
+                parent_id=parent_id,
+                level=2,
+                description=name,
+                statement=statement,
+                normal_balance=normal_balance,
+                cash_flow_section=cf_section,
+                sort_order=order,
+                aliases=aliases,
+            )
+            for account_id, parent_id, name, account_type, statement, normal_balance, cf_section, order, aliases in sub_account_specs
+        ),
+    ]
@@ -0,0 +1,114 @@
+"""Chart-of-accounts files and their compiled on-disk cache.
+
+An ontology file is JSON, or YAML with the optional ``pyyaml`` dependency
+(``waccy[yaml]``). It holds a list of accounts, or a mapping whose ``accounts``
+key holds one, and each account has the ``AccountCategory`` fields::
+
+    accounts:
+      - id: payroll
+        name: Payroll
+        type: expense
+        parent_id: operating_expenses
+        level: 2
+        description: Salaries and wages
+        statement: income_statement
+        sort_order: 310
+        aliases: [salaries, wages]
+
+With a ``cache_dir``, ``load_ontology`` keeps the compiled ontology there as a
+snapshot named after the SHA-256 of the file's bytes. Later processes
+memory-map that snapshot instead of validating and normalizing every alias
+again, and any edit to the file changes the name and compiles afresh. The cache
+requires pyarrow (``waccy[arrow]``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from waccy.core.ontology import AccountCategory, CompiledOntology
+from waccy.core.snapshot import ontology_from_snapshot, ontology_to_snapshot
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+ONTOLOGY_CACHE_SUFFIX = ".waccy-ontology"
+_YAML_SUFFIXES = frozenset({".yaml", ".yml"})
+
+
+def load_ontology(path: str | Path, *, cache_dir: str | Path | None = None) -> CompiledOntology:
+    """Compile the ontology in ``path``, reusing the compiled cache in ``cache_dir``."""
+    path = Path(path)
+    content = path.read_bytes()
+    if cache_dir is None:
+        return CompiledOntology.from_accounts(_accounts(_parse(path, content), path))
+
+    digest = hashlib.sha256(content).hexdigest()
+    cache_path = Path(cache_dir) / f"{digest}{ONTOLOGY_CACHE_SUFFIX}"
+    if cache_path.exists():
+        try:
+            compiled, content_hash = ontology_from_snapshot(cache_path)
+        except (OSError, ValueError):
+            # Written by another WACCY version, or truncated: compile it again.
+            pass
+        else:
+            if content_hash == digest:
+                return compiled
+
+    compiled = CompiledOntology.from_accounts(_accounts(_parse(path, content), path))
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # Concurrent workers each write their own file and the last rename wins.
+    partial = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    ontology_to_snapshot(compiled, partial, content_hash=digest)
+    partial.replace(cache_path)
+    return compiled
+
+
+def read_ontology_accounts(path: str | Path) -> list[AccountCategory]:
+    """Read and validate the accounts in an ontology file."""
+    path = Path(path)
+    return _accounts(_parse(path, path.read_bytes()), path)
+
+
+def write_ontology(accounts: Iterable[AccountCategory], path: str | Path) -> None:
+    """Write ``accounts`` as an ontology file; the suffix selects JSON or YAML."""
+    path = Path(path)
+    document = {"accounts": [account.model_dump(mode="json") for account in accounts]}
+    if path.suffix.lower() in _YAML_SUFFIXES:
+        path.write_text(_yaml().safe_dump(document, sort_keys=False), encoding="utf-8")
+    else:
+        path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+
+def _parse(path: Path, content: bytes) -> Any:
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        return json.loads(content)
+    if suffix in _YAML_SUFFIXES:
+        return _yaml().safe_load(content)
+    raise ValueError(f"Unsupported ontology file {path.name!r}; expected .json, .yaml, or .yml.")
+
+
+def _accounts(document: Any, path: Path) -> list[AccountCategory]:
+    items = document.get("accounts") if isinstance(document, dict) else document
+    if not isinstance(items, list):
+        raise ValueError(f"Ontology file {path} must hold a list of accounts.")
+    accounts: dict[str, AccountCategory] = {}
+    for item in items:
+        account = AccountCategory.model_validate(item)
+        if account.id in accounts:
+            raise ValueError(f"Ontology file {path} defines account {account.id!r} twice.")
+        accounts[account.id] = account
+    return list(accounts.values())
+
+
+def _yaml() -> Any:
+    try:
+        import yaml  # noqa: PLC0415
+    except ImportError as error:
+        raise ImportError('YAML ontology files require pyyaml; install "waccy[yaml]".') from error
+    return yaml
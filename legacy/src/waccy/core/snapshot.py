@@ -0,0 +1,432 @@
+"""Versioned binary snapshots of validated datasets, models, and compiled ontologies.
+
+Requires the optional ``pyarrow`` dependency (``waccy[arrow]``). A snapshot is a
+16-byte prefix (magic and header length), a JSON header keyed to
+``CONTRACT_SCHEMA_VERSION``, and Arrow IPC sections at 64-byte aligned offsets.
+
+Reading memory-maps the file. Record columns of a validated dataset become
+zero-copy numpy views over the mapping, and distinct string values, mapping
+diagnostics, and record metadata are decoded on first use, so opening a snapshot does not depend on
+how many records it holds. Dataset-level fields (periods, issues, metadata, and
+source accounts) are read from the header when the snapshot is opened; models
+and compiled ontologies are small and are decoded in full.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, overload
+
+import numpy as np
+from pydantic_core import to_json
+
+from waccy.core.arrow import model_from_arrow, model_to_arrow
+from waccy.core.batch import (
+    MAPPING_STATUSES,
+    DictionaryColumn,
+    MappedRecordBatch,
+    SourceRecordBatch,
+)
+from waccy.core.models import (
+    CONTRACT_SCHEMA_VERSION,
+    MappedFinancialDataset,
+    MappingDiagnostic,
+    MappingStatus,
+    ThreeStatementModel,
+    ValidatedFinancialDataset,
+)
+from waccy.core.ontology import AccountCategory, AccountType, CompiledOntology, account_keys
+from waccy.core.trusted import construct
+
+SNAPSHOT_MAGIC = b"WACCYSNP"
+SNAPSHOT_FORMAT_VERSION = 1
+_PREFIX = struct.Struct("<8sI4x")
+_ALIGNMENT = 64
+
+_SOURCE_COLUMNS = (
+    ("source_account_id", "account_ids"),
+    ("source_account_name", "account_names"),
+    ("period_label", "periods"),
+    ("statement", "statements"),
+    ("source_account_type", "source_account_types"),
+    ("unit", "units"),
+    ("source_system", "source_systems"),
+    ("source_id", "source_ids"),
+    ("source_label", "source_labels"),
+)
+
+
+def validated_dataset_to_snapshot(dataset: ValidatedFinancialDataset, path: str | Path) -> None:
+    """Write a validated dataset to ``path`` as a binary snapshot."""
+    fields, sections = _validated_sections(dataset)
+    _write(Path(path), "validated", fields, sections)
+
+
+def validated_dataset_from_snapshot(path: str | Path) -> ValidatedFinancialDataset:
+    """Open a validated dataset snapshot backed by a memory map of ``path``."""
+    fields, sections = _read(Path(path), "validated")
+    return _validated_from_sections(fields, sections)
+
+
+def model_to_snapshot(model: ThreeStatementModel, path: str | Path) -> None:
+    """Write a three-statement model to ``path`` as a binary snapshot."""
+    _write(Path(path), "model", {}, {"model": model_to_arrow(model)})
+
+
+def model_from_snapshot(path: str | Path) -> ThreeStatementModel:
+    """Read a three-statement model snapshot."""
+    _, sections = _read(Path(path), "model")
+    return model_from_arrow(sections["model"])
+
+
+def ontology_to_snapshot(
+    compiled: CompiledOntology, path: str | Path, *, content_hash: str = ""
+) -> None:
+    """Write a compiled ontology, with its normalized alias keys, to ``path``."""
+    pa = _pyarrow()
+    accounts = list(compiled.accounts.values())
+    rows = [
+        {**account.model_dump(mode="json"), "normalized_keys": account_keys(account)}
+        for account in accounts
+    ]
+    _write(
+        Path(path),
+        "ontology",
+        {"content_hash": content_hash},
+        {"accounts": pa.Table.from_pylist(rows, schema=_ontology_schema(pa))},
+    )
+
+
+def ontology_from_snapshot(path: str | Path) -> tuple[CompiledOntology, str]:
+    """Read a compiled ontology snapshot and the content hash it was written with.
+
+    Accounts are trusted as written and the stored alias keys are reused, so no
+    alias is validated or normalized again.
+    """
+    fields, sections = _read(Path(path), "ontology")
+    accounts: list[AccountCategory] = []
+    normalized_keys: list[list[str]] = []
+    for row in sections["accounts"].to_pylist():
+        normalized_keys.append(row.pop("normalized_keys"))
+        account_type = AccountType(row.pop("type"))
+        accounts.append(construct(AccountCategory, **row, type=account_type))
+    return CompiledOntology.from_accounts(accounts, normalized_keys), fields["content_hash"]
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow as pa  # noqa: PLC0415
+    except ImportError as error:
+        raise ImportError('Snapshots require pyarrow; install "waccy[arrow]".') from error
+    return pa
+
+
+def _write(path: Path, kind: str, fields: dict[str, Any], sections: dict[str, Any]) -> None:
+    pa = _pyarrow()
+    blobs: dict[str, Any] = {}
+    for name, table in sections.items():
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        blobs[name] = sink.getvalue()
+
+    offsets: dict[str, list[int]] = {}
+    position = 0
+    for name, blob in blobs.items():
+        offsets[name] = [position, blob.size]
+        position = _aligned(position + blob.size)
+    header = json.dumps(
+        {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "schema_version": CONTRACT_SCHEMA_VERSION,
+            "kind": kind,
+            "fields": fields,
+            "sections": offsets,
+        }
+    ).encode()
+    header += b" " * (_aligned(_PREFIX.size + len(header)) - _PREFIX.size - len(header))
+
+    with path.open("wb") as file:
+        file.write(_PREFIX.pack(SNAPSHOT_MAGIC, len(header)))
+        file.write(header)
+        for name, blob in blobs.items():
+            file.write(blob)
+            file.write(
+                b"\0" * (_aligned(offsets[name][0] + blob.size) - offsets[name][0] - blob.size)
+            )
+
+
+def _read(path: Path, kind: str) -> tuple[dict[str, Any], dict[str, Any]]:
+    pa = _pyarrow()
+    data = pa.memory_map(str(path), "r").read_buffer()
+    header, data_start = _read_header(data, path)
+    if header["kind"] != kind:
+        raise ValueError(f"Snapshot {path} holds {header['kind']!r} data, not {kind!r}.")
+    sections = {
+        name: pa.ipc.open_file(data.slice(data_start + offset, length)).read_all()
+        for name, (offset, length) in header["sections"].items()
+    }
+    return header["fields"], sections
+
+
+def _read_header(data: Any, path: Path) -> tuple[dict[str, Any], int]:
+    if data.size < _PREFIX.size:
+        raise ValueError(f"{path} is not a WACCY snapshot.")
+    magic, header_length = _PREFIX.unpack(data.slice(0, _PREFIX.size).to_pybytes())
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a WACCY snapshot.")
+    header: dict[str, Any] = json.loads(data.slice(_PREFIX.size, header_length).to_pybytes())
+    if header["format_version"] != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"Snapshot format {header['format_version']} is not supported; "
+            f"expected {SNAPSHOT_FORMAT_VERSION}."
+        )
+    if header["schema_version"] != CONTRACT_SCHEMA_VERSION:
+        raise ValueError(
+            f"Snapshot was written for contract schema {header['schema_version']}; "
+            f"this WACCY reads {CONTRACT_SCHEMA_VERSION}."
+        )
+    return header, _PREFIX.size + header_length
+
+
+def _ontology_schema(pa: Any) -> Any:
+    text = pa.string()
+    return pa.schema(
+        [
+            ("id", text),
+            ("name", text),
+            ("type", text),
+            ("parent_id", text),
+            ("level", pa.int32()),
+            ("description", text),
+            ("statement", text),
+            ("normal_balance", text),
+            ("cash_flow_section", text),
+            ("sort_order", pa.int32()),
+            ("aliases", pa.list_(text)),
+            ("normalized_keys", pa.list_(text)),
+        ]
+    )
+
+
+def _aligned(position: int) -> int:
+    return -(-position // _ALIGNMENT) * _ALIGNMENT
+
+
+def _validated_sections(
+    dataset: ValidatedFinancialDataset,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    pa = _pyarrow()
+    mapped = dataset.mapped_dataset
+    records = (
+        mapped.records
+        if isinstance(mapped.records, MappedRecordBatch)
+        else MappedRecordBatch.from_records(mapped.records)
+    )
+    source = (
+        records.source
+        if isinstance(records.source, SourceRecordBatch)
+        else SourceRecordBatch.from_records(records.source)
+    )
+    columns: dict[str, Any] = {
+        name: _dictionary(getattr(source, attribute)) for name, attribute in _SOURCE_COLUMNS
+    }
+    columns["amount_coefficient"] = pa.array(source.amount_coefficients, type=pa.int64())
+    columns["amount_exponent"] = pa.array(source.amount_exponents, type=pa.int16())
+    columns["account_code"] = pa.array(records.account_codes, type=pa.int32())
+    columns["status_code"] = pa.array(records.status_codes, type=pa.int8())
+    columns["confidence"] = pa.array(records.confidences, type=pa.float64())
+
+    diagnostic_codes = [diagnostic.code for diagnostic in records.diagnostics]
+    diagnostic_messages = [diagnostic.message for diagnostic in records.diagnostics]
+    sections = {
+        "records": pa.table(columns),
+        "diagnostic_offsets": pa.table(
+            {"offset": pa.array(records.diagnostic_offsets, type=pa.int32())}
+        ),
+        "diagnostics": pa.table(
+            {
+                "code": pa.array(diagnostic_codes, type=pa.string()).dictionary_encode(),
+                "message": pa.array(diagnostic_messages, type=pa.string()).dictionary_encode(),
+            }
+        ),
+        "accounts": pa.table(
+            {
+                "account_id": pa.array([account[0] for account in records.accounts], pa.string()),
+                "account_name": pa.array([account[1] for account in records.accounts], pa.string()),
+            }
+        ),
+        "amount_overflow": _sparse(
+            {row: str(amount) for row, amount in source.amount_overflow.items()}
+        ),
+        "metadata": _sparse(
+            {row: to_json(value).decode() for row, value in source.metadata.items() if value}
+        ),
+        "source_metadata": _sparse(
+            {row: to_json(value).decode() for row, value in source.source_metadata.items() if value}
+        ),
+        "override_notes": _sparse(records.override_notes),
+    }
+    fields = {
+        "validated": dataset.model_dump(mode="json", exclude={"mapped_dataset"}),
+        "mapped": mapped.model_dump(mode="json", exclude={"records"}),
+        "statuses": [status.value for status in MAPPING_STATUSES],
+    }
+    return fields, sections
+
+
+def _validated_from_sections(
+    fields: dict[str, Any],
+    sections: dict[str, Any],
+) -> ValidatedFinancialDataset:
+    records = sections["records"]
+    source = SourceRecordBatch(
+        **{attribute: _dictionary_column(records, name) for name, attribute in _SOURCE_COLUMNS},
+        amount_coefficients=_numpy(records, "amount_coefficient"),
+        amount_exponents=_numpy(records, "amount_exponent"),
+        amount_overflow={
+            row: Decimal(amount) for row, amount in _sparse_items(sections["amount_overflow"])
+        },
+        metadata=_json_rows(sections["metadata"]),
+        source_metadata=_json_rows(sections["source_metadata"]),
+    )
+
+    status_codes = _numpy(records, "status_code")
+    stored_statuses = [MappingStatus(value) for value in fields["statuses"]]
+    if stored_statuses != list(MAPPING_STATUSES):
+        translation = np.array(
+            [MAPPING_STATUSES.index(status) for status in stored_statuses], dtype=np.int8
+        )
+        status_codes = translation[status_codes]
+    accounts = sections["accounts"].to_pydict()
+    diagnostics = sections["diagnostics"]
+    mapped_records = MappedRecordBatch(
+        source,
+        accounts=list(zip(accounts["account_id"], accounts["account_name"], strict=True)),
+        account_codes=_numpy(records, "account_code"),
+        status_codes=status_codes,
+        confidences=_numpy(records, "confidence"),
+        diagnostic_offsets=_numpy(sections["diagnostic_offsets"], "offset"),
+        diagnostics=_DecodedOnUse(
+            lambda: [
+                construct(MappingDiagnostic, code=code, message=message)
+                for code, message in zip(
+                    diagnostics.column("code").to_pylist(),
+                    diagnostics.column("message").to_pylist(),
+                    strict=True,
+                )
+            ],
+            diagnostics.num_rows,
+        ),
+        override_notes=dict(_sparse_items(sections["override_notes"])),
+    )
+    mapped = MappedFinancialDataset.model_validate({**fields["mapped"], "records": mapped_records})
+    return ValidatedFinancialDataset.model_validate(
+        {**fields["validated"], "mapped_dataset": mapped}
+    )
+
+
+class _DecodedOnUse(Sequence[Any]):
+    """A sequence whose values are decoded from the snapshot when first read."""
+
+    def __init__(self, decode: Callable[[], list[Any]], length: int) -> None:
+        self._decode: Callable[[], list[Any]] | None = decode
+        self._length = length
+        self._values: list[Any] = []
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Any]: ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        return self._decoded()[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._decoded())
+
+    def _decoded(self) -> list[Any]:
+        if self._decode is not None:
+            self._values = self._decode()
+            self._decode = None
+        return self._values
+
+
+class _RowsDecodedOnUse(Mapping[int, Any]):
+    """A row-keyed mapping whose values are decoded from the snapshot when first read."""
+
+    def __init__(self, decode: Callable[[], dict[int, Any]], length: int) -> None:
+        self._decode: Callable[[], dict[int, Any]] | None = decode
+        self._length = length
+        self._values: dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, row: int) -> Any:
+        return self._decoded()[row]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._decoded())
+
+    def _decoded(self) -> dict[int, Any]:
+        if self._decode is not None:
+            self._values = self._decode()
+            self._decode = None
+        return self._values
+
+
+def _json_rows(table: Any) -> _RowsDecodedOnUse:
+    return _RowsDecodedOnUse(
+        lambda: {row: json.loads(value) for row, value in _sparse_items(table)}, table.num_rows
+    )
+
+
+def _dictionary(column: DictionaryColumn) -> Any:
+    pa = _pyarrow()
+    return pa.DictionaryArray.from_arrays(
+        pa.array(column.codes, type=pa.int32()), pa.array(list(column.values), type=pa.string())
+    )
+
+
+def _dictionary_column(table: Any, name: str) -> DictionaryColumn:
+    array = _array(table, name)
+    dictionary = array.dictionary
+    return DictionaryColumn(
+        array.indices.to_numpy(zero_copy_only=True),
+        _DecodedOnUse(dictionary.to_pylist, len(dictionary)),
+    )
+
+
+def _numpy(table: Any, name: str) -> np.ndarray:
+    values: np.ndarray = _array(table, name).to_numpy(zero_copy_only=True)
+    return values
+
+
+def _array(table: Any, name: str) -> Any:
+    column = table.column(name)
+    return column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+
+
+def _sparse(values: dict[int, str]) -> Any:
+    pa = _pyarrow()
+    return pa.table(
+        {
+            "row": pa.array(list(values), type=pa.int64()),
+            "value": pa.array(list(values.values()), type=pa.string()),
+        }
+    )
+
+
+def _sparse_items(table: Any) -> list[tuple[int, str]]:
+    return list(
+        zip(table.column("row").to_pylist(), table.column("value").to_pylist(), strict=True)
+    )
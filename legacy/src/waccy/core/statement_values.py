@@ -0,0 +1,236 @@
+"""Dense period-indexed amounts for financial statement lines.
+
+``StatementValues`` holds the amounts of a block of statement lines as one
+``(lines x periods)`` array over a shared ``PeriodIndex``. Each line's ``values``
+is a ``PeriodValues`` view of its row, which behaves like the ``dict[str, Decimal]``
+it replaces and serializes as one. Writing to a view copies its row out of the
+shared table first, so the other lines never see the change.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping, Sequence
+from decimal import Decimal
+from typing import overload
+
+import numpy as np
+
+ZERO = Decimal("0")
+
+
+class PeriodIndex(Sequence[str]):
+    """Ordered period labels with their column positions.
+
+    A label that repeats keeps its first position, as a repeated dict key would.
+    """
+
+    __slots__ = ("labels", "positions")
+
+    def __init__(self, labels: Iterable[str]) -> None:
+        """Initialize the index from period labels in column order."""
+        self.labels = tuple(dict.fromkeys(labels))
+        self.positions = {label: position for position, label in enumerate(self.labels)}
+
+    def __len__(self) -> int:
+        """Return the number of periods."""
+        return len(self.labels)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | Sequence[str]:
+        """Return period labels by position."""
+        return self.labels[index]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over period labels in column order."""
+        return iter(self.labels)
+
+    def __contains__(self, label: object) -> bool:
+        """Return whether ``label`` is one of the indexed periods."""
+        return label in self.positions
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether ``other`` indexes the same labels in the same order."""
+        if isinstance(other, PeriodIndex):
+            return self is other or self.labels == other.labels
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """Hash the label order."""
+        return hash(self.labels)
+
+    def __repr__(self) -> str:
+        """Return a compact representation."""
+        return f"{type(self).__name__}({list(self.labels)!r})"
+
+    def position(self, label: str) -> int:
+        """Return the column position of ``label``."""
+        return self.positions[label]
+
+
+class StatementValues:
+    """Amounts for a block of statement lines as one ``(lines x periods)`` array.
+
+    Cells hold ``Decimal`` values so amounts keep the exponents they were summed
+    with; arithmetic over rows is elementwise across every period at once.
+    """
+
+    def __init__(self, periods: PeriodIndex, amounts: np.ndarray) -> None:
+        """Initialize the table from a period index and a 2-D amount array."""
+        if amounts.ndim != 2 or amounts.shape[1] != len(periods):
+            raise ValueError("Statement values need one column per indexed period.")
+        self.periods = periods
+        self.amounts = amounts
+
+    @classmethod
+    def from_lines(
+        cls,
+        periods: Sequence[str],
+        values: Sequence[Mapping[str, Decimal]],
+    ) -> StatementValues:
+        """Stack per-line values into one table; periods a line lacks read as zero.
+
+        Lines whose values are already the rows of one table, in order, share it.
+        """
+        index = period_index(periods)
+        shared = _shared_table(index, values)
+        if shared is not None:
+            return shared
+        amounts = np.full((len(values), len(index)), ZERO, dtype=object)
+        for row, line_values in enumerate(values):
+            if isinstance(line_values, PeriodValues) and line_values.periods == index:
+                amounts[row] = line_values.amounts
+            else:
+                amounts[row] = [line_values.get(label, ZERO) for label in index]
+        return cls(index, amounts)
+
+    def __len__(self) -> int:
+        """Return the number of lines."""
+        return int(self.amounts.shape[0])
+
+    def __repr__(self) -> str:
+        """Return a compact representation."""
+        return f"{type(self).__name__}(lines={len(self)}, periods={len(self.periods)})"
+
+    def line(self, row: int) -> PeriodValues:
+        """Return the dict-style view of one line's amounts."""
+        if not -len(self) <= row < len(self):
+            raise IndexError("Statement values row out of range.")
+        return PeriodValues(self, row % len(self))
+
+
+class PeriodValues(MutableMapping[str, Decimal]):
+    """Dict-style view of one statement line's amounts, keyed by period label.
+
+    Reads go to the shared table. Writes and deletions move the line onto a
+    single-row table of its own first, with a new period appended as a column.
+    """
+
+    __slots__ = ("row", "table")
+
+    def __init__(self, table: StatementValues, row: int) -> None:
+        """Initialize the view over ``table`` row ``row``."""
+        self.table = table
+        self.row = row
+
+    @classmethod
+    def from_amounts(cls, periods: Sequence[str], amounts: Iterable[Decimal]) -> PeriodValues:
+        """Return a single-line view over amounts given in period order."""
+        index = period_index(periods)
+        if isinstance(amounts, np.ndarray) and amounts.dtype == object:
+            row = amounts.reshape(1, -1)
+        else:
+            row = np.fromiter(amounts, dtype=object, count=len(index)).reshape(1, -1)
+        return cls(StatementValues(index, row), 0)
+
+    @classmethod
+    def from_mapping(cls, periods: Sequence[str], values: Mapping[str, Decimal]) -> PeriodValues:
+        """Return a single-line view over ``values``; missing periods read as zero."""
+        return cls.from_amounts(periods, (values.get(label, ZERO) for label in periods))
+
+    @property
+    def periods(self) -> PeriodIndex:
+        """Return the shared period index."""
+        return self.table.periods
+
+    @property
+    def amounts(self) -> np.ndarray:
+        """Return this line's row of the shared table."""
+        row: np.ndarray = self.table.amounts[self.row]
+        return row
+
+    def __getitem__(self, label: str) -> Decimal:
+        """Return the amount for one period label."""
+        value: Decimal = self.table.amounts[self.row, self.table.periods.positions[label]]
+        return value
+
+    def __setitem__(self, label: str, value: Decimal) -> None:
+        """Set the amount for one period label, adding the period if it is new."""
+        periods = self.table.periods
+        amounts = self.amounts.copy()
+        position = periods.positions.get(label)
+        if position is None:
+            periods = PeriodIndex((*periods.labels, label))
+            amounts = np.append(amounts, np.array([value], dtype=object))
+        else:
+            amounts[position] = value
+        self._own(periods, amounts)
+
+    def __delitem__(self, label: str) -> None:
+        """Remove one period label and its amount."""
+        position = self.table.periods.positions[label]
+        labels = list(self.table.periods.labels)
+        del labels[position]
+        self._own(PeriodIndex(labels), np.delete(self.amounts, position))
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over period labels in column order."""
+        return iter(self.table.periods)
+
+    def __len__(self) -> int:
+        """Return the number of periods."""
+        return len(self.table.periods)
+
+    def __contains__(self, label: object) -> bool:
+        """Return whether ``label`` is one of the line's periods."""
+        return label in self.table.periods
+
+    def __repr__(self) -> str:
+        """Return the values as they would print from a dict."""
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def to_dict(self) -> dict[str, Decimal]:
+        """Return the amounts as a plain dict in period order."""
+        return dict(zip(self.table.periods.labels, self.amounts.tolist(), strict=True))
+
+    def _own(self, periods: PeriodIndex, amounts: np.ndarray) -> None:
+        self.table = StatementValues(periods, amounts.reshape(1, -1))
+        self.row = 0
+
+
+def period_index(periods: Sequence[str]) -> PeriodIndex:
+    """Return ``periods`` as a ``PeriodIndex``, reusing it when it already is one."""
+    return periods if isinstance(periods, PeriodIndex) else PeriodIndex(periods)
+
+
+def _shared_table(
+    index: PeriodIndex,
+    values: Sequence[Mapping[str, Decimal]],
+) -> StatementValues | None:
+    if not values or not isinstance(values[0], PeriodValues):
+        return None
+    table = values[0].table
+    if table.periods != index or len(table) != len(values):
+        return None
+    for row, line_values in enumerate(values):
+        if not (
+            isinstance(line_values, PeriodValues)
+            and line_values.table is table
+            and line_values.row == row
+        ):
+            return None
+    return table
@@ -0,0 +1,137 @@
+"""Incremental JSON output for large datasets and three-statement models.
+
+``iter_json`` yields the JSON document of a contract model piece by piece, so
+records, statement lines, and issues are serialized one at a time instead of
+building the whole document in memory. The output is byte-for-byte what
+``json.dumps(value.model_dump(mode="json"), indent=indent, sort_keys=sort_keys)``
+produces; the defaults match the conformance fixtures.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+
+from waccy.core.models import (
+    FinancialStatement,
+    MappedFinancialDataset,
+    NormalizedFinancialDataset,
+    ThreeStatementModel,
+    ValidatedFinancialDataset,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+# Fields written element by element; every other field is serialized whole.
+_STREAMED_FIELDS: dict[type[BaseModel], frozenset[str]] = {
+    ThreeStatementModel: frozenset(
+        {"income_statement", "balance_sheet", "cash_flow_statement", "validation_issues"}
+    ),
+    FinancialStatement: frozenset({"lines"}),
+    ValidatedFinancialDataset: frozenset({"mapped_dataset", "issues"}),
+    MappedFinancialDataset: frozenset({"records"}),
+    NormalizedFinancialDataset: frozenset({"records"}),
+}
+_BUFFER_SIZE = 1 << 16
+
+
+def iter_json(
+    value: BaseModel,
+    *,
+    indent: int | None = 2,
+    sort_keys: bool = True,
+) -> Iterator[str]:
+    """Yield the JSON text of ``value`` in order, one element at a time."""
+    encoder = json.JSONEncoder(indent=indent, sort_keys=sort_keys)
+    yield from _JsonChunks(encoder, indent, sort_keys).model(value, 0)
+
+
+def write_json(
+    value: BaseModel,
+    target: str | Path | IO[str],
+    *,
+    indent: int | None = 2,
+    sort_keys: bool = True,
+) -> None:
+    """Write the JSON text of ``value`` to a path or text stream incrementally.
+
+    Pass ``socket.makefile("w", encoding="utf-8")`` to stream over a socket.
+    """
+    if isinstance(target, str | Path):
+        with Path(target).open("w", encoding="utf-8") as file:
+            _write(file, iter_json(value, indent=indent, sort_keys=sort_keys))
+        return
+    _write(target, iter_json(value, indent=indent, sort_keys=sort_keys))
+
+
+def _write(stream: IO[str], chunks: Iterator[str]) -> None:
+    buffer: list[str] = []
+    size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= _BUFFER_SIZE:
+            stream.write("".join(buffer))
+            buffer.clear()
+            size = 0
+    stream.write("".join(buffer))
+    stream.flush()
+
+
+class _JsonChunks:
+    def __init__(self, encoder: json.JSONEncoder, indent: int | None, sort_keys: bool) -> None:
+        self._encoder = encoder
+        self._indent = indent
+        self._sort_keys = sort_keys
+
+    def model(self, model: BaseModel, level: int) -> Iterator[str]:
+        streamed = _STREAMED_FIELDS.get(type(model), frozenset())
+        if not streamed:
+            yield self._encoded(model.model_dump(mode="json"), level)
+            return
+        names = list(type(model).model_fields)
+        whole = model.model_dump(mode="json", exclude=set(streamed))
+        if self._sort_keys:
+            names.sort()
+        yield "{"
+        for position, name in enumerate(names):
+            if position:
+                yield self._encoder.item_separator
+            yield self._newline(level + 1)
+            yield self._encoder.encode(name) + self._encoder.key_separator
+            if name not in streamed:
+                yield self._encoded(whole[name], level + 1)
+                continue
+            field_value = getattr(model, name)
+            if isinstance(field_value, BaseModel):
+                yield from self.model(field_value, level + 1)
+            else:
+                yield from self._array(field_value, level + 1)
+        yield self._newline(level) + "}"
+
+    def _array(self, items: Sequence[BaseModel], level: int) -> Iterator[str]:
+        if not len(items):
+            yield "[]"
+            return
+        yield "["
+        for position, item in enumerate(items):
+            if position:
+                yield self._encoder.item_separator
+            yield self._newline(level + 1)
+            yield from self.model(item, level + 1)
+        yield self._newline(level) + "]"
+
+    def _encoded(self, value: Any, level: int) -> str:
+        text = self._encoder.encode(value)
+        if self._indent is None or not level:
+            return text
+        return text.replace("\n", self._newline(level))
+
+    def _newline(self, level: int) -> str:
+        if self._indent is None:
+            return ""
+        return "\n" + " " * (self._indent * level)
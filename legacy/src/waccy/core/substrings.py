@@ -0,0 +1,101 @@
+"""Substring matching of normalized alias keys against a source key.
+
+Confidence scoring asks whether any of an account's alias keys occurs in a
+source key, or the source key occurs in one of them. ``SubstringIndex`` answers
+the first direction for every account at once: an Aho-Corasick automaton over all
+keys makes one pass over the source key and reports each account with a key that
+occurs in it. The second direction is a single search of the account's keys
+joined into one string.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+# Normalized keys are alphanumeric, so no match can span two joined keys.
+_SEPARATOR = "\0"
+
+
+class SubstringIndex:
+    """Aho-Corasick automaton over groups of keys, such as each account's aliases.
+
+    The automaton is built on the first lookup, so compiling an ontology does not
+    pay for an index that only confidence scoring uses.
+    """
+
+    __slots__ = ("_always", "_fail", "_goto", "_groups", "_joined", "_outputs")
+
+    def __init__(self, groups: Mapping[str, Iterable[str]]) -> None:
+        """Index the keys of every group."""
+        self._groups = {group: tuple(dict.fromkeys(keys)) for group, keys in groups.items()}
+        self._joined = {
+            group: _SEPARATOR.join(keys) for group, keys in self._groups.items() if keys
+        }
+        # Groups with an empty key match every text.
+        self._always = frozenset(group for group, keys in self._groups.items() if "" in keys)
+        self._goto: list[dict[str, int]] | None = None
+        self._fail: list[int] = []
+        self._outputs: list[frozenset[str]] = []
+
+    def __len__(self) -> int:
+        """Return the number of groups."""
+        return len(self._groups)
+
+    def occurring_in(self, text: str) -> frozenset[str]:
+        """Return the groups with a key that occurs in ``text``."""
+        goto = self._goto if self._goto is not None else self._build()
+        fail, outputs = self._fail, self._outputs
+        found = set(self._always)
+        state = 0
+        for character in text:
+            while state and character not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(character, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return frozenset(found)
+
+    def occurs_in(self, group: str, text: str) -> bool:
+        """Return whether ``text`` occurs in one of ``group``'s keys."""
+        joined = self._joined.get(group)
+        return joined is not None and text in joined
+
+    def _build(self) -> list[dict[str, int]]:
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[set[str]] = [set()]
+        for group, keys in self._groups.items():
+            for key in keys:
+                state = 0
+                for character in key:
+                    child = goto[state].get(character)
+                    if child is None:
+                        child = goto[state][character] = len(goto)
+                        goto.append({})
+                        outputs.append(set())
+                    state = child
+                if state:
+                    outputs[state].add(group)
+
+        # Breadth-first, each state's failure link points at a shallower state
+        # whose outputs are already complete.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, child in goto[state].items():
+                queue.append(child)
+                link = fail[state]
+                while link and character not in goto[link]:
+                    link = fail[link]
+                target = goto[link].get(character, 0)
+                fail[child] = target if target != child else 0
+                outputs[child].update(outputs[fail[child]])
+
+        self._fail = fail
+        self._outputs = [frozenset(output) for output in outputs]
+        self._goto = goto
+        return goto
@@ -0,0 +1,104 @@
+"""Trusted construction of contract models built inside the pipeline.
+
+Pipeline stages build records, datasets, and statements from inputs that pydantic
+has already validated, so they construct models without validating them again.
+Set ``WACCY_STRICT_VALIDATION=1`` or use ``strict_validation()`` to validate every
+internally built model while debugging.
+"""
+
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+STRICT_VALIDATION_ENV = "WACCY_STRICT_VALIDATION"
+
+_STRICT_DEFAULT = os.environ.get(STRICT_VALIDATION_ENV, "").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
+_strict_override: ContextVar[bool | None] = ContextVar("waccy_strict_validation", default=None)
+
+
+def strict_validation_enabled() -> bool:
+    """Return whether internally built models are fully validated."""
+    override = _strict_override.get()
+    return _STRICT_DEFAULT if override is None else override
+
+
+@contextmanager
+def strict_validation(enabled: bool = True) -> Iterator[None]:
+    """Turn full validation of internally built models on or off for a block."""
+    token = _strict_override.set(enabled)
+    try:
+        yield
+    finally:
+        _strict_override.reset(token)
+
+
+def construct[ModelT: BaseModel](model_type: type[ModelT], /, **fields: Any) -> ModelT:
+    """Build ``model_type`` from already-validated field values.
+
+    Field values must already have the declared types; defaults are filled in for
+    omitted fields. Under strict validation the model is validated as usual.
+    """
+    if strict_validation_enabled():
+        return model_type(**fields)
+    defaults = _field_defaults(model_type)
+    if defaults is None:
+        return model_type.model_construct(**fields)
+    values: dict[str, Any] = {}
+    for name, default, default_factory in defaults:
+        if name in fields:
+            values[name] = fields[name]
+        elif default_factory is not None:
+            values[name] = default_factory()
+        else:
+            values[name] = default
+    instance = model_type.__new__(model_type)
+    _set_attribute(instance, "__dict__", values)
+    _set_attribute(instance, "__pydantic_fields_set__", set(fields))
+    _set_attribute(instance, "__pydantic_extra__", None)
+    _set_attribute(instance, "__pydantic_private__", None)
+    return instance
+
+
+def replace[ModelT: BaseModel](model: ModelT, /, **updates: Any) -> ModelT:
+    """Return a copy of an already-validated model with ``updates`` applied."""
+    if strict_validation_enabled():
+        return type(model)(**{**dict(model), **updates})
+    return model.model_copy(update=updates)
+
+
+_set_attribute = object.__setattr__
+
+
+@cache
+def _field_defaults(
+    model_type: type[BaseModel],
+) -> tuple[tuple[str, Any, Callable[[], Any] | None], ...] | None:
+    """Return ``(name, default, default_factory)`` per field, or None for unusual models.
+
+    ``model_construct`` handles private attributes and extra fields; every other
+    model takes the direct path, which skips its per-call field bookkeeping.
+    """
+    if model_type.__private_attributes__ or model_type.model_config.get("extra") == "allow":
+        return None
+    return tuple(
+        (
+            name,
+            None if field.is_required() or field.default_factory else field.default,
+            field.default_factory,  # type: ignore[misc]
+        )
+        for name, field in model_type.model_fields.items()
+    )
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import numpy as np
+
+from waccy.core.batch import MappedRecordBatch, SourceRecordBatch
 from waccy.core.models import (
     ExtractedData,
     IssueSeverity,
@@ -10,6 +13,7 @@ from waccy.core.models import (
     ValidatedFinancialDataset,
     ValidationIssue,
 )
+from waccy.core.trusted import construct
 
 
 def validate_extracted_data(data: ExtractedData) -> bool:
@@ -41,78 +45,149 @@ def validate_mapped_dataset(mapped_dataset: MappedFinancialDataset) -> Validated
             )
 
     period_labels = {period.label for period in mapped_dataset.periods}
-    for record in mapped_dataset.records:
-        if record.source_record.period_label not in period_labels:
-            issues.append(
-                ValidationIssue(
-                    code="missing_period",
-                    message=(
-                        f"Record {record.source_record.source.source_id!r} references missing "
-                        f"period {record.source_record.period_label!r}."
-                    ),
-                    period_label=record.source_record.period_label,
+    if isinstance(mapped_dataset.records, MappedRecordBatch):
+        issues.extend(_record_batch_issues(mapped_dataset.records, period_labels))
+    else:
+        for record in mapped_dataset.records:
+            source_record = record.source_record
+            issues.extend(
+                _record_issues(
+                    source_id=source_record.source.source_id,
+                    source_account_name=source_record.source_account_name,
+                    period_label=source_record.period_label,
+                    is_summary_check=bool(source_record.source.metadata.get("is_summary_check")),
+                    has_known_period=source_record.period_label in period_labels,
+                    status=record.status,
                     account_id=record.account_id,
                 )
             )
-        if record.status in {MappingStatus.MAPPED, MappingStatus.OVERRIDDEN} and not record.account_id:
-            issues.append(
-                ValidationIssue(
-                    code="missing_mapped_account_id",
-                    message=(
-                        f"Record {record.source_record.source.source_id!r} is {record.status.value!r} "
-                        "but has no canonical account_id."
-                    ),
-                    severity=IssueSeverity.ERROR,
-                    period_label=record.source_record.period_label,
-                )
+
+    if not mapped_dataset.records:
+        issues.append(
+            ValidationIssue(
+                code="empty_dataset",
+                message="No financial records are available for validation.",
             )
-        if record.status == MappingStatus.UNMAPPED:
-            if record.source_record.source.metadata.get("is_summary_check"):
-                issues.append(
-                    ValidationIssue(
-                        code="unmapped_source_check",
-                        message=(
-                            f"Unmapped source check {record.source_record.source_account_name!r}."
-                        ),
-                        severity=IssueSeverity.INFO,
-                        period_label=record.source_record.period_label,
-                    )
-                )
-                continue
-            issues.append(
-                ValidationIssue(
-                    code="unmapped_account",
-                    message=f"Unmapped account {record.source_record.source_account_name!r}.",
-                    severity=IssueSeverity.ERROR,
-                    period_label=record.source_record.period_label,
-                )
+        )
+
+    return construct(ValidatedFinancialDataset, mapped_dataset=mapped_dataset, issues=issues)
+
+
+def _record_batch_issues(
+    records: MappedRecordBatch,
+    period_labels: set[str],
+) -> list[ValidationIssue]:
+    """Validate a mapped batch from its arrays, visiting only rows that raise issues."""
+    source = records.source
+    if isinstance(source, SourceRecordBatch):
+        known_period_codes = np.array(
+            [label in period_labels for label in source.periods.values], dtype=bool
+        )
+        known_periods = known_period_codes[source.periods.codes]
+    else:
+        known_periods = np.fromiter(
+            (record.period_label in period_labels for record in source),
+            dtype=bool,
+            count=len(source),
+        )
+    flagged = ~known_periods | records.issue_rows()
+
+    issues: list[ValidationIssue] = []
+    for row in np.flatnonzero(flagged).tolist():
+        if isinstance(source, SourceRecordBatch):
+            source_id = source.source_ids[row]
+            source_account_name = source.account_names[row]
+            period_label = source.periods[row]
+            is_summary_check = source.source_metadata.get(row, {}).get("is_summary_check")
+        else:
+            record = source[row]
+            source_id = record.source.source_id
+            source_account_name = record.source_account_name
+            period_label = record.period_label
+            is_summary_check = record.source.metadata.get("is_summary_check")
+        issues.extend(
+            _record_issues(
+                source_id=source_id,
+                source_account_name=source_account_name,
+                period_label=period_label,
+                is_summary_check=bool(is_summary_check),
+                has_known_period=bool(known_periods[row]),
+                status=records.status(row),
+                account_id=records.account_id(row),
             )
-        elif record.status == MappingStatus.AMBIGUOUS:
-            issues.append(
-                ValidationIssue(
-                    code="ambiguous_mapping",
-                    message=f"Ambiguous account {record.source_record.source_account_name!r}.",
-                    severity=IssueSeverity.WARNING,
-                    period_label=record.source_record.period_label,
-                )
+        )
+    return issues
+
+
+def _record_issues(
+    *,
+    source_id: str,
+    source_account_name: str,
+    period_label: str,
+    is_summary_check: bool,
+    has_known_period: bool,
+    status: MappingStatus,
+    account_id: str | None,
+) -> list[ValidationIssue]:
+    issues: list[ValidationIssue] = []
+    if not has_known_period:
+        issues.append(
+            ValidationIssue(
+                code="missing_period",
+                message=(
+                    f"Record {source_id!r} references missing period {period_label!r}."
+                ),
+                period_label=period_label,
+                account_id=account_id,
             )
-        elif record.status == MappingStatus.OVERRIDDEN and record.account_id:
+        )
+    if status in {MappingStatus.MAPPED, MappingStatus.OVERRIDDEN} and not account_id:
+        issues.append(
+            ValidationIssue(
+                code="missing_mapped_account_id",
+                message=(
+                    f"Record {source_id!r} is {status.value!r} but has no canonical account_id."
+                ),
+                severity=IssueSeverity.ERROR,
+                period_label=period_label,
+            )
+        )
+    if status == MappingStatus.UNMAPPED:
+        if is_summary_check:
             issues.append(
                 ValidationIssue(
-                    code="mapping_overridden",
-                    message=f"Mapping overridden for {record.source_record.source_account_name!r}.",
+                    code="unmapped_source_check",
+                    message=f"Unmapped source check {source_account_name!r}.",
                     severity=IssueSeverity.INFO,
-                    period_label=record.source_record.period_label,
-                    account_id=record.account_id,
+                    period_label=period_label,
                 )
             )
-
-    if not mapped_dataset.records:
+            return issues
         issues.append(
             ValidationIssue(
-                code="empty_dataset",
-                message="No financial records are available for validation.",
+                code="unmapped_account",
+                message=f"Unmapped account {source_account_name!r}.",
+                severity=IssueSeverity.ERROR,
+                period_label=period_label,
             )
         )
-
-    return ValidatedFinancialDataset(mapped_dataset=mapped_dataset, issues=issues)
+    elif status == MappingStatus.AMBIGUOUS:
+        issues.append(
+            ValidationIssue(
+                code="ambiguous_mapping",
+                message=f"Ambiguous account {source_account_name!r}.",
+                severity=IssueSeverity.WARNING,
+                period_label=period_label,
+            )
+        )
+    elif status == MappingStatus.OVERRIDDEN and account_id:
+        issues.append(
+            ValidationIssue(
+                code="mapping_overridden",
+                message=f"Mapping overridden for {source_account_name!r}.",
+                severity=IssueSeverity.INFO,
+                period_label=period_label,
+                account_id=account_id,
+            )
+        )
+    return issues
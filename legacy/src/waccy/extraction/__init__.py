@@ -1,7 +1,7 @@
 """Data extraction from various sources."""
 
 from waccy.extraction.base import ExtractedData, ExtractedTransaction, Extractor
-from waccy.extraction.mapper import DataMapper
+from waccy.extraction.mapper import DataMapper, MappingPlan
 from waccy.extraction.registry import ExtractorRegistry
 
 __all__ = [
@@ -10,4 +10,5 @@ __all__ = [
     "ExtractedTransaction",
     "Extractor",
     "ExtractorRegistry",
+    "MappingPlan",
 ]
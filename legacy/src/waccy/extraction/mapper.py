@@ -2,13 +2,25 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import math
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+import numpy as np
+
+from waccy.core.batch import (
+    MappedRecordBatch,
+    MappingDecision,
+    SourceRecordBatch,
+    SourceRecordBatchBuilder,
+)
+from waccy.core.interning import dataset_string_pool, intern_identifier
 from waccy.core.models import (
     ExtractedData,
     MappedFinancialDataset,
-    MappedFinancialRecord,
     MappingDiagnostic,
     MappingOverride,
     MappingStatus,
@@ -19,34 +31,110 @@ from waccy.core.models import (
     ValidatedFinancialDataset,
 )
 from waccy.core.ontology import StandardChartOfAccounts
+from waccy.core.trusted import construct, replace
 from waccy.core.validation import validate_mapped_dataset
 from waccy.utils.dates import infer_reporting_period
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from waccy.core.fuzzy import TrigramIndex
+    from waccy.core.ontology import AccountCategory
+
+# Fuzzy suggestions kept on an AMBIGUOUS decision.
+_FUZZY_LIMIT = 3
+
+# Fixture keys that populate SourceRecord fields; anything else is kept as record metadata.
+_SOURCE_RECORD_KEYS = frozenset(
+    {
+        "account_id",
+        "account_type",
+        "amount",
+        "id",
+        "metadata",
+        "name",
+        "period",
+        "source_account_id",
+        "source_account_name",
+        "source_account_type",
+        "source_id",
+        "source_label",
+        "statement",
+        "unit",
+    }
+)
+
+
+type MappingKey = tuple[str, str, str, str | None]
+
 
 def _period_from_label(label: str) -> ReportingPeriod:
     return infer_reporting_period(label)
 
 
+@dataclass(slots=True)
+class MappingPlan:
+    """Mapping decisions by ``(source account id, name, source system, statement)`` key.
+
+    ``DataMapper.plan`` compiles one over the distinct keys of a dataset, and
+    ``DataMapper.map_dataset(plan=...)`` shares its decisions, diagnostics
+    included, with every record of a planned key, deciding and adding only the
+    keys it has not seen. ``fingerprint`` identifies the ontology, fuzzy index,
+    and overrides the decisions were made under, so a plan can be kept and reused
+    across runs for the same entity while those are unchanged.
+    """
+
+    fingerprint: str
+    decisions: dict[MappingKey, MappingDecision] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        """Return the number of planned mapping keys."""
+        return len(self.decisions)
+
+
 class DataMapper:
     """Maps extracted source data to WACCY standard accounts."""
 
-    def __init__(self, ontology: StandardChartOfAccounts | None = None) -> None:
-        """Initialize the mapper with standard ontology."""
+    def __init__(
+        self,
+        ontology: StandardChartOfAccounts | None = None,
+        fuzzy_index: TrigramIndex | None = None,
+    ) -> None:
+        """Initialize the mapper with standard ontology.
+
+        With ``fuzzy_index``, source accounts that match no alias exactly are
+        marked ``AMBIGUOUS`` with the closest accounts as suggestions instead of
+        ``UNMAPPED``. Pass ``ontology.fuzzy_index()``, or
+        ``PatternMatcher.fuzzy_index()`` to include learned aliases.
+        """
         self.ontology = ontology or StandardChartOfAccounts()
+        self.fuzzy_index = fuzzy_index
 
     def normalize(self, extracted_data: ExtractedData) -> NormalizedFinancialDataset:
         """Normalize extractor output into the source-agnostic financial dataset."""
+        with dataset_string_pool():
+            return self._normalize(extracted_data)
+
+    def _normalize(self, extracted_data: ExtractedData) -> NormalizedFinancialDataset:
+        if isinstance(extracted_data.source_records, SourceRecordBatch) and len(
+            extracted_data.source_records
+        ):
+            return self._normalize_batch(extracted_data, extracted_data.source_records)
+
         records = list(extracted_data.source_records)
         if not records and extracted_data.transactions:
+            source_system = intern_identifier(str(extracted_data.metadata.get("source", "unknown")))
             records = [
-                SourceRecord(
-                    source_account_id=txn.account_id,
-                    source_account_name=txn.account_id,
+                construct(
+                    SourceRecord,
+                    source_account_id=intern_identifier(txn.account_id),
+                    source_account_name=intern_identifier(txn.account_id),
                     amount=txn.amount,
-                    period_label=str(txn.date.year),
+                    period_label=intern_identifier(str(txn.date.year)),
                     statement=None,
-                    source=SourceReference(
-                        source_system=str(extracted_data.metadata.get("source", "unknown")),
+                    source=construct(
+                        SourceReference,
+                        source_system=source_system,
                         source_id=txn.source_id,
                         source_label=txn.description,
                     ),
@@ -54,109 +142,314 @@ class DataMapper:
                 for txn in extracted_data.transactions
             ]
 
-        periods_by_label = {period.label: period for period in extracted_data.periods}
-        inferred_period_labels: dict[str, str] = {}
-        for record in records:
-            if record.period_label in periods_by_label:
-                continue
-            try:
-                period = _period_from_label(record.period_label)
-            except ValueError:
-                continue
-            periods_by_label.setdefault(period.label, period)
-            inferred_period_labels[record.period_label] = period.label
-
-        if inferred_period_labels:
+        periods_by_label, inferred_period_labels = self._infer_periods(
+            extracted_data.periods, (record.period_label for record in records)
+        )
+        relabeled = {
+            label: inferred for label, inferred in inferred_period_labels.items() if label != inferred
+        }
+        if relabeled:
             records = [
-                record.model_copy(
-                    update={
-                        "period_label": inferred_period_labels.get(
-                            record.period_label, record.period_label
-                        )
-                    }
-                )
+                replace(record, period_label=relabeled[record.period_label])
+                if record.period_label in relabeled
+                else record
                 for record in records
             ]
 
-        return NormalizedFinancialDataset(
+        return construct(
+            NormalizedFinancialDataset,
             entity_name=extracted_data.entity_name,
             periods=sorted(periods_by_label.values(), key=lambda period: period.start_date),
             records=records,
-            metadata=extracted_data.metadata,
+            accounts=dict(extracted_data.accounts),
+            metadata=dict(extracted_data.metadata),
         )
 
+    def _normalize_batch(
+        self,
+        extracted_data: ExtractedData,
+        records: SourceRecordBatch,
+    ) -> NormalizedFinancialDataset:
+        periods_by_label, inferred_period_labels = self._infer_periods(
+            extracted_data.periods, records.periods.values
+        )
+        if inferred_period_labels:
+            records = records.with_period_labels(inferred_period_labels)
+        return construct(
+            NormalizedFinancialDataset,
+            entity_name=extracted_data.entity_name,
+            periods=sorted(periods_by_label.values(), key=lambda period: period.start_date),
+            records=records,
+            accounts=dict(extracted_data.accounts),
+            metadata=dict(extracted_data.metadata),
+        )
+
+    @staticmethod
+    def _infer_periods(
+        periods: Iterable[ReportingPeriod],
+        period_labels: Iterable[str],
+    ) -> tuple[dict[str, ReportingPeriod], dict[str, str]]:
+        periods_by_label = {period.label: period for period in periods}
+        inferred_period_labels: dict[str, str] = {}
+        for period_label in period_labels:
+            if period_label in periods_by_label:
+                continue
+            try:
+                period = _period_from_label(period_label)
+            except ValueError:
+                continue
+            label = intern_identifier(period.label)
+            periods_by_label.setdefault(label, period)
+            inferred_period_labels[period_label] = label
+        return periods_by_label, inferred_period_labels
+
+    def plan(
+        self,
+        dataset: NormalizedFinancialDataset,
+        overrides: dict[str, str | MappingOverride] | None = None,
+        *,
+        plan: MappingPlan | None = None,
+    ) -> MappingPlan:
+        """Decide every distinct mapping key of ``dataset`` without mapping its records.
+
+        Keys already in ``plan`` are not decided again; the plan is extended and
+        returned, or a new one when ``plan`` is ``None``.
+        """
+        overrides = overrides or {}
+        plan = self._checked_plan(plan, overrides)
+        keys, _ = self._mapping_keys(dataset.records)
+        self._planned_decisions(keys, overrides, plan)
+        return plan
+
     def map_dataset(
         self,
         dataset: NormalizedFinancialDataset,
         overrides: dict[str, str | MappingOverride] | None = None,
+        *,
+        plan: MappingPlan | None = None,
     ) -> MappedFinancialDataset:
-        """Map normalized source records to WACCY standard accounts."""
+        """Map normalized source records to WACCY standard accounts.
+
+        With ``plan``, records whose key it holds take its decision, and the
+        decisions for the remaining keys are added to it.
+        """
         overrides = overrides or {}
-        mapped_records: list[MappedFinancialRecord] = []
-        for record in dataset.records:
-            override = self._find_override(record, overrides)
-            if override is not None:
-                mapped_records.append(self._apply_override(record, override))
-                continue
+        if plan is not None:
+            self._checked_plan(plan, overrides)
+        keys, decision_codes = self._mapping_keys(dataset.records)
+        mapped_records = MappedRecordBatch.from_decisions(
+            dataset.records, self._planned_decisions(keys, overrides, plan), decision_codes
+        )
+
+        return construct(
+            MappedFinancialDataset,
+            entity_name=dataset.entity_name,
+            periods=list(dataset.periods),
+            records=mapped_records,
+            metadata=dict(dataset.metadata),
+        )
 
-            candidates = self.ontology.map_candidates(
+    def plan_fingerprint(self, overrides: dict[str, str | MappingOverride] | None = None) -> str:
+        """Return the fingerprint of plans this mapper makes under ``overrides``."""
+        digest = hashlib.blake2b(self.ontology.version.encode(), digest_size=16)
+        fuzzy_version = self.fuzzy_index.version if self.fuzzy_index is not None else ""
+        digest.update(f"\0{fuzzy_version}\0".encode())
+        digest.update(
+            json.dumps(
+                sorted(
+                    (key, value.account_id, value.note)
+                    if isinstance(value, MappingOverride)
+                    else (key, value, "")
+                    for key, value in (overrides or {}).items()
+                )
+            ).encode()
+        )
+        return digest.hexdigest()
+
+    def _checked_plan(
+        self,
+        plan: MappingPlan | None,
+        overrides: dict[str, str | MappingOverride],
+    ) -> MappingPlan:
+        fingerprint = self.plan_fingerprint(overrides)
+        if plan is None:
+            return MappingPlan(fingerprint)
+        if plan.fingerprint != fingerprint:
+            raise ValueError(
+                "Mapping plan was compiled under a different ontology, fuzzy index, or overrides."
+            )
+        return plan
+
+    def _planned_decisions(
+        self,
+        keys: list[MappingKey],
+        overrides: dict[str, str | MappingOverride],
+        plan: MappingPlan | None,
+    ) -> list[MappingDecision]:
+        if plan is None:
+            return self._decide_many(keys, overrides)
+        decisions = plan.decisions
+        missing = [key for key in keys if key not in decisions]
+        decisions.update(zip(missing, self._decide_many(missing, overrides), strict=True))
+        return [decisions[key] for key in keys]
+
+    @staticmethod
+    def _mapping_keys(
+        records: Sequence[SourceRecord],
+    ) -> tuple[list[MappingKey], np.ndarray]:
+        """Return the distinct mapping keys of ``records`` and each row's key code."""
+        if isinstance(records, SourceRecordBatch):
+            return DataMapper._batch_mapping_keys(records)
+        decision_lookup: dict[MappingKey, int] = {}
+        decision_codes = np.empty(len(records), dtype=np.int32)
+        for row, record in enumerate(records):
+            key = (
+                record.source_account_id,
                 record.source_account_name,
                 record.source.source_system,
+                record.statement,
             )
-            if len(candidates) > 1 and record.statement:
-                statement_candidates = [
-                    account for account in candidates if account.statement == record.statement
-                ]
-                if statement_candidates:
-                    candidates = statement_candidates
-            if len(candidates) == 1:
-                account = candidates[0]
-                mapped_records.append(
-                    MappedFinancialRecord(
-                        source_record=record,
-                        account_id=account.id,
-                        account_name=account.name,
-                        status=MappingStatus.MAPPED,
-                        confidence=0.95,
-                    )
-                )
-            elif len(candidates) > 1:
-                mapped_records.append(
-                    MappedFinancialRecord(
-                        source_record=record,
-                        status=MappingStatus.AMBIGUOUS,
-                        confidence=0.4,
-                        diagnostics=[
-                            MappingDiagnostic(
-                                code="ambiguous_mapping",
-                                message=(
-                                    "Source account matched multiple WACCY accounts: "
-                                    + ", ".join(account.id for account in candidates)
-                                ),
-                            )
-                        ],
-                    )
-                )
-            else:
-                mapped_records.append(
-                    MappedFinancialRecord(
-                        source_record=record,
-                        status=MappingStatus.UNMAPPED,
-                        confidence=0.0,
-                        diagnostics=[
-                            MappingDiagnostic(
-                                code="unmapped_account",
-                                message=f"No WACCY account mapping for {record.source_account_name!r}.",
-                            )
-                        ],
-                    )
-                )
+            code = decision_lookup.get(key)
+            if code is None:
+                code = decision_lookup[key] = len(decision_lookup)
+            decision_codes[row] = code
+        return list(decision_lookup), decision_codes
 
-        return MappedFinancialDataset(
-            entity_name=dataset.entity_name,
-            periods=dataset.periods,
-            records=mapped_records,
-            metadata=dataset.metadata,
+    @staticmethod
+    def _batch_mapping_keys(records: SourceRecordBatch) -> tuple[list[MappingKey], np.ndarray]:
+        """Find distinct keys over the dictionary codes, so no row builds a tuple."""
+        if not len(records):
+            return [], np.zeros(0, dtype=np.int32)
+        columns = [
+            records.account_ids,
+            records.account_names,
+            records.source_systems,
+            records.statements,
+        ]
+        sizes = [len(column.values) for column in columns]
+        if math.prod(sizes) < 1 << 63:
+            # Mixed-radix packing keeps the row order of the four codes, and a
+            # one-dimensional unique sorts far faster than a row-wise one.
+            packed = np.zeros(len(records), dtype=np.int64)
+            for column, size in zip(columns, sizes, strict=True):
+                packed *= size
+                packed += column.codes
+            unique_packed, decision_codes = np.unique(packed, return_inverse=True)
+            unique_keys = np.empty((len(unique_packed), len(columns)), dtype=np.int64)
+            for position in range(len(columns) - 1, -1, -1):
+                unique_packed, unique_keys[:, position] = np.divmod(unique_packed, sizes[position])
+        else:
+            unique_keys, decision_codes = np.unique(
+                np.stack([column.codes for column in columns], axis=1), axis=0, return_inverse=True
+            )
+        return [
+            (
+                records.account_ids.values[account_code],
+                records.account_names.values[name_code],
+                records.source_systems.values[system_code],
+                records.statements.values[statement_code],
+            )
+            for account_code, name_code, system_code, statement_code in unique_keys.tolist()
+        ], decision_codes.reshape(-1).astype(np.int32)
+
+    def _decide_many(
+        self,
+        keys: Sequence[MappingKey],
+        overrides: dict[str, str | MappingOverride],
+    ) -> list[MappingDecision]:
+        """Decide distinct ``(account id, name, system, statement)`` keys in order."""
+        matches = self.ontology.map_candidates_many(
+            (source_system, source_account_name, statement)
+            for _, source_account_name, source_system, statement in keys
+        )
+        decisions = [
+            self._decide(account_id, name, source_system, matches[code], overrides)
+            for code, (account_id, name, source_system, _) in enumerate(keys)
+        ]
+        if self.fuzzy_index is not None:
+            for code, (_, name, _, statement) in enumerate(keys):
+                if decisions[code].status == MappingStatus.UNMAPPED:
+                    suggestion = self._suggest(self.fuzzy_index, name, statement)
+                    decisions[code] = suggestion or decisions[code]
+        return decisions
+
+    def _suggest(
+        self,
+        fuzzy_index: TrigramIndex,
+        source_account_name: str,
+        statement: str | None,
+    ) -> MappingDecision | None:
+        """Return an ``AMBIGUOUS`` decision listing fuzzy candidates, if any resemble the name."""
+        matches = fuzzy_index.search(source_account_name, limit=_FUZZY_LIMIT)
+        if statement:
+            on_statement = [
+                match
+                for match in matches
+                if (account := self.ontology.get_account(match.account_id)) is not None
+                and account.statement == statement
+            ]
+            matches = on_statement or matches
+        if not matches:
+            return None
+        return MappingDecision(
+            status=MappingStatus.AMBIGUOUS,
+            confidence=round(0.4 * matches[0].score, 4),
+            diagnostics=(
+                MappingDiagnostic(
+                    code="fuzzy_candidates",
+                    message=(
+                        f"No exact WACCY account mapping for {source_account_name!r}; closest: "
+                        + ", ".join(f"{match.account_id} ({match.score:.2f})" for match in matches)
+                    ),
+                ),
+            ),
+        )
+
+    def _decide(
+        self,
+        source_account_id: str,
+        source_account_name: str,
+        source_system: str,
+        candidates: Sequence[AccountCategory],
+        overrides: dict[str, str | MappingOverride],
+    ) -> MappingDecision:
+        override = self._find_override(
+            source_account_id, source_account_name, source_system, overrides
+        )
+        if override is not None:
+            return self._apply_override(override)
+
+        if len(candidates) == 1:
+            account = candidates[0]
+            return MappingDecision(
+                account_id=account.id,
+                account_name=account.name,
+                status=MappingStatus.MAPPED,
+                confidence=0.95,
+            )
+        if len(candidates) > 1:
+            return MappingDecision(
+                status=MappingStatus.AMBIGUOUS,
+                confidence=0.4,
+                diagnostics=(
+                    MappingDiagnostic(
+                        code="ambiguous_mapping",
+                        message=(
+                            "Source account matched multiple WACCY accounts: "
+                            + ", ".join(account.id for account in candidates)
+                        ),
+                    ),
+                ),
+            )
+        return MappingDecision(
+            status=MappingStatus.UNMAPPED,
+            confidence=0.0,
+            diagnostics=(
+                MappingDiagnostic(
+                    code="unmapped_account",
+                    message=f"No WACCY account mapping for {source_account_name!r}.",
+                ),
+            ),
         )
 
     def validate(self, mapped_dataset: MappedFinancialDataset) -> ValidatedFinancialDataset:
@@ -167,49 +460,50 @@ class DataMapper:
         self,
         extracted_data: ExtractedData,
         overrides: dict[str, str | MappingOverride] | None = None,
+        *,
+        plan: MappingPlan | None = None,
     ) -> ValidatedFinancialDataset:
         """Normalize, map, and validate extracted data."""
         normalized = self.normalize(extracted_data)
-        mapped = self.map_dataset(normalized, overrides=overrides)
+        mapped = self.map_dataset(normalized, overrides=overrides, plan=plan)
         return self.validate(mapped)
 
     def _find_override(
         self,
-        record: SourceRecord,
+        source_account_id: str,
+        source_account_name: str,
+        source_system: str,
         overrides: dict[str, str | MappingOverride],
     ) -> str | MappingOverride | None:
+        if not overrides:
+            return None
         keys = [
-            record.source_account_id,
-            record.source_account_name,
-            f"{record.source.source_system}:{record.source_account_id}",
-            f"{record.source.source_system}:{record.source_account_name}",
+            source_account_id,
+            source_account_name,
+            f"{source_system}:{source_account_id}",
+            f"{source_system}:{source_account_name}",
         ]
         for key in keys:
             if key in overrides:
                 return overrides[key]
         return None
 
-    def _apply_override(
-        self,
-        record: SourceRecord,
-        override: str | MappingOverride,
-    ) -> MappedFinancialRecord:
+    def _apply_override(self, override: str | MappingOverride) -> MappingDecision:
         override_model = (
             override
             if isinstance(override, MappingOverride)
             else MappingOverride(account_id=override)
         )
         account = self.ontology.get_account(override_model.account_id)
-        diagnostics = []
+        diagnostics: tuple[MappingDiagnostic, ...] = ()
         if account is None:
-            diagnostics.append(
+            diagnostics = (
                 MappingDiagnostic(
                     code="invalid_override",
                     message=f"Override account {override_model.account_id!r} is not in the ontology.",
-                )
+                ),
             )
-        return MappedFinancialRecord(
-            source_record=record,
+        return MappingDecision(
             account_id=account.id if account else override_model.account_id,
             account_name=account.name if account else None,
             status=MappingStatus.OVERRIDDEN,
@@ -221,27 +515,60 @@ class DataMapper:
 
 def source_record_from_dict(data: dict[str, Any], source_system: str) -> SourceRecord:
     """Create a source record from a fixture dictionary."""
+    values = _source_record_values(data)
     return SourceRecord(
-        source_account_id=str(
-            data.get("source_account_id") or data.get("account_id") or data["name"]
-        ),
-        source_account_name=str(
-            data.get("source_account_name") or data.get("name") or data["account_id"]
-        ),
-        amount=Decimal(str(data["amount"])),
-        period_label=str(data["period"]),
-        statement=data.get("statement"),
-        source_account_type=data.get("source_account_type") or data.get("account_type"),
-        unit=str(data.get("unit", "USD")),
+        source_account_id=values["source_account_id"],
+        source_account_name=values["source_account_name"],
+        amount=values["amount"],
+        period_label=values["period_label"],
+        statement=values["statement"],
+        source_account_type=values["source_account_type"],
+        unit=values["unit"],
         source=SourceReference(
-            source_system=source_system,
-            source_id=str(
-                data.get("source_id") or data.get("id") or data.get("account_id") or data["name"]
-            ),
-            source_label=str(
-                data.get("source_label") or data.get("name") or data.get("account_id")
-            ),
-            metadata=dict(data.get("metadata", {})),
+            source_system=intern_identifier(source_system),
+            source_id=values["source_id"],
+            source_label=values["source_label"],
+            metadata=values["source_metadata"],
         ),
-        metadata={key: value for key, value in data.items() if key not in {"amount"}},
+        metadata=values["metadata"],
     )
+
+
+def source_record_batch_from_dicts(
+    rows: Iterable[dict[str, Any]],
+    source_system: str,
+) -> SourceRecordBatch:
+    """Create a columnar source record batch from fixture dictionaries."""
+    builder = SourceRecordBatchBuilder()
+    with dataset_string_pool():
+        for data in rows:
+            builder.append(source_system=source_system, **_source_record_values(data))
+    return builder.build()
+
+
+def _source_record_values(data: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "source_account_id": intern_identifier(
+            str(data.get("source_account_id") or data.get("account_id") or data["name"])
+        ),
+        "source_account_name": intern_identifier(
+            str(data.get("source_account_name") or data.get("name") or data["account_id"])
+        ),
+        "amount": Decimal(str(data["amount"])),
+        "period_label": intern_identifier(str(data["period"])),
+        "statement": intern_identifier(data.get("statement")),
+        "source_account_type": intern_identifier(
+            data.get("source_account_type") or data.get("account_type")
+        ),
+        "unit": intern_identifier(str(data.get("unit", "USD"))),
+        "source_id": str(
+            data.get("source_id") or data.get("id") or data.get("account_id") or data["name"]
+        ),
+        "source_label": intern_identifier(
+            str(data.get("source_label") or data.get("name") or data.get("account_id"))
+        ),
+        "source_metadata": dict(data.get("metadata", {})),
+        "metadata": {
+            key: value for key, value in data.items() if key not in _SOURCE_RECORD_KEYS
+        },
+    }
@@ -2,35 +2,57 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Iterable  # noqa: TC003
+from collections.abc import Iterable, Sequence
 from decimal import Decimal
 from typing import Any, Literal, NoReturn
 
+import numpy as np
+
 from waccy.core.models import (
     ExtractedData,
     FinancialStatement,
     IssueSeverity,
     MappedFinancialDataset,
     MappedFinancialRecord,
+    ReportingPeriod,
     StatementLine,
     ThreeStatementModel,
     ValidatedFinancialDataset,
     ValidationIssue,
 )
 from waccy.core.ontology import StandardChartOfAccounts
+from waccy.core.statement_values import PeriodIndex, PeriodValues, StatementValues
+from waccy.core.trusted import construct, replace
 from waccy.core.validation import validate_mapped_dataset
 from waccy.extraction.mapper import DataMapper
 from waccy.modeling.exporters import PandasExporter, SheetExporter
+from waccy.modeling.fixed_point import FixedPointLedger, FixedPointOverflowError, signed_sum
+from waccy.modeling.ledger import DecimalLedger
 
 ZERO = Decimal("0")
 
+type AmountEngine = Literal["decimal", "fixed_point"]
+
 
 class ModelBuilder:
     """Build financial models from normalized and validated financial data."""
 
-    def __init__(self) -> None:
-        """Initialize the model builder."""
-        self.ontology = StandardChartOfAccounts()
+    def __init__(
+        self,
+        amount_engine: AmountEngine = "decimal",
+        ontology: StandardChartOfAccounts | None = None,
+    ) -> None:
+        """Initialize the model builder.
+
+        ``amount_engine="fixed_point"`` aggregates amounts as int64 minor units and
+        converts back to ``Decimal`` only on the statement lines. Datasets whose
+        amounts cannot be held exactly that way are built with ``Decimal``. Each
+        statement line rolls up its account's sub-accounts in ``ontology``.
+        """
+        if amount_engine not in {"decimal", "fixed_point"}:
+            raise ValueError(f"Unsupported amount engine {amount_engine!r}.")
+        self.ontology = ontology or StandardChartOfAccounts()
+        self.amount_engine = amount_engine
 
     def build_three_statement_model(
         self,
@@ -42,37 +64,30 @@ class ModelBuilder:
         validated = self._ensure_validated(extracted_data)
         dataset = validated.mapped_dataset
         periods = dataset.periods
-        period_labels = [period.label for period in periods]
+        period_labels = PeriodIndex(period.label for period in periods)
         issues = list(validated.issues)
         issues.extend(self._source_completeness_issues(dataset.metadata))
 
-        income_lines = self._build_income_statement_lines(dataset.records, period_labels)
-        balance_lines = self._build_balance_sheet_lines(dataset.records, period_labels)
-        cash_flow_lines = self._build_cash_flow_lines(dataset.records, income_lines, balance_lines, period_labels)
+        income_lines, balance_lines, cash_flow_lines = self._build_statement_lines(
+            dataset.records, period_labels
+        )
         issues.extend(
             self._statement_issues(balance_lines, cash_flow_lines, period_labels, dataset.metadata)
         )
 
-        return ThreeStatementModel(
+        return construct(
+            ThreeStatementModel,
             entity_name=dataset.entity_name,
-            periods=periods,
-            income_statement=FinancialStatement(
-                name="Income Statement",
-                periods=periods,
-                lines=income_lines,
+            periods=list(periods),
+            income_statement=self._statement(
+                "Income Statement", periods, income_lines, period_labels
             ),
-            balance_sheet=FinancialStatement(
-                name="Balance Sheet",
-                periods=periods,
-                lines=balance_lines,
-            ),
-            cash_flow_statement=FinancialStatement(
-                name="Cash Flow Statement",
-                periods=periods,
-                lines=cash_flow_lines,
+            balance_sheet=self._statement("Balance Sheet", periods, balance_lines, period_labels),
+            cash_flow_statement=self._statement(
+                "Cash Flow Statement", periods, cash_flow_lines, period_labels
             ),
             validation_issues=issues,
-            metadata=dataset.metadata,
+            metadata=dict(dataset.metadata),
         )
 
     def build_dcf_model(
@@ -116,10 +131,38 @@ class ModelBuilder:
         mapper = DataMapper(self.ontology)
         return mapper.map_to_standard(data)
 
+    def _build_statement_lines(
+        self,
+        records: Sequence[MappedFinancialRecord],
+        period_labels: Sequence[str],
+    ) -> tuple[list[StatementLine], list[StatementLine], list[StatementLine]]:
+        hierarchy = self.ontology.compiled.hierarchy
+        if self.amount_engine == "fixed_point":
+            try:
+                ledger = FixedPointLedger.from_records(records, period_labels, hierarchy)
+                return self._build_statement_lines_from(ledger, period_labels)
+            except FixedPointOverflowError:
+                pass
+        return self._build_statement_lines_from(
+            DecimalLedger.from_records(records, period_labels, hierarchy), period_labels
+        )
+
+    def _build_statement_lines_from(
+        self,
+        records: Sequence[MappedFinancialRecord],
+        period_labels: Sequence[str],
+    ) -> tuple[list[StatementLine], list[StatementLine], list[StatementLine]]:
+        income_lines = self._build_income_statement_lines(records, period_labels)
+        balance_lines = self._build_balance_sheet_lines(records, period_labels)
+        cash_flow_lines = self._build_cash_flow_lines(
+            records, income_lines, balance_lines, period_labels
+        )
+        return income_lines, balance_lines, cash_flow_lines
+
     def _build_income_statement_lines(
         self,
-        records: list[MappedFinancialRecord],
-        period_labels: list[str],
+        records: Sequence[MappedFinancialRecord],
+        period_labels: Sequence[str],
     ) -> list[StatementLine]:
         revenue = self._line("Revenue", "revenue", records, period_labels)
         cogs = self._line("Cost of Goods Sold", "cogs", records, period_labels)
@@ -128,24 +171,16 @@ class ModelBuilder:
         interest = self._line("Interest Expense", "interest_expense", records, period_labels)
         taxes = self._line("Tax Expense", "tax_expense", records, period_labels)
         gross_profit = self._computed_line(
-            "Gross Profit",
-            period_labels,
-            lambda period: revenue.values[period] - cogs.values[period],
+            "Gross Profit", records, period_labels, plus=[revenue], minus=[cogs]
         )
         operating_income = self._computed_line(
-            "Operating Income",
-            period_labels,
-            lambda period: gross_profit.values[period] - opex.values[period] - da.values[period],
+            "Operating Income", records, period_labels, plus=[gross_profit], minus=[opex, da]
         )
         pretax_income = self._computed_line(
-            "Pre-Tax Income",
-            period_labels,
-            lambda period: operating_income.values[period] - interest.values[period],
+            "Pre-Tax Income", records, period_labels, plus=[operating_income], minus=[interest]
         )
         net_income = self._computed_line(
-            "Net Income",
-            period_labels,
-            lambda period: pretax_income.values[period] - taxes.values[period],
+            "Net Income", records, period_labels, plus=[pretax_income], minus=[taxes]
         )
         return [
             revenue,
@@ -162,8 +197,8 @@ class ModelBuilder:
 
     def _build_balance_sheet_lines(
         self,
-        records: list[MappedFinancialRecord],
-        period_labels: list[str],
+        records: Sequence[MappedFinancialRecord],
+        period_labels: Sequence[str],
     ) -> list[StatementLine]:
         cash = self._line("Cash", "cash", records, period_labels)
         ar = self._line("Accounts Receivable", "accounts_receivable", records, period_labels)
@@ -182,29 +217,23 @@ class ModelBuilder:
         retained_earnings = self._line("Retained Earnings", "retained_earnings", records, period_labels)
         total_assets = self._computed_line(
             "Total Assets",
+            records,
             period_labels,
-            lambda period: cash.values[period]
-            + ar.values[period]
-            + inventory.values[period]
-            + ppe.values[period]
-            - accumulated_depreciation.values[period],
+            plus=[cash, ar, inventory, ppe],
+            minus=[accumulated_depreciation],
         )
         total_liabilities = self._computed_line(
-            "Total Liabilities",
-            period_labels,
-            lambda period: ap.values[period] + accrued.values[period] + debt.values[period],
+            "Total Liabilities", records, period_labels, plus=[ap, accrued, debt]
         )
         total_equity = self._computed_line(
-            "Total Equity",
-            period_labels,
-            lambda period: equity.values[period] + retained_earnings.values[period],
+            "Total Equity", records, period_labels, plus=[equity, retained_earnings]
         )
         balance_check = self._computed_line(
             "Balance Check",
+            records,
             period_labels,
-            lambda period: total_assets.values[period]
-            - total_liabilities.values[period]
-            - total_equity.values[period],
+            plus=[total_assets],
+            minus=[total_liabilities, total_equity],
             is_check=True,
         )
         return [
@@ -226,37 +255,37 @@ class ModelBuilder:
 
     def _build_cash_flow_lines(
         self,
-        records: list[MappedFinancialRecord],
+        records: Sequence[MappedFinancialRecord],
         income_lines: list[StatementLine],
         balance_lines: list[StatementLine],
-        period_labels: list[str],
+        period_labels: Sequence[str],
     ) -> list[StatementLine]:
         income_net_income = self._find_line(income_lines, "Net Income")
         bs_cash = self._find_line(balance_lines, "Cash")
         net_income = self._line("Net Income", "net_income", records, period_labels)
-        if all(value == ZERO for value in net_income.values.values()):
-            net_income = StatementLine(label="Net Income", values=dict(income_net_income.values))
+        if all(value == ZERO for value in self._row(net_income, period_labels).tolist()):
+            net_income = self._computed_line(
+                "Net Income", records, period_labels, plus=[income_net_income], is_subtotal=False
+            )
         da = self._line("Depreciation Add-back", "depreciation_addback", records, period_labels)
-        if all(value == ZERO for value in da.values.values()):
+        if all(value == ZERO for value in self._row(da, period_labels).tolist()):
             da = self._line("Depreciation Add-back", "depreciation_amortization", records, period_labels)
         wc = self._line("Working Capital Movement", "working_capital_movement", records, period_labels)
         capex = self._line("Capital Expenditures", "capex", records, period_labels)
         financing = self._line("Financing Movement", "financing_movement", records, period_labels)
         net_change_cash = self._computed_line(
             "Net Change In Cash",
+            records,
             period_labels,
-            lambda period: net_income.values[period]
-            + da.values[period]
-            + wc.values[period]
-            + capex.values[period]
-            + financing.values[period],
+            plus=[net_income, da, wc, capex, financing],
             is_subtotal=True,
         )
         cash_flow_tie_out = self._computed_line(
             "Cash Flow Tie-Out",
+            records,
             period_labels,
-            lambda period: self._cash_change(period, period_labels, bs_cash)
-            - net_change_cash.values[period],
+            plus=[self._cash_change(bs_cash, records, period_labels)],
+            minus=[net_change_cash],
             is_check=True,
         )
         return [net_income, da, wc, capex, financing, net_change_cash, cash_flow_tie_out]
@@ -266,35 +295,47 @@ class ModelBuilder:
         label: str,
         account_id: str,
         records: Iterable[MappedFinancialRecord],
-        period_labels: list[str],
+        period_labels: Sequence[str],
     ) -> StatementLine:
-        values = dict.fromkeys(period_labels, ZERO)
-        source_account_ids: set[str] = set()
-        for record in records:
-            if record.account_id != account_id:
-                continue
-            period = record.source_record.period_label
-            if period in values:
-                values[period] += record.source_record.amount
-                source_account_ids.add(record.source_record.source_account_id)
-        return StatementLine(
-            label=label,
-            account_id=account_id,
-            values=values,
-            source_account_ids=sorted(source_account_ids),
-        )
+        if not isinstance(records, FixedPointLedger | DecimalLedger):
+            records = DecimalLedger.from_records(
+                records if isinstance(records, Sequence) else list(records),
+                period_labels,
+                self.ontology.compiled.hierarchy,
+            )
+        return records.line(label, account_id)
 
     def _computed_line(
         self,
         label: str,
-        period_labels: list[str],
-        calculate: Callable[[str], Decimal],
+        records: Iterable[MappedFinancialRecord],
+        period_labels: Sequence[str],
+        *,
+        plus: Sequence[StatementLine],
+        minus: Sequence[StatementLine] = (),
         is_check: bool = False,
         is_subtotal: bool = True,
     ) -> StatementLine:
-        return StatementLine(
+        if isinstance(records, FixedPointLedger):
+            amounts = [records.amounts(line) for line in (*plus, *minus)]
+            resolved = [values for values in amounts if values is not None]
+            if len(resolved) == len(amounts):
+                return records.statement_line(
+                    signed_sum(resolved[: len(plus)], resolved[len(plus) :]),
+                    label=label,
+                    is_subtotal=is_subtotal,
+                    is_check=is_check,
+                )
+
+        row = self._row(plus[0], period_labels).copy()
+        for line in plus[1:]:
+            row = row + self._row(line, period_labels)
+        for line in minus:
+            row = row - self._row(line, period_labels)
+        return construct(
+            StatementLine,
             label=label,
-            values={period: calculate(period) for period in period_labels},
+            values=PeriodValues.from_amounts(period_labels, row),
             is_subtotal=is_subtotal,
             is_check=is_check,
         )
@@ -307,32 +348,66 @@ class ModelBuilder:
 
     def _cash_change(
         self,
-        period: str,
-        period_labels: list[str],
         cash_line: StatementLine,
-    ) -> Decimal:
-        index = period_labels.index(period)
-        if index == 0:
-            return ZERO
-        current_period = period_labels[index]
-        previous_period = period_labels[index - 1]
-        return cash_line.values[current_period] - cash_line.values[previous_period]
+        records: Iterable[MappedFinancialRecord],
+        period_labels: Sequence[str],
+    ) -> StatementLine:
+        if isinstance(records, FixedPointLedger):
+            amounts = records.amounts(cash_line)
+            if amounts is not None:
+                return records.statement_line(amounts.period_change(), label="Cash Change")
+
+        cash = self._row(cash_line, period_labels)
+        row = np.full(len(period_labels), ZERO, dtype=object)
+        row[1:] = cash[1:] - cash[:-1]
+        return construct(
+            StatementLine,
+            label="Cash Change",
+            values=PeriodValues.from_amounts(period_labels, row),
+        )
+
+    def _row(self, line: StatementLine, period_labels: Sequence[str]) -> np.ndarray:
+        values = line.values
+        if isinstance(values, PeriodValues) and values.periods == period_labels:
+            return values.amounts
+        return np.array([values[period] for period in period_labels], dtype=object)
+
+    def _statement(
+        self,
+        name: Literal["Income Statement", "Balance Sheet", "Cash Flow Statement"],
+        periods: Sequence[ReportingPeriod],
+        lines: list[StatementLine],
+        period_labels: Sequence[str],
+    ) -> FinancialStatement:
+        table = StatementValues.from_lines(period_labels, [line.values for line in lines])
+        return construct(
+            FinancialStatement,
+            name=name,
+            periods=list(periods),
+            lines=[replace(line, values=table.line(row)) for row, line in enumerate(lines)],
+        )
 
     def _statement_issues(
         self,
         balance_lines: list[StatementLine],
         cash_flow_lines: list[StatementLine],
-        period_labels: list[str],
+        period_labels: Sequence[str],
         metadata: dict[str, Any],
     ) -> list[ValidationIssue]:
         issues: list[ValidationIssue] = []
         balance_check = self._find_line(balance_lines, "Balance Check")
         cash_flow_tie_out = self._find_line(cash_flow_lines, "Cash Flow Tie-Out")
-        for index, period in enumerate(period_labels):
+        rows = zip(
+            period_labels,
+            self._row(balance_check, period_labels).tolist(),
+            self._row(cash_flow_tie_out, period_labels).tolist(),
+            strict=True,
+        )
+        for index, (period, balance_difference, tie_out_difference) in enumerate(rows):
             has_partial_edgar_extraction = self._has_partial_edgar_extraction_for_period(
                 metadata, period
             )
-            if balance_check.values[period] != ZERO:
+            if balance_difference != ZERO:
                 issues.append(
                     ValidationIssue(
                         code="balance_sheet_imbalance",
@@ -344,19 +419,19 @@ class ModelBuilder:
                         ),
                         period_label=period,
                         metadata={
-                            "difference": str(balance_check.values[period]),
+                            "difference": str(balance_difference),
                             "partial_source_extraction": has_partial_edgar_extraction,
                         },
                     )
                 )
-            if index > 0 and cash_flow_tie_out.values[period] != ZERO:
+            if index > 0 and tie_out_difference != ZERO:
                 issues.append(
                     ValidationIssue(
                         code="cash_flow_tie_out_failure",
                         message=f"Cash flow does not tie to cash movement for {period}.",
                         severity=IssueSeverity.WARNING,
                         period_label=period,
-                        metadata={"difference": str(cash_flow_tie_out.values[period])},
+                        metadata={"difference": str(tie_out_difference)},
                     )
                 )
         return issues
@@ -3,7 +3,6 @@
 
 from __future__ import annotations
 
-from decimal import Decimal
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal
 
@@ -46,6 +45,7 @@ class SheetExporter:
         for column, period in enumerate(statement.periods, start=2):
             worksheet.cell(row=1, column=column, value=period.label)
 
+        amounts = statement.value_table().amounts
         for row, line in enumerate(statement.lines, start=2):
             label_cell = worksheet.cell(row=row, column=1, value=line.label)
             if line.is_subtotal or line.is_check:
@@ -53,8 +53,7 @@ class SheetExporter:
             if line.is_check:
                 label_cell.fill = CHECK_FILL
 
-            for column, period in enumerate(statement.periods, start=2):
-                value = line.values.get(period.label, Decimal("0"))
+            for column, value in enumerate(amounts[row - 2].tolist(), start=2):
                 value_cell = worksheet.cell(row=row, column=column, value=float(value))
                 value_cell.number_format = CURRENCY_FORMAT
                 if line.is_subtotal or line.is_check:
@@ -101,8 +100,9 @@ class PandasExporter:
         value_type: Literal["decimal", "float"],
     ) -> Any:
         pd = self._pandas()
+        table = statement.value_table()
         rows: list[dict[str, Any]] = []
-        for line in statement.lines:
+        for line, amounts in zip(statement.lines, table.amounts.tolist(), strict=True):
             row: dict[str, Any] = {
                 "line_item": line.label,
                 "account_id": line.account_id,
@@ -110,9 +110,8 @@ class PandasExporter:
                 "is_check": line.is_check,
                 "source_account_ids": tuple(line.source_account_ids),
             }
-            for period in statement.periods:
-                value = line.values.get(period.label, Decimal("0"))
-                row[period.label] = float(value) if value_type == "float" else value
+            for label, value in zip(table.periods, amounts, strict=True):
+                row[label] = float(value) if value_type == "float" else value
             rows.append(row)
         return pd.DataFrame(rows)
 
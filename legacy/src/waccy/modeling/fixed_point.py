@@ -0,0 +1,407 @@
+"""Exact scaled-integer amounts for model aggregation."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, overload
+
+import numpy as np
+
+from waccy.core.batch import MappedRecordBatch, SourceRecordBatch, split_decimal
+from waccy.core.models import MappedFinancialRecord, SourceRecord, StatementLine
+from waccy.core.ontology import AccountHierarchy, compiled_ontology
+from waccy.core.statement_values import PeriodValues, period_index
+from waccy.core.trusted import construct
+
+# ISO 4217 minor units for currencies that do not use cents. Anything else,
+# including non-currency units, is held at ``DEFAULT_MINOR_UNITS``.
+CURRENCY_MINOR_UNITS: dict[str, int] = {
+    "BHD": 3,
+    "BIF": 0,
+    "CLF": 4,
+    "CLP": 0,
+    "DJF": 0,
+    "GNF": 0,
+    "IQD": 3,
+    "ISK": 0,
+    "JOD": 3,
+    "JPY": 0,
+    "KMF": 0,
+    "KRW": 0,
+    "KWD": 3,
+    "LYD": 3,
+    "OMR": 3,
+    "PYG": 0,
+    "RWF": 0,
+    "TND": 3,
+    "UGX": 0,
+    "UYI": 0,
+    "UYW": 4,
+    "VND": 0,
+    "VUV": 0,
+    "XAF": 0,
+    "XOF": 0,
+    "XPF": 0,
+}
+DEFAULT_MINOR_UNITS = 2
+
+# Builder formulas combine each aggregated line a handful of times, so the sum of
+# all absolute amounts must leave this much headroom below the int64 limit.
+_HEADROOM = 16
+_LIMIT = float(2**63) / _HEADROOM
+_MAX_POWER = 18
+
+
+class FixedPointOverflowError(ArithmeticError):
+    """Raised when amounts cannot be held exactly as int64 minor units."""
+
+
+def minor_units(unit: str) -> int:
+    """Return the number of minor-unit digits used for ``unit``."""
+    return CURRENCY_MINOR_UNITS.get(unit.upper(), DEFAULT_MINOR_UNITS)
+
+
+@dataclass(frozen=True, slots=True)
+class FixedPointValues:
+    """Per-period amounts as int64 minor units at a shared decimal scale.
+
+    ``exponents`` keeps the exponent each value would carry had it been summed with
+    ``Decimal``, so converted values match the Decimal path digit for digit.
+    """
+
+    units: np.ndarray
+    exponents: np.ndarray
+    scale: int
+
+    @classmethod
+    def zeros(cls, periods: int, scale: int) -> FixedPointValues:
+        """Return all-zero values for ``periods`` periods."""
+        return cls(
+            units=np.zeros(periods, dtype=np.int64),
+            exponents=np.zeros(periods, dtype=np.int16),
+            scale=scale,
+        )
+
+    def period_change(self) -> FixedPointValues:
+        """Return the change from the previous period, with zero for the first."""
+        units = np.zeros_like(self.units)
+        exponents = np.zeros_like(self.exponents)
+        if len(units) > 1:
+            units[1:] = _checked_subtract(self.units[1:], self.units[:-1])
+            exponents[1:] = np.minimum(self.exponents[1:], self.exponents[:-1])
+        return FixedPointValues(units=units, exponents=exponents, scale=self.scale)
+
+    def to_decimals(self, period_labels: Sequence[str]) -> dict[str, Decimal]:
+        """Convert to ``Decimal`` values keyed by period label."""
+        return dict(zip(period_labels, self.decimal_amounts(), strict=True))
+
+    def decimal_amounts(self) -> list[Decimal]:
+        """Convert to the ``Decimal`` amounts stored on statement lines, in period order."""
+        amounts: list[Decimal] = []
+        for units, exponent in zip(self.units.tolist(), self.exponents.tolist(), strict=True):
+            shift = self.scale + exponent
+            coefficient = units // 10**shift if shift >= 0 else units * 10**-shift
+            amounts.append(Decimal(coefficient).scaleb(exponent))
+        return amounts
+
+
+def signed_sum(
+    plus: Sequence[FixedPointValues],
+    minus: Sequence[FixedPointValues] = (),
+) -> FixedPointValues:
+    """Return ``sum(plus) - sum(minus)``, raising on int64 overflow."""
+    first, *rest = plus
+    units = first.units
+    exponents = first.exponents
+    for values in rest:
+        units = _checked_add(units, values.units)
+        exponents = np.minimum(exponents, values.exponents)
+    for values in minus:
+        units = _checked_subtract(units, values.units)
+        exponents = np.minimum(exponents, values.exponents)
+    return FixedPointValues(units=units, exponents=exponents, scale=first.scale)
+
+
+class FixedPointLedger(Sequence[MappedFinancialRecord]):
+    """Mapped records with per-account period totals held as fixed-point amounts.
+
+    The ledger stands in for the record sequence while a model is built. Account
+    totals include every descendant account in the hierarchy. Lines it produces
+    are remembered, so subtotals over them stay in integer arithmetic.
+    """
+
+    def __init__(
+        self,
+        records: Sequence[MappedFinancialRecord],
+        period_labels: Sequence[str],
+        totals: dict[str, FixedPointValues],
+        source_account_ids: dict[str, list[str]],
+        scale: int,
+    ) -> None:
+        """Initialize the ledger from pre-aggregated account totals."""
+        self.records = records
+        self.period_labels = period_index(period_labels)
+        self.totals = totals
+        self.source_account_ids = source_account_ids
+        self.scale = scale
+        self._line_amounts: dict[int, tuple[StatementLine, FixedPointValues]] = {}
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Sequence[MappedFinancialRecord],
+        period_labels: Sequence[str],
+        hierarchy: AccountHierarchy | None = None,
+    ) -> FixedPointLedger:
+        """Aggregate mapped records, raising ``FixedPointOverflowError`` if inexact.
+
+        Totals roll up through ``hierarchy``, the standard ontology's by default.
+        """
+        if isinstance(records, MappedRecordBatch):
+            columns = _batch_columns(records, period_labels)
+        else:
+            columns = _record_columns(
+                ((record.account_id, record.source_record) for record in records), period_labels
+            )
+        return cls._aggregate(
+            records, period_labels, columns, hierarchy or compiled_ontology().hierarchy
+        )
+
+    def __len__(self) -> int:
+        """Return the number of underlying records."""
+        return len(self.records)
+
+    @overload
+    def __getitem__(self, index: int) -> MappedFinancialRecord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[MappedFinancialRecord]: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> MappedFinancialRecord | Sequence[MappedFinancialRecord]:
+        """Return underlying records."""
+        return self.records[index]
+
+    def __iter__(self) -> Iterator[MappedFinancialRecord]:
+        """Iterate over underlying records."""
+        return iter(self.records)
+
+    def line(self, label: str, account_id: str) -> StatementLine:
+        """Return the statement line for one account."""
+        values = self.totals.get(account_id)
+        if values is None:
+            values = FixedPointValues.zeros(len(self.period_labels), self.scale)
+        return self.statement_line(
+            values,
+            label=label,
+            account_id=account_id,
+            source_account_ids=self.source_account_ids.get(account_id, []),
+        )
+
+    def statement_line(self, values: FixedPointValues, **fields: Any) -> StatementLine:
+        """Build a statement line from fixed-point values and remember its amounts."""
+        line = construct(
+            StatementLine,
+            **fields,
+            values=PeriodValues.from_amounts(self.period_labels, values.decimal_amounts()),
+        )
+        self._line_amounts[id(line)] = (line, values)
+        return line
+
+    def amounts(self, line: StatementLine) -> FixedPointValues | None:
+        """Return the fixed-point values behind ``line``, if the ledger built it."""
+        entry = self._line_amounts.get(id(line))
+        if entry is None or entry[0] is not line:
+            return None
+        return entry[1]
+
+    @classmethod
+    def _aggregate(
+        cls,
+        records: Sequence[MappedFinancialRecord],
+        period_labels: Sequence[str],
+        columns: _LedgerColumns,
+        hierarchy: AccountHierarchy,
+    ) -> FixedPointLedger:
+        scale = int(columns.unit_scales.max()) if len(columns.unit_scales) else DEFAULT_MINOR_UNITS
+        units = _scaled_units(columns, scale)
+
+        # Rows follow the hierarchy so each subtree is a contiguous range. The
+        # headroom check bounds every subtree sum, so the rollup cannot overflow.
+        layout = hierarchy.layout(columns.account_ids)
+        rows = {account_id: row for row, account_id in enumerate(layout)}
+        account_rows = np.array(
+            [rows[account_id] for account_id in columns.account_ids], dtype=np.int64
+        )
+        periods = len(period_labels)
+        cells = account_rows[columns.account_codes] * periods + columns.positions
+        unit_matrix = np.zeros((len(layout), periods), dtype=np.int64)
+        exponent_matrix = np.zeros((len(layout), periods), dtype=np.int16)
+        np.add.at(unit_matrix.reshape(-1), cells, units)
+        np.minimum.at(exponent_matrix.reshape(-1), cells, columns.exponents.astype(np.int16))
+        unit_matrix = hierarchy.rollup(unit_matrix)
+        exponent_matrix = hierarchy.rollup(exponent_matrix, np.minimum)
+
+        pairs = np.unique(np.stack([columns.account_codes, columns.source_account_codes]), axis=1)
+        row_sources: list[set[str]] = [set() for _ in layout]
+        for account_code, source_code in pairs.T.tolist():
+            row_sources[int(account_rows[account_code])].add(
+                columns.source_account_values[source_code]
+            )
+        return cls(
+            records,
+            period_labels,
+            totals={
+                account_id: FixedPointValues(
+                    units=unit_matrix[row],
+                    exponents=exponent_matrix[row],
+                    scale=scale,
+                )
+                for row, account_id in enumerate(layout)
+            },
+            source_account_ids={
+                account_id: sorted(ids)
+                for account_id, ids in zip(layout, hierarchy.rollup_sets(row_sources), strict=True)
+                if ids
+            },
+            scale=scale,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class _LedgerColumns:
+    """Rows that land on a statement line, as parallel arrays."""
+
+    account_ids: list[str]
+    account_codes: np.ndarray
+    positions: np.ndarray
+    coefficients: np.ndarray
+    exponents: np.ndarray
+    unit_scales: np.ndarray
+    source_account_codes: np.ndarray
+    source_account_values: Sequence[str]
+
+
+def _record_columns(
+    rows: Iterable[tuple[str | None, SourceRecord]],
+    period_labels: Sequence[str],
+) -> _LedgerColumns:
+    positions = {label: position for position, label in enumerate(period_labels)}
+    account_lookup: dict[str, int] = {}
+    source_lookup: dict[str, int] = {}
+    scales: dict[str, int] = {}
+    account_codes: list[int] = []
+    row_positions: list[int] = []
+    coefficients: list[int] = []
+    exponents: list[int] = []
+    unit_scales: list[int] = []
+    source_account_codes: list[int] = []
+    for account_id, source in rows:
+        if account_id is None:
+            continue
+        position = positions.get(source.period_label)
+        if position is None:
+            continue
+        parts = split_decimal(source.amount)
+        if parts is None:
+            raise FixedPointOverflowError(f"Amount {source.amount} does not fit int64.")
+        scale = scales.get(source.unit)
+        if scale is None:
+            scale = scales[source.unit] = minor_units(source.unit)
+        account_codes.append(account_lookup.setdefault(account_id, len(account_lookup)))
+        row_positions.append(position)
+        coefficients.append(parts[0])
+        exponents.append(parts[1])
+        unit_scales.append(scale)
+        source_account_codes.append(
+            source_lookup.setdefault(source.source_account_id, len(source_lookup))
+        )
+    return _LedgerColumns(
+        account_ids=list(account_lookup),
+        account_codes=np.array(account_codes, dtype=np.int32),
+        positions=np.array(row_positions, dtype=np.int64),
+        coefficients=np.array(coefficients, dtype=np.int64),
+        exponents=np.array(exponents, dtype=np.int16),
+        unit_scales=np.array(unit_scales, dtype=np.int16),
+        source_account_codes=np.array(source_account_codes, dtype=np.int32),
+        source_account_values=list(source_lookup),
+    )
+
+
+def _batch_columns(batch: MappedRecordBatch, period_labels: Sequence[str]) -> _LedgerColumns:
+    source = batch.source
+    if not isinstance(source, SourceRecordBatch):
+        return _record_columns(zip(batch.account_ids(), source, strict=True), period_labels)
+    positions = {label: position for position, label in enumerate(period_labels)}
+    period_positions = np.array(
+        [positions.get(label, -1) for label in source.periods.values], dtype=np.int64
+    )
+    unit_scales = np.array([minor_units(unit) for unit in source.units.values], dtype=np.int16)
+
+    # Accounts are keyed by (id, name); ids alone index the ledger lines.
+    account_lookup: dict[str, int] = {}
+    batch_accounts = np.array(
+        [
+            account_lookup.setdefault(account_id, len(account_lookup))
+            for account_id, _ in batch.accounts
+        ],
+        dtype=np.int32,
+    )
+    has_account = batch.account_codes >= 0
+    account_codes = np.where(has_account, batch_accounts[batch.account_codes], -1)
+    row_positions = period_positions[source.periods.codes]
+    keep = has_account & (row_positions >= 0)
+    if source.amount_overflow and keep[list(source.amount_overflow)].any():
+        raise FixedPointOverflowError("Batch amounts include values that do not fit int64.")
+    return _LedgerColumns(
+        account_ids=list(account_lookup),
+        account_codes=account_codes[keep].astype(np.int32),
+        positions=row_positions[keep],
+        coefficients=source.amount_coefficients[keep],
+        exponents=source.amount_exponents[keep],
+        unit_scales=unit_scales[source.units.codes[keep]],
+        source_account_codes=source.account_ids.codes[keep],
+        source_account_values=source.account_ids.values,
+    )
+
+
+def _scaled_units(columns: _LedgerColumns, scale: int) -> np.ndarray:
+    exponents = columns.exponents.astype(np.int64)
+    coefficients = columns.coefficients
+    unit_shift = exponents + columns.unit_scales
+    if (unit_shift < -_MAX_POWER).any():
+        raise FixedPointOverflowError("Amounts are finer than their unit's minor units.")
+    finer = unit_shift < 0
+    if (
+        finer.any()
+        and (coefficients[finer] % np.power(10, -unit_shift[finer], dtype=np.int64)).any()
+    ):
+        raise FixedPointOverflowError("Amounts are finer than their unit's minor units.")
+
+    shift = exponents + scale
+    if (shift > _MAX_POWER).any():
+        raise FixedPointOverflowError("Amounts exceed the int64 minor-unit range.")
+    up = np.power(10, np.maximum(shift, 0), dtype=np.int64)
+    down = np.power(10, np.maximum(-shift, 0), dtype=np.int64)
+    magnitude = np.abs(coefficients.astype(np.float64)) * up / down
+    if magnitude.sum() >= _LIMIT:
+        raise FixedPointOverflowError("Amounts exceed the int64 minor-unit range.")
+    units: np.ndarray = coefficients * up // down
+    return units
+
+
+def _checked_add(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    result: np.ndarray = left + right
+    if (((left ^ result) & (right ^ result)) < 0).any():
+        raise FixedPointOverflowError("Fixed-point addition overflowed int64.")
+    return result
+
+
+def _checked_subtract(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    result: np.ndarray = left - right
+    if (((left ^ right) & (left ^ result)) < 0).any():
+        raise FixedPointOverflowError("Fixed-point subtraction overflowed int64.")
+    return result
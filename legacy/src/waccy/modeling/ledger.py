@@ -0,0 +1,130 @@
+"""Decimal account totals rolled up through the account hierarchy."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from decimal import Decimal
+from typing import overload
+
+import numpy as np
+
+from waccy.core.batch import AccountPeriodTotals, MappedRecordBatch
+from waccy.core.models import MappedFinancialRecord, StatementLine
+from waccy.core.ontology import AccountHierarchy, compiled_ontology
+from waccy.core.statement_values import PeriodValues, period_index
+from waccy.core.trusted import construct
+
+ZERO = Decimal("0")
+
+
+class DecimalLedger(Sequence[MappedFinancialRecord]):
+    """Mapped records with per-account period totals held as ``Decimal`` amounts.
+
+    The ``Decimal`` counterpart of ``FixedPointLedger``: records are totalled once
+    per account, and each account's line includes every descendant account.
+    """
+
+    def __init__(
+        self,
+        records: Sequence[MappedFinancialRecord],
+        period_labels: Sequence[str],
+        totals: dict[str, np.ndarray],
+        source_account_ids: dict[str, list[str]],
+    ) -> None:
+        """Initialize the ledger from rolled-up account totals in period order."""
+        self.records = records
+        self.period_labels = period_index(period_labels)
+        self.totals = totals
+        self.source_account_ids = source_account_ids
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Sequence[MappedFinancialRecord],
+        period_labels: Sequence[str],
+        hierarchy: AccountHierarchy | None = None,
+    ) -> DecimalLedger:
+        """Total mapped records and roll them up through ``hierarchy``.
+
+        The standard ontology's hierarchy is used by default.
+        """
+        hierarchy = hierarchy or compiled_ontology().hierarchy
+        if isinstance(records, MappedRecordBatch):
+            account_totals = records.account_period_totals(period_labels)
+        else:
+            account_totals = _account_period_totals(records, period_labels)
+
+        # Rows start at zero so sums carry the exponents the per-line totals had.
+        layout = hierarchy.layout(account_totals)
+        amounts = np.full((len(layout), len(period_labels)), ZERO, dtype=object)
+        row_sources: list[set[str]] = []
+        for row, account_id in enumerate(layout):
+            entry = account_totals.get(account_id)
+            if entry is None:
+                row_sources.append(set())
+                continue
+            amounts[row] = [entry.values[label] for label in period_labels]
+            row_sources.append(entry.source_account_ids)
+        amounts = hierarchy.rollup(amounts)
+        return cls(
+            records,
+            period_labels,
+            totals={account_id: amounts[row] for row, account_id in enumerate(layout)},
+            source_account_ids={
+                account_id: sorted(ids)
+                for account_id, ids in zip(layout, hierarchy.rollup_sets(row_sources), strict=True)
+                if ids
+            },
+        )
+
+    def __len__(self) -> int:
+        """Return the number of underlying records."""
+        return len(self.records)
+
+    @overload
+    def __getitem__(self, index: int) -> MappedFinancialRecord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[MappedFinancialRecord]: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> MappedFinancialRecord | Sequence[MappedFinancialRecord]:
+        """Return underlying records."""
+        return self.records[index]
+
+    def __iter__(self) -> Iterator[MappedFinancialRecord]:
+        """Iterate over underlying records."""
+        return iter(self.records)
+
+    def line(self, label: str, account_id: str) -> StatementLine:
+        """Return the statement line for one account."""
+        amounts = self.totals.get(account_id)
+        if amounts is None:
+            amounts = np.full(len(self.period_labels), ZERO, dtype=object)
+        return construct(
+            StatementLine,
+            label=label,
+            account_id=account_id,
+            values=PeriodValues.from_amounts(self.period_labels, amounts.copy()),
+            source_account_ids=self.source_account_ids.get(account_id, []),
+        )
+
+
+def _account_period_totals(
+    records: Sequence[MappedFinancialRecord],
+    period_labels: Sequence[str],
+) -> dict[str, AccountPeriodTotals]:
+    wanted = set(period_labels)
+    totals: dict[str, AccountPeriodTotals] = {}
+    for record in records:
+        source = record.source_record
+        if record.account_id is None or source.period_label not in wanted:
+            continue
+        entry = totals.get(record.account_id)
+        if entry is None:
+            entry = AccountPeriodTotals(values=dict.fromkeys(period_labels, ZERO))
+            totals[record.account_id] = entry
+        entry.values[source.period_label] += source.amount
+        entry.source_account_ids.add(source.source_account_id)
+    return totals
@@ -7,6 +7,7 @@ from decimal import Decimal
 from typing import Any
 
 from waccy.core.models import ExtractedData, ExtractedTransaction, PeriodType, ReportingPeriod
+from waccy.extraction.mapper import source_record_batch_from_dicts, source_record_from_dict
 
 
 def sample_transaction() -> ExtractedTransaction:
@@ -120,6 +121,37 @@ def sample_edgar_fixture() -> dict[str, Any]:
     }
 
 
+def sample_mixed_records(*extra: dict[str, Any]) -> list[dict[str, Any]]:
+    """Create QBO and EDGAR fixture records plus unmapped, oversized, and ``extra`` rows.
+
+    The last record is the sub-cent, unmapped ``Manual`` row.
+    """
+    return [
+        *sample_qbo_fixture()["records"],
+        *sample_edgar_fixture()["records"],
+        {"name": "Mystery Account", "period": "2024", "amount": "12.50"},
+        {"name": "Sales", "period": "2023", "amount": "9" * 25, "statement": "income_statement"},
+        *extra,
+        {"name": "Manual", "period": "2024", "amount": "-0.125", "metadata": {"row": 1}},
+    ]
+
+
+def sample_records_extracted(
+    records: list[dict[str, Any]], *, columnar: bool = False
+) -> ExtractedData:
+    """Create QBO extracted data over ``records``, as a ``SourceRecordBatch`` if ``columnar``."""
+    return ExtractedData(
+        entity_name="Fixture Co",
+        periods=sample_periods(),
+        source_records=(
+            source_record_batch_from_dicts(records, "qbo")
+            if columnar
+            else [source_record_from_dict(record, "qbo") for record in records]
+        ),
+        metadata={"source": "qbo"},
+    )
+
+
 def _records(names: dict[str, str]) -> list[dict[str, Any]]:
     records: list[dict[str, Any]] = []
     records.extend(
@@ -0,0 +1,100 @@
+"""Arrow interchange tests."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+
+from tests.fixtures.sample_data import sample_mixed_records, sample_records_extracted
+from waccy.core.batch import MappedRecordBatch, SourceRecordBatch
+from waccy.core.models import (
+    ExtractedData,
+    MappedFinancialDataset,
+    MappingOverride,
+    NormalizedFinancialDataset,
+    ThreeStatementModel,
+)
+from waccy.extraction.mapper import DataMapper
+from waccy.modeling.builder import ModelBuilder
+
+pa = pytest.importorskip("pyarrow")
+
+
+def _extracted(columnar: bool) -> ExtractedData:
+    records = sample_mixed_records(
+        {"name": "Rent", "period": "2024", "amount": "7E+2", "statement": "income_statement"}
+    )
+    return sample_records_extracted(records, columnar=columnar)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_datasets_round_trip_through_arrow(columnar: bool) -> None:
+    """Datasets come back from Arrow as batches that serialize to the same JSON."""
+    mapper = DataMapper()
+    normalized = mapper.normalize(_extracted(columnar))
+    mapped = mapper.map_dataset(
+        normalized, overrides={"Manual": MappingOverride(account_id="cash", note="Bank")}
+    )
+
+    normalized_table = normalized.to_arrow()
+    assert pa.types.is_decimal128(normalized_table.schema.field("amount").type)
+    assert pa.types.is_dictionary(normalized_table.schema.field("source_account_name").type)
+    restored_normalized = NormalizedFinancialDataset.from_arrow(normalized_table)
+    assert isinstance(restored_normalized.records, SourceRecordBatch)
+    assert restored_normalized.model_dump_json() == normalized.model_dump_json()
+
+    restored_mapped = MappedFinancialDataset.from_arrow(mapped.to_arrow())
+    assert isinstance(restored_mapped.records, MappedRecordBatch)
+    assert restored_mapped.model_dump_json() == mapped.model_dump_json()
+    assert restored_mapped.records.to_records() == list(mapped.records)
+
+
+def test_model_round_trips_through_long_arrow_table() -> None:
+    """Models export one row per line and period and read back identically."""
+    model = ModelBuilder().build_three_statement_model(_extracted(False))
+
+    table = model.to_arrow()
+    lines = sum(
+        len(statement.lines) * len(statement.periods)
+        for statement in (model.income_statement, model.balance_sheet, model.cash_flow_statement)
+    )
+    assert table.num_rows == lines
+    revenue = table.filter(pa.compute.equal(table.column("label"), "Revenue")).to_pylist()
+    assert [(row["period_label"], row["amount"]) for row in revenue] == [
+        ("2023", model.income_statement.lines[0].values["2023"]),
+        ("2024", model.income_statement.lines[0].values["2024"]),
+    ]
+
+    restored = ThreeStatementModel.from_arrow(table)
+    assert restored.model_dump_json() == model.model_dump_json()
+    with pytest.raises(ValueError, match="not 'normalized'"):
+        NormalizedFinancialDataset.from_arrow(table)
+
+    without_periods = model.model_copy(
+        update={
+            "balance_sheet": model.balance_sheet.model_copy(
+                update={
+                    "periods": [],
+                    "lines": [
+                        line.model_copy(update={"values": {}}) for line in model.balance_sheet.lines
+                    ],
+                }
+            )
+        }
+    )
+    table = without_periods.to_arrow()
+    assert table.num_rows == lines - len(model.balance_sheet.lines) * (len(model.periods) - 1)
+    restored = ThreeStatementModel.from_arrow(table)
+    assert restored.model_dump_json() == without_periods.model_dump_json()
+
+
+def test_arrow_tables_hand_over_to_polars_and_pandas() -> None:
+    """Dictionary strings and decimal amounts load directly into dataframes."""
+    pl = pytest.importorskip("polars")
+    table = DataMapper().normalize(_extracted(True)).to_arrow()
+
+    frame = pl.from_arrow(table)
+    assert frame.schema["source_account_name"] == pl.Categorical
+    assert frame["amount"].dtype == pl.Decimal(38, 3)
+    assert table.to_pandas()["amount"].max() == Decimal("9" * 25)
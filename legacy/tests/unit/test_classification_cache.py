@@ -0,0 +1,101 @@
+"""Classification result cache tests."""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import TYPE_CHECKING
+
+import pytest
+
+from waccy.classification import ClassificationCache, ClassificationEngine, PatternStore
+from waccy.core.models import MappingStatus
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_cache_reuses_results_until_the_pattern_store_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Names that normalize alike hit the cache; learning a filing invalidates it."""
+    store_path = tmp_path / "patterns.sqlite3"
+    cache_path = tmp_path / "results.sqlite3"
+    engine = ClassificationEngine(
+        pattern_store=PatternStore(store_path), cache=ClassificationCache(cache_path)
+    )
+    context = {"source_system": "qbo"}
+    uncached = ClassificationEngine().classify_with_diagnostics("Undeposited Funds", [], context)
+    first = engine.classify_with_diagnostics("Undeposited Funds", [], context)
+    assert first == uncached
+    batch = engine.classify_many(
+        [
+            ("undeposited funds", [], context),
+            ("Mystery Account", [], context),
+            ("Checking", [{"account_id": "cash"}], context),
+        ]
+    )
+    assert batch[0] == first
+    assert batch[0] is not first
+    first.diagnostics.append("edited")
+    first.status = MappingStatus.UNMAPPED
+    again = engine.classify_with_diagnostics("Undeposited Funds", [], context)
+    assert again == uncached
+    assert batch[1].status == MappingStatus.UNMAPPED
+    assert len(engine.cache) == 1  # type: ignore[arg-type]
+
+    # A new process reads the disk tier without classifying again.
+    restarted = ClassificationEngine(
+        pattern_store=PatternStore(store_path), cache=ClassificationCache(cache_path, maxsize=1)
+    )
+
+    def fail(rows: list) -> None:
+        raise AssertionError(f"cached rows {rows!r} were classified again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(restarted, "_classify", fail)
+        assert restarted.classify_with_diagnostics("UNDEPOSITED FUNDS", [], context) == uncached
+
+    restarted.learn_from_edgar({"records": [{"concept": "Undeposited Funds"}]})
+    learned = restarted.classify_with_diagnostics("Undeposited Funds", [], context)
+    assert learned.diagnostics == ["classified_by_edgar_pattern"]
+    pattern = learned.model_copy(deep=True).pattern
+    learned.pattern["statements"]["edited"] = 1  # type: ignore[index]
+    assert restarted.classify_with_diagnostics("Undeposited Funds", [], context).pattern == pattern
+    assert engine.classify_with_diagnostics("Undeposited Funds", [], context).pattern is not None
+    assert len(restarted.cache) == 1  # type: ignore[arg-type]
+
+    with pytest.raises(ValueError, match="maxsize"):
+        ClassificationCache(maxsize=0)
+
+
+def test_disk_cache_is_shared_by_in_memory_stores_and_keeps_one_version(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Default stores with the same counts hit each other's rows; stale rows are pruned."""
+    cache_path = tmp_path / "results.sqlite3"
+    context = {"source_system": "qbo"}
+    first = ClassificationEngine(cache=ClassificationCache(cache_path))
+    result = first.classify_with_diagnostics("Undeposited Funds", [], context)
+    assert PatternStore().version == first.pattern_matcher.store.version
+
+    def fail(rows: list) -> None:
+        raise AssertionError(f"cached rows {rows!r} were classified again")
+
+    filing = {"records": [{"concept": "Undeposited Funds"}]}
+    engines = [ClassificationEngine(cache=ClassificationCache(cache_path)) for _ in range(2)]
+    with monkeypatch.context() as patch:
+        patch.setattr(engines[0], "_classify", fail)
+        assert engines[0].classify_with_diagnostics("Undeposited Funds", [], context) == result
+        engines[0].learn_from_edgar(filing)
+        patch.undo()
+        learned = engines[0].classify_with_diagnostics("Undeposited Funds", [], context)
+
+        engines[1].learn_from_edgar(filing)
+        patch.setattr(engines[1], "_classify", fail)
+        assert engines[1].classify_with_diagnostics("Undeposited Funds", [], context) == learned
+
+    with sqlite3.connect(cache_path) as connection:
+        versions = connection.execute("SELECT DISTINCT version FROM classification_results")
+        assert [version.split(":")[1] for (version,) in versions] == [
+            engines[1].pattern_matcher.store.version
+        ]
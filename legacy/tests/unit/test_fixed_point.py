@@ -0,0 +1,102 @@
+"""Fixed-point amount engine tests."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+from tests.fixtures.sample_data import (
+    sample_edgar_fixture,
+    sample_periods,
+    sample_qbo_fixture,
+    sample_records_extracted,
+)
+from waccy.extraction.mapper import DataMapper
+from waccy.modeling.builder import ModelBuilder
+from waccy.modeling.fixed_point import (
+    FixedPointLedger,
+    FixedPointOverflowError,
+    FixedPointValues,
+    minor_units,
+)
+
+if TYPE_CHECKING:
+    from waccy.core.models import ExtractedData, ThreeStatementModel
+
+
+def _models(extracted: ExtractedData) -> tuple[ThreeStatementModel, ThreeStatementModel]:
+    return (
+        ModelBuilder().build_three_statement_model(extracted),
+        ModelBuilder(amount_engine="fixed_point").build_three_statement_model(extracted),
+    )
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_fixed_point_engine_matches_decimal_engine(columnar: bool) -> None:
+    """Fixed-point statements match the Decimal path, including value exponents."""
+    records = [
+        *sample_qbo_fixture()["records"],
+        *sample_edgar_fixture()["records"],
+        {"name": "Sales", "period": "2024", "amount": "0.10", "statement": "income_statement"},
+        {"name": "Sales", "period": "2023", "amount": "1.500", "statement": "income_statement"},
+        {"name": "Rent", "period": "2024", "amount": "7E+2", "statement": "income_statement"},
+        {"name": "Checking", "period": "2024", "amount": "-12.3", "statement": "balance_sheet"},
+        {"name": "Checking", "period": "2023", "amount": "450", "unit": "JPY"},
+    ]
+    decimal_model, fixed_model = _models(sample_records_extracted(records, columnar=columnar))
+
+    assert fixed_model.model_dump_json() == decimal_model.model_dump_json()
+    assert fixed_model == decimal_model
+
+
+def test_fixed_point_engine_falls_back_when_amounts_do_not_fit() -> None:
+    """Sub-minor-unit and out-of-range amounts are built with Decimal instead."""
+    for amount in ("0.125", "9" * 19, "1E+30"):
+        records = [
+            *sample_qbo_fixture()["records"],
+            {"name": "Sales", "period": "2024", "amount": amount, "statement": "income_statement"},
+        ]
+        extracted = sample_records_extracted(records)
+        with pytest.raises(FixedPointOverflowError):
+            FixedPointLedger.from_records(
+                DataMapper().map_to_standard(extracted).mapped_dataset.records,
+                [period.label for period in sample_periods()],
+            )
+        decimal_model, fixed_model = _models(extracted)
+        assert fixed_model.model_dump_json() == decimal_model.model_dump_json()
+
+
+def test_fixed_point_values_convert_and_detect_overflow() -> None:
+    """Values convert at their scale and integer overflow is raised, not wrapped."""
+    values = FixedPointValues(
+        units=np.array([1050, -5, 0], dtype=np.int64),
+        exponents=np.array([-1, -2, 0], dtype=np.int16),
+        scale=2,
+    )
+
+    assert values.to_decimals(["a", "b", "c"]) == {
+        "a": Decimal("10.5"),
+        "b": Decimal("-0.05"),
+        "c": Decimal("0"),
+    }
+    assert str(values.period_change().to_decimals(["a", "b", "c"])["b"]) == "-10.55"
+    assert minor_units("jpy") == 0
+    assert minor_units("KWD") == 3
+    assert minor_units("shares") == 2
+
+    huge = FixedPointValues(
+        units=np.array([-(2**62), 2**62], dtype=np.int64),
+        exponents=np.zeros(2, dtype=np.int16),
+        scale=2,
+    )
+    with pytest.raises(FixedPointOverflowError):
+        huge.period_change()
+
+
+def test_model_builder_rejects_unknown_amount_engine() -> None:
+    """Amount engines are validated when the builder is created."""
+    with pytest.raises(ValueError, match="amount engine"):
+        ModelBuilder(amount_engine="float")  # type: ignore[arg-type]
@@ -0,0 +1,79 @@
+"""Trigram fuzzy alias index tests."""
+
+from __future__ import annotations
+
+from tests.fixtures.sample_data import sample_periods
+from waccy.classification.patterns import PatternMatcher
+from waccy.core.fuzzy import TrigramIndex, trigrams
+from waccy.core.models import ExtractedData, IssueSeverity, MappingStatus
+from waccy.core.ontology import StandardChartOfAccounts
+from waccy.extraction.mapper import DataMapper, source_record_from_dict
+
+
+def test_trigram_index_ranks_accounts_by_closest_alias() -> None:
+    """Each account appears once, scored by its best alias, best first."""
+    index = TrigramIndex(
+        [
+            ("Rent Expense", "rent"),
+            ("rent-expense", "rent"),
+            ("Rent or Lease", "rent"),
+            ("Interest Expense", "interest_expense"),
+            ("Payroll", "payroll"),
+        ]
+    )
+
+    assert len(index) == 4
+    assert trigrams("Rent") == {"  r", " re", "ren", "ent", "nt "}
+    matches = index.search("Rent Expenses", limit=5)
+    assert [match.account_id for match in matches] == ["rent", "interest_expense"]
+    assert matches[0].alias == "rent expense"
+    assert 0.3 <= matches[1].score < matches[0].score < 1.0
+    assert [match.account_id for match in index.search("Rent Expenses", limit=1)] == ["rent"]
+    assert index.search("Rent Expenses", min_score=0.95) == []
+    assert index.search("zzz") == []
+
+
+def test_mapper_fuzzy_tier_marks_near_misses_ambiguous() -> None:
+    """Near-miss names get suggestions; exact aliases and unrelated names are unchanged."""
+    records = [
+        {"name": "Rent & Lease Expense", "period": "2024", "amount": "10"},
+        {"name": "Checking", "period": "2024", "amount": "5"},
+        {"name": "Qqq Xyz", "period": "2024", "amount": "1"},
+        {"name": "Contractor Fees", "period": "2024", "amount": "3"},
+    ]
+    extracted = ExtractedData(
+        entity_name="Fixture Co",
+        periods=sample_periods(),
+        source_records=[source_record_from_dict(record, "qbo") for record in records],
+    )
+
+    plain = DataMapper().map_to_standard(extracted).mapped_dataset.records
+    assert plain[0].status == MappingStatus.UNMAPPED
+
+    ontology = StandardChartOfAccounts()
+    validated = DataMapper(ontology, ontology.fuzzy_index()).map_to_standard(extracted)
+    rent, checking, unrelated, contractor = validated.mapped_dataset.records
+    assert rent.status == MappingStatus.AMBIGUOUS
+    assert rent.account_id is None
+    assert 0 < rent.confidence < 0.4
+    assert rent.diagnostics[0].code == "fuzzy_candidates"
+    assert "rent (" in rent.diagnostics[0].message
+    assert checking.status == MappingStatus.MAPPED
+    assert unrelated.status == MappingStatus.UNMAPPED
+    assert contractor.status == MappingStatus.UNMAPPED
+    assert any(
+        issue.code == "ambiguous_mapping" and issue.severity == IssueSeverity.WARNING
+        for issue in validated.issues
+    )
+
+    matcher = PatternMatcher(ontology)
+    matcher.patterns = {
+        "aliases": {
+            "contractorfees": {"source": "Contractor Fees", "account_id": "operating_expenses"}
+        }
+    }
+    learned = DataMapper(ontology, matcher.fuzzy_index()).map_dataset(
+        DataMapper().normalize(extracted)
+    )
+    assert learned.records[3].status == MappingStatus.AMBIGUOUS
+    assert "operating_expenses" in learned.records[3].diagnostics[0].message
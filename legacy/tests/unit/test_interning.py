@@ -0,0 +1,74 @@
+"""Identifier string pool tests."""
+
+from __future__ import annotations
+
+import json
+
+from tests.fixtures.sample_data import sample_edgar_fixture
+from waccy.core.interning import (
+    StringPool,
+    active_string_pool,
+    dataset_string_pool,
+    intern_identifier,
+    string_pool,
+)
+from waccy.extraction.mapper import source_record_from_dict
+
+
+def _parsed_record() -> dict[str, str]:
+    record: dict[str, str] = json.loads(json.dumps(sample_edgar_fixture()["records"][0]))
+    return record
+
+
+def test_records_from_separate_payloads_share_identifiers() -> None:
+    """Identifiers parsed from different payloads resolve to one pooled object."""
+    pool = StringPool()
+    with string_pool(pool):
+        first = source_record_from_dict(_parsed_record(), "edgar")
+        second = source_record_from_dict(_parsed_record(), "edgar")
+
+    assert first.source_account_id is second.source_account_id
+    assert first.source_account_name is second.source_account_name
+    assert first.period_label is second.period_label
+    assert first.statement is second.statement
+    assert first.source.source_system is second.source.source_system
+    assert first.source_account_id in pool
+    assert pool.nbytes() > 0
+
+
+def test_string_pool_can_be_disabled_and_cleared() -> None:
+    """``string_pool(None)`` keeps parsed strings and ``clear`` releases the pool."""
+    with string_pool(None):
+        first = source_record_from_dict(_parsed_record(), "edgar")
+        second = source_record_from_dict(_parsed_record(), "edgar")
+    assert first.source_account_id == second.source_account_id
+    assert first.source_account_id is not second.source_account_id
+
+    pool = StringPool()
+    with string_pool(pool):
+        assert intern_identifier(None) is None
+        label = intern_identifier("".join(["FY", "2024"]))
+        assert intern_identifier("".join(["FY", "2024"])) is label
+    assert len(pool) == 1
+    pool.clear()
+    assert "FY2024" not in pool
+
+
+def test_dataset_pools_live_with_the_block_that_opened_them() -> None:
+    """Outside any pool nothing is interned; a dataset block pools into its own table."""
+    assert active_string_pool() is None
+    label = "".join(["FY", "2024"])
+    assert intern_identifier(label) is label
+
+    with dataset_string_pool() as pool:
+        first = source_record_from_dict(_parsed_record(), "edgar")
+        second = source_record_from_dict(_parsed_record(), "edgar")
+    assert first.period_label is second.period_label
+    assert pool is not None and first.period_label in pool
+    assert active_string_pool() is None
+
+    shared = StringPool()
+    with string_pool(shared), dataset_string_pool() as pool:
+        assert pool is shared
+    with string_pool(None), dataset_string_pool() as pool:
+        assert pool is None
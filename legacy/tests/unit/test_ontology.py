@@ -1,6 +1,29 @@
 """Unit tests for ontology module."""
 
-from waccy.core.ontology import AccountCategory, AccountType, StandardChartOfAccounts
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from tests.fixtures.sample_data import sample_periods, sample_qbo_fixture, sample_records_extracted
+from waccy.classification.engine import ClassificationEngine
+from waccy.core.models import ExtractedData
+from waccy.core.ontology import (
+    AccountCategory,
+    AccountHierarchy,
+    AccountType,
+    CompiledOntology,
+    ConceptTable,
+    StandardChartOfAccounts,
+    compiled_ontology,
+)
+from waccy.extraction.mapper import (
+    DataMapper,
+    source_record_batch_from_dicts,
+    source_record_from_dict,
+)
+from waccy.modeling.builder import ModelBuilder
 
 
 def test_account_type_enum() -> None:
@@ -53,3 +76,269 @@ def test_qbo_live_smoke_aliases_map_deterministically() -> None:
         assert account.id == account_id
 
     assert ontology.map_account("Net Change In Cash", "qbo") is None
+
+
+def test_charts_share_one_compiled_ontology() -> None:
+    """Every component reads the same read-only tables; alias additions stay local."""
+    compiled = compiled_ontology()
+    ontology = StandardChartOfAccounts()
+    assert ontology.compiled is compiled
+    assert DataMapper().ontology.compiled is compiled
+    assert ModelBuilder().ontology.compiled is compiled
+    engine = ClassificationEngine()
+    assert engine.pattern_matcher.ontology is engine.ontology
+    assert engine.confidence_scorer.ontology.compiled is compiled
+
+    with pytest.raises(TypeError):
+        compiled.alias_index["sales"] = ()  # type: ignore[index]
+    assert "sales" in ontology.alias_keys("revenue")
+    assert [account.id for account in ontology.statement_accounts("cash_flow_statement")] == [
+        "net_income",
+        "depreciation_addback",
+        "working_capital_movement",
+        "capex",
+        "financing_movement",
+    ]
+
+    ontology._aliases["sales"] = ["cogs"]
+    assert ontology.map_account("Sales", "qbo").id == "cogs"
+    assert StandardChartOfAccounts().map_account("Sales", "qbo").id == "revenue"
+
+
+def test_instance_edits_reach_list_accounts_and_version() -> None:
+    """Accounts and aliases changed on one chart show up in its listing and version."""
+    ontology = StandardChartOfAccounts()
+    mapper = DataMapper(ontology)
+    version = ontology.version
+    fingerprint = mapper.plan_fingerprint()
+    assert ontology.version == StandardChartOfAccounts().version
+
+    ontology.accounts["petty_cash"] = _account("petty_cash", sort_order=-1)
+    assert ontology.list_accounts()[0].id == "petty_cash"
+    assert ontology.get_account("petty_cash") is not None
+    added = ontology.version
+    assert added != version
+
+    ontology._aliases["petty"] = ["petty_cash"]
+    assert ontology.version != added
+    assert mapper.plan_fingerprint() != fingerprint
+
+    del ontology.accounts["petty_cash"], ontology._aliases["petty"]
+    assert ontology.version == version
+    assert ontology.list_accounts() == StandardChartOfAccounts().list_accounts()
+
+
+def _account(account_id: str, parent_id: str | None = None, sort_order: int = 0) -> AccountCategory:
+    return AccountCategory(
+        id=account_id,
+        name=account_id,
+        type=AccountType.EXPENSE,
+        parent_id=parent_id,
+        level=1 if parent_id is None else 2,
+        description=account_id,
+        sort_order=sort_order,
+    )
+
+
+def test_account_hierarchy_rolls_up_subtree_ranges() -> None:
+    """Subtrees are contiguous pre-order ranges that reduce at every level."""
+    accounts = [
+        _account("opex", sort_order=1),
+        _account("travel", "opex", sort_order=3),
+        _account("people", "opex", sort_order=2),
+        _account("payroll", "people", sort_order=1),
+        _account("tax", sort_order=2),
+    ]
+    hierarchy = CompiledOntology.from_accounts(accounts).hierarchy
+
+    assert hierarchy.account_ids == ("opex", "people", "payroll", "travel", "tax")
+    assert hierarchy.span("people") == (1, 3)
+    assert hierarchy.subtree("opex") == ("opex", "people", "payroll", "travel")
+    assert hierarchy.depths["payroll"] == 2
+    assert hierarchy.layout(["tax", "custom", "custom"]) == (*hierarchy.account_ids, "custom")
+
+    rows = np.array([[1, 0], [2, -1], [4, -3], [8, 0], [16, -2], [32, 0]])
+    assert hierarchy.rollup(rows)[:, 0].tolist() == [15, 6, 4, 8, 16, 32]
+    assert hierarchy.rollup(rows, np.minimum)[:, 1].tolist() == [-3, -3, -3, 0, -2, 0]
+    sources = hierarchy.rollup_sets([set(), {"a"}, {"b"}, set(), {"c"}])
+    assert sources == [{"a", "b"}, {"a", "b"}, {"b"}, set(), {"c"}]
+
+    with pytest.raises(ValueError, match="unknown parent"):
+        AccountHierarchy.from_accounts({"x": _account("x", "missing")})
+    with pytest.raises(ValueError, match="cycle"):
+        AccountHierarchy.from_accounts({"x": _account("x", "y"), "y": _account("y", "x")})
+    assert StandardChartOfAccounts().descendants("operating_expenses") == (
+        "payroll",
+        "rent",
+        "software",
+    )
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+@pytest.mark.parametrize("amount_engine", ["decimal", "fixed_point"])
+def test_statement_lines_include_sub_accounts(columnar: bool, amount_engine: str) -> None:
+    """Operating expenses roll up payroll, rent, and software records."""
+    records = [
+        {"name": "Operating Expenses", "period": "2024", "amount": "100.5"},
+        {"name": "Salaries", "period": "2024", "amount": "40"},
+        {"name": "Rent Expense", "period": "2024", "amount": "7E+2"},
+        {"name": "Software Subscriptions", "period": "2023", "amount": "12.25"},
+    ]
+    for record in records:
+        record["statement"] = "income_statement"
+    extracted = ExtractedData(
+        entity_name="Fixture Co",
+        periods=sample_periods(),
+        source_records=(
+            source_record_batch_from_dicts(records, "qbo")
+            if columnar
+            else [source_record_from_dict(record, "qbo") for record in records]
+        ),
+    )
+    model = ModelBuilder(amount_engine=amount_engine).build_three_statement_model(extracted)  # type: ignore[arg-type]
+
+    opex = next(
+        line for line in model.income_statement.lines if line.account_id == "operating_expenses"
+    )
+    assert str(opex.values["2024"]) == "840.5"
+    assert opex.values["2023"] == Decimal("12.25")
+    assert opex.source_account_ids == [
+        "Operating Expenses",
+        "Rent Expense",
+        "Salaries",
+        "Software Subscriptions",
+    ]
+
+
+def test_names_moved_to_sub_accounts_still_total_into_operating_expenses() -> None:
+    """Payroll and rent names map to sub-accounts and leave the built statements unchanged."""
+    moved = {"Payroll Expenses": "10", "Rent": "20", "Wages": "30.5", "Salaries": "40"}
+    records = [
+        {"name": name, "period": "2024", "amount": amount, "statement": "income_statement"}
+        for name, amount in moved.items()
+    ]
+    extracted = sample_records_extracted([*sample_qbo_fixture()["records"], *records])
+    direct = sample_records_extracted(
+        [
+            *sample_qbo_fixture()["records"],
+            {"name": "Operating Expenses", "period": "2024", "amount": "100.5"},
+        ]
+    )
+
+    mapped = DataMapper().map_to_standard(extracted).mapped_dataset.records
+    assert {
+        record.source_record.source_account_name: record.account_id
+        for record in mapped
+        if record.source_record.source_account_name in moved
+    } == {"Payroll Expenses": "payroll", "Rent": "rent", "Wages": "payroll", "Salaries": "payroll"}
+
+    builder = ModelBuilder()
+    model = builder.build_three_statement_model(extracted)
+    expected = builder.build_three_statement_model(direct)
+    for statement in ("income_statement", "balance_sheet", "cash_flow_statement"):
+        assert [
+            (line.label, line.account_id, dict(line.values))
+            for line in getattr(model, statement).lines
+        ] == [
+            (line.label, line.account_id, dict(line.values))
+            for line in getattr(expected, statement).lines
+        ]
+
+
+def test_map_candidates_many_resolves_each_distinct_key_once() -> None:
+    """Repeated rows share one lookup and statements narrow ambiguous aliases."""
+    ontology = StandardChartOfAccounts()
+    rows = [
+        ("edgar", "us-gaap:DepreciationDepletionAndAmortization", "income_statement"),
+        ("qbo", "Sales", None),
+        ("edgar", "us-gaap:DepreciationDepletionAndAmortization", "income_statement"),
+        ("edgar", "us-gaap:DepreciationDepletionAndAmortization", None),
+        ("qbo", "Sales", None),
+        ("qbo", "Unknown", None),
+    ]
+    matches = ontology.map_candidates_many(rows)
+
+    assert len(matches.keys) == 4
+    assert matches.codes.tolist() == [0, 1, 0, 2, 1, 3]
+    assert matches.counts().tolist() == [1, 1, 1, 2, 1, 0]
+    assert [account.id for account in matches[0]] == ["depreciation_amortization"]
+    assert [account.id for account in matches[3]] == [
+        "depreciation_amortization",
+        "depreciation_addback",
+    ]
+    for row, (source_system, name, statement) in enumerate(rows):
+        assert list(matches[row]) == ontology.map_candidates(name, source_system, statement)
+    assert len(ontology.map_candidates_many([])) == 0
+
+
+def test_compiled_ontology_precomputes_statement_resolutions() -> None:
+    """Colliding aliases resolve by statement from one table; unresolvable ones are listed."""
+    compiled = compiled_ontology()
+    assert sorted(compiled.statement_resolutions) == [
+        (key, statement)
+        for key in (
+            "usgaapdepreciationdepletionandamortization",
+            "usgaapdepreciationdepletionandamortizationexpense",
+        )
+        for statement in ("cash_flow_statement", "income_statement")
+    ]
+    assert dict(compiled.ambiguous_keys) == {}
+
+    def account(account_id: str, statement: str | None) -> AccountCategory:
+        return AccountCategory(
+            id=account_id,
+            name=account_id.title(),
+            type=AccountType.EXPENSE,
+            level=1,
+            description=account_id,
+            statement=statement,
+            aliases=["Fees"],
+        )
+
+    custom = CompiledOntology.from_accounts(
+        [
+            account("bank_fees", "income_statement"),
+            account("legal_fees", "income_statement"),
+            account("filing_fees", None),
+        ]
+    )
+    assert dict(custom.ambiguous_keys) == {"fees": ("bank_fees", "legal_fees", "filing_fees")}
+    assert [item.id for item in custom.statement_resolutions["fees", "income_statement"]] == [
+        "bank_fees",
+        "legal_fees",
+    ]
+    chart = StandardChartOfAccounts(custom)
+    assert len(chart.map_candidates("Fees", statement="income_statement")) == 2
+    assert len(chart.map_candidates("Fees", statement="balance_sheet")) == 3
+
+
+def test_concept_table_maps_taxonomy_concepts_behind_aliases(tmp_path: Path) -> None:
+    """Concepts no alias matches resolve through the table, which round-trips to disk."""
+    table = ConceptTable.from_concepts(
+        [
+            ("us-gaap:AdvertisingExpense", "operating_expenses"),
+            ("us-gaap:advertisingexpense", "operating_expenses"),
+            ("ifrs-full:Revenue", "revenue"),
+            ("us-gaap:Revenues", "cogs"),
+            ("us-gaap:Goodwill", "intangibles"),
+        ]
+    )
+    assert len(table) == 4
+    assert table.get("US-GAAP:AdvertisingExpense") == "operating_expenses"
+    assert table.get("us-gaap:Unknown") is None
+    path = tmp_path / "concepts.npz"
+    table.save(path)
+    loaded = ConceptTable.load(path)
+    assert loaded.account_ids == table.account_ids
+    assert loaded.get("ifrs-full:Revenue") == "revenue"
+
+    chart = StandardChartOfAccounts(concepts=loaded)
+    assert chart.map_account("ifrs-full:Revenue", "edgar").id == "revenue"  # type: ignore[union-attr]
+    # Aliases win over the table, and concepts for accounts outside the chart are dropped.
+    assert chart.map_account("us-gaap:Revenues", "edgar").id == "revenue"  # type: ignore[union-attr]
+    assert chart.map_candidates("us-gaap:Goodwill") == []
+    assert StandardChartOfAccounts().map_candidates("ifrs-full:Revenue") == []
+    with pytest.raises(ValueError, match="maps to both"):
+        ConceptTable.from_concepts(
+            [("ifrs-full:Revenue", "revenue"), ("ifrs-full:revenue", "cogs")]
+        )
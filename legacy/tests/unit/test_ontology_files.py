@@ -0,0 +1,91 @@
+"""Ontology file loading and compiled cache tests."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from waccy.core import ontology as ontology_module
+from waccy.core.ontology import AccountCategory, AccountType, StandardChartOfAccounts
+from waccy.core.ontology_files import (
+    ONTOLOGY_CACHE_SUFFIX,
+    load_ontology,
+    read_ontology_accounts,
+    write_ontology,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _client_accounts() -> list[AccountCategory]:
+    accounts = StandardChartOfAccounts().list_accounts()
+    return [
+        *accounts,
+        AccountCategory(
+            id="contractors",
+            name="Contractors",
+            type=AccountType.EXPENSE,
+            parent_id="operating_expenses",
+            level=2,
+            description="Outside contractors",
+            statement="income_statement",
+            sort_order=340,
+            aliases=["Contract Labor", "1099 Contractors"],
+        ),
+    ]
+
+
+@pytest.mark.parametrize("suffix", [".json", ".yaml"])
+def test_ontology_files_round_trip_and_compile(suffix: str, tmp_path: Path) -> None:
+    """Accounts written to JSON or YAML load back into a working chart."""
+    path = tmp_path / f"client{suffix}"
+    write_ontology(_client_accounts(), path)
+
+    assert read_ontology_accounts(path) == _client_accounts()
+    chart = StandardChartOfAccounts.from_file(path)
+    assert chart.map_account("Contract Labor", "qbo").id == "contractors"  # type: ignore[union-attr]
+    assert chart.map_account("Sales", "qbo").id == "revenue"  # type: ignore[union-attr]
+    assert chart.descendants("operating_expenses")[-1] == "contractors"
+
+    unsupported = tmp_path / "client.txt"
+    unsupported.write_text("[]")
+    with pytest.raises(ValueError, match="Unsupported ontology file"):
+        load_ontology(unsupported)
+    duplicated = tmp_path / "duplicated.json"
+    account = {"id": "a", "name": "A", "type": "asset", "level": 1, "description": "A"}
+    duplicated.write_text(json.dumps([account, account]))
+    with pytest.raises(ValueError, match="defines account 'a' twice"):
+        load_ontology(duplicated)
+
+
+def test_compiled_ontology_cache_is_keyed_by_content(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A cached ontology loads without normalizing aliases; edits compile afresh."""
+    path = tmp_path / "client.json"
+    cache_dir = tmp_path / "cache"
+    write_ontology(_client_accounts(), path)
+    compiled = load_ontology(path, cache_dir=cache_dir)
+    (cache_file,) = cache_dir.iterdir()
+    assert cache_file.name.endswith(ONTOLOGY_CACHE_SUFFIX)
+
+    def fail(value: str) -> str:
+        raise AssertionError(f"alias {value!r} normalized again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(ontology_module, "_key", fail)
+        cached = load_ontology(path, cache_dir=cache_dir)
+    assert cached.alias_index.keys() == compiled.alias_index.keys()
+    assert cached.accounts == compiled.accounts
+    assert cached.hierarchy == compiled.hierarchy
+
+    write_ontology(_client_accounts()[:-1], path)
+    assert "contractors" not in load_ontology(path, cache_dir=cache_dir).accounts
+    assert len(list(cache_dir.iterdir())) == 2
+
+    cache_file.write_bytes(b"truncated")
+    write_ontology(_client_accounts(), path)
+    assert "contractors" in load_ontology(path, cache_dir=cache_dir).accounts
@@ -0,0 +1,155 @@
+"""Persistent pattern store tests."""
+
+from __future__ import annotations
+
+import json
+import zipfile
+from typing import TYPE_CHECKING
+
+import pytest
+
+from waccy.classification import (
+    ClassificationEngine,
+    PatternMatcher,
+    PatternStore,
+    learn_from_companyfacts,
+)
+from waccy.core.ontology import ConceptTable, StandardChartOfAccounts
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _filing(*records: tuple[str, str]) -> dict:
+    return {
+        "records": [{"concept": concept, "statement": statement} for concept, statement in records]
+    }
+
+
+def test_learned_patterns_accumulate_across_filings_and_processes(tmp_path: Path) -> None:
+    """Each filing adds counted observations that a later engine reads back."""
+    path = tmp_path / "patterns.sqlite3"
+    engine = ClassificationEngine(pattern_store=PatternStore(path))
+    engine.learn_from_edgar(_filing(("us-gaap:Revenues", "income_statement")))
+    engine.learn_from_edgar(
+        _filing(
+            ("us-gaap:Revenues", "income_statement"),
+            ("us-gaap:Revenues", "cash_flow_statement"),
+            ("us-gaap:InventoryNet", "balance_sheet"),
+        )
+    )
+    assert engine.classify_with_diagnostics("us-gaap:Revenues", [], {}).pattern is not None
+    engine.pattern_matcher.store.close()
+
+    store = PatternStore(path)
+    assert len(store) == 2
+    assert store.lookup("usgaaprevenues") == {
+        "source": "us-gaap:Revenues",
+        "account_id": "revenue",
+        "statement": "income_statement",
+        "statements": {"cash_flow_statement": 1, "income_statement": 2},
+        "count": 3,
+        "share": 1.0,
+    }
+    assert store.lookup("unknown") is None
+
+    restarted = ClassificationEngine(pattern_store=store)
+    result = restarted.classify_with_diagnostics("us-gaap:InventoryNet", [], {})
+    assert result.account_id == "inventory"
+    assert result.diagnostics == ["classified_by_edgar_pattern"]
+    assert result.pattern is not None
+    assert result.pattern["count"] == 1
+
+
+def test_conflicting_observations_lower_pattern_confidence() -> None:
+    """The most observed account wins, with confidence scaled by its share."""
+    store = PatternStore()
+    store.record(
+        [
+            ("contractlabor", "Contract Labor", "operating_expenses", "income_statement"),
+            ("contractlabor", "Contract Labor", "operating_expenses", "income_statement"),
+            ("contractlabor", "contract labor", "operating_expenses", None),
+            ("contractlabor", "Contract Labor", "cogs", "income_statement"),
+        ]
+    )
+    matcher = PatternMatcher(store=store)
+    pattern = matcher.match_pattern("Contract Labor", [])
+
+    assert pattern is not None
+    assert pattern["account_id"] == "operating_expenses"
+    assert pattern["source"] == "Contract Labor"
+    assert pattern["confidence"] == 0.64
+    assert pattern["statements"] == {"income_statement": 2}
+    assert {"Contract Labor"} == {source for source, _ in store.aliases()}
+    assert "cogs" in {match.account_id for match in matcher.fuzzy_index().search("Contract Labour")}
+
+
+def _companyfacts(*concepts: str) -> dict:
+    return {
+        "cik": 1,
+        "entityName": "Filer",
+        "facts": {
+            "us-gaap": {concept: {"label": concept, "units": {}} for concept in concepts},
+            "dei": {"EntityCommonStockSharesOutstanding": {"units": {}}},
+        },
+    }
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_bulk_learning_merges_companyfacts_across_workers(workers: int, tmp_path: Path) -> None:
+    """Companyfacts files in a directory or zip reduce into one set of counts."""
+    filings = {
+        "CIK0000000001.json": _companyfacts("Revenues", "InventoryNet", "Goodwill"),
+        "CIK0000000002.json": _companyfacts("Revenues", "AccountsPayableCurrent"),
+        "CIK0000000003.json": _companyfacts("Revenues"),
+    }
+    directory = tmp_path / "companyfacts"
+    directory.mkdir()
+    archive_path = tmp_path / "companyfacts.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        for name, payload in filings.items():
+            (directory / name).write_text(json.dumps(payload))
+            archive.writestr(name, json.dumps(payload))
+        archive.writestr("broken.json", "{")
+    (directory / "broken.json").write_text("[]")
+
+    updates: list[int] = []
+    for source in (directory, archive_path):
+        store = PatternStore()
+        updates.clear()
+        progress = learn_from_companyfacts(
+            source,
+            store,
+            workers=workers,
+            batch_size=2,
+            progress=lambda state: updates.append(state.files_done),
+        )
+        assert (progress.files_total, progress.files_done, progress.files_failed) == (4, 3, 1)
+        assert progress.concepts == 9
+        assert progress.observations == 5
+        assert progress.bytes_read > 0
+        assert progress.files_per_second > 0
+        assert updates == [2, 3]
+        assert store.lookup("usgaaprevenues")["count"] == 3  # type: ignore[index]
+        assert store.lookup("usgaapgoodwill") is None
+
+    engine = ClassificationEngine()
+    assert (
+        engine.classify_with_diagnostics("us-gaap:AccountsPayableCurrent", [], {}).pattern is None
+    )
+    assert engine.learn_from_companyfacts(archive_path, workers=workers).files_done == 3
+    result = engine.classify_with_diagnostics("us-gaap:AccountsPayableCurrent", [], {})
+    assert result.diagnostics == ["classified_by_edgar_pattern"]
+
+    # Workers match against the matcher's own chart, concept table and aliases included.
+    concepts = ConceptTable.from_concepts([("us-gaap:Goodwill", "ppe")])
+    ontology = StandardChartOfAccounts(concepts=concepts)
+    ontology.add_aliases({"us-gaap:InventoryNet": ["cogs"]})
+    assert ontology.alias_overrides() == {"usgaapinventorynet": ["cogs"]}
+    matcher = PatternMatcher(ontology)
+    matcher.learn_from_companyfacts(directory, workers=workers)
+    assert matcher.store.lookup("usgaapgoodwill")["account_id"] == "ppe"  # type: ignore[index]
+    assert matcher.store.lookup("usgaapinventorynet")["account_id"] == "cogs"  # type: ignore[index]
+
+    with pytest.raises(ValueError, match="must be a directory or a zip file"):
+        learn_from_companyfacts(tmp_path / "missing", PatternStore())
@@ -0,0 +1,154 @@
+"""Model-backed classification provider tier tests."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from waccy.classification import (
+    ClassificationEngine,
+    LocalStubProvider,
+    ProviderAccount,
+    ProviderSuggestion,
+    ProviderTier,
+)
+from waccy.core.models import MappingStatus
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+class _SlowProvider:
+    """Answers every account with ``rent``, stalling on batches that name ``stall``."""
+
+    name = "slow"
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.most_in_flight = 0
+        self._lock = threading.Lock()
+
+    def classify_batch(
+        self, accounts: Sequence[ProviderAccount]
+    ) -> list[ProviderSuggestion | None]:
+        with self._lock:
+            self.in_flight += 1
+            self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        time.sleep(1.0 if any(account.name == "stall" for account in accounts) else 0.02)
+        with self._lock:
+            self.in_flight -= 1
+        if any(account.name == "fail" for account in accounts):
+            raise RuntimeError("provider error")
+        return [ProviderSuggestion("rent", 0.9) for _ in accounts]
+
+
+def test_provider_tier_batches_deduplicates_and_caches() -> None:
+    """Distinct accounts go out in bounded batches once; repeats come from the cache."""
+    stub = LocalStubProvider(latency=0.01)
+    names = [f"Office Rent {number}" for number in range(7)]
+    accounts = [ProviderAccount(name, "qbo") for name in names * 3]
+    accounts.append(ProviderAccount("OFFICE RENT 0", "qbo"))
+
+    with ProviderTier(stub, batch_size=3, max_concurrency=2) as tier:
+        suggestions = tier.classify(accounts)
+        assert len(suggestions) == len(accounts)
+        assert {suggestion.account_id for suggestion in suggestions if suggestion} == {"rent"}
+        assert (stub.calls, stub.accounts) == (3, 7)
+        assert tier.classify(accounts[:7]) == suggestions[:7]
+    assert stub.calls == 3
+    assert tier.stats.requests == 3
+    assert tier.stats.cache_hits == 7
+
+    with pytest.raises(ValueError, match="batch_size"):
+        ProviderTier(stub, batch_size=0)
+
+
+def test_provider_tier_bounds_concurrency_and_deadline() -> None:
+    """Failed and late batches stay unresolved and uncached, within the deadline."""
+    provider = _SlowProvider()
+    accounts = [ProviderAccount(name) for name in ["a", "b", "c", "fail", "stall"]]
+
+    with ProviderTier(provider, batch_size=1, max_concurrency=2, deadline=0.3) as tier:
+        started = time.perf_counter()
+        suggestions = tier.classify(accounts)
+        assert time.perf_counter() - started < 0.9
+    assert [suggestion is not None for suggestion in suggestions] == [
+        True,
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert provider.most_in_flight == 2
+    assert tier.stats.failed_batches == 1
+    assert tier.stats.timed_out_batches == 1
+
+
+def test_provider_tier_bound_holds_across_calls_past_the_deadline() -> None:
+    """Batches abandoned at a deadline keep their slots; queued ones are never sent."""
+    provider = _SlowProvider()
+    with ProviderTier(provider, batch_size=1, max_concurrency=2, deadline=0.1) as tier:
+        assert tier.classify([ProviderAccount("stall", "a"), ProviderAccount("stall", "b")]) == [
+            None,
+            None,
+        ]
+        assert tier.classify([ProviderAccount("c"), ProviderAccount("d")]) == [None, None]
+        time.sleep(1.1)
+        assert provider.most_in_flight == 2
+        assert (tier.stats.requests, tier.stats.accounts_sent) == (2, 2)
+        assert tier.stats.timed_out_batches == 4
+
+        assert tier.classify([ProviderAccount("c")])[0] == ProviderSuggestion("rent", 0.9)
+        assert tier.stats.requests == 3
+
+
+def test_provider_tier_close_does_not_wait_for_running_batches() -> None:
+    """Closing returns while a batch is still running and refuses later calls."""
+    provider = _SlowProvider()
+    tier = ProviderTier(provider, batch_size=1, max_concurrency=1, deadline=0.05)
+    assert tier.classify([ProviderAccount("stall")]) == [None]
+
+    started = time.perf_counter()
+    tier.close()
+    assert time.perf_counter() - started < 0.5
+    assert provider.in_flight == 1
+    with pytest.raises(RuntimeError):
+        tier.classify([ProviderAccount("c")])
+    assert tier.stats.requests == 1
+
+
+def test_engine_sends_only_unmatched_accounts_to_the_provider() -> None:
+    """Alias matches never reach the provider; a provider name alone enables nothing."""
+    with ClassificationEngine(llm_provider="fixture") as named:
+        assert named.provider_tier is None
+
+    stub = LocalStubProvider()
+    context = {"source_system": "qbo"}
+    with ClassificationEngine(llm_provider=stub) as engine:
+        batch = engine.classify_many(
+            [
+                ("Sales", [], context),
+                ("Offce Rnt Expense", [], context),
+                ("offce rnt expense", [], context),
+                ("Qqq Xyz", [], context),
+            ]
+        )
+    assert batch[0].diagnostics == ["classified_by_ontology_alias"]
+    assert batch[1] is batch[2]
+    assert batch[1].account_id == "rent"
+    assert batch[1].diagnostics == ["classified_by_llm_provider"]
+    assert batch[1].confidence <= 0.7
+    assert batch[3].status == MappingStatus.UNMAPPED
+    assert stub.accounts == 2
+
+    # Statistical suggestions only fill in what the provider leaves unmapped.
+    with ClassificationEngine(llm_provider=LocalStubProvider(), statistical_fallback=True) as both:
+        mapped, suggested = both.classify_many(
+            [("Offce Rnt Expense", [], context), ("Misc", [], context)]
+        )
+    assert mapped.diagnostics == ["classified_by_llm_provider"]
+    assert suggested.status == MappingStatus.AMBIGUOUS
+    assert suggested.diagnostics == ["classified_by_statistical_model"]
@@ -11,6 +11,10 @@ from typing import TYPE_CHECKING
 from urllib.error import HTTPError, URLError
 
 import pytest
+from pydantic import ValidationError
+
+from waccy.core.models import ExtractedData
+from waccy.extraction.mapper import DataMapper
 
 if TYPE_CHECKING:
     from urllib.request import Request
@@ -26,6 +30,7 @@ from waccy_quickbooks import (  # noqa: E402
     QuickBooksApiClient,
     QuickBooksApiError,
     QuickBooksEnvironment,
+    QuickBooksExtractor,
     QuickBooksOAuthConfig,
     QuickBooksReportNormalizer,
     QuickBooksToken,
@@ -182,6 +187,31 @@ def test_report_normalizer_converts_nested_qbo_reports_to_fixture() -> None:
     )
 
 
+def test_report_normalizer_shares_accounts_through_dataset_dimension() -> None:
+    fixture = QuickBooksReportNormalizer().to_fixture(_release_raw_fixture())
+    extracted = QuickBooksExtractor().extract({"fixture": fixture})
+    normalized = DataMapper().normalize(extracted)
+
+    assert all("qbo_account" not in record["metadata"] for record in fixture["records"])
+    assert set(normalized.accounts) == {account["Id"] for account in fixture["accounts"]}
+    receivable = next(
+        record
+        for record in normalized.records
+        if record.source_account_name == "Accounts Receivable (A/R)"
+    )
+    account = normalized.account_for(receivable)
+    assert account is not None
+    assert account.source_account_type == "Accounts Receivable"
+    assert account.metadata["Name"] == "Accounts Receivable (A/R)"
+    assert receivable.metadata == {}
+    assert normalized.model_dump_json().count('"AccountType"') == len(fixture["accounts"])
+
+    # Raw QBO Account payloads are still accepted as a list and keyed by their ids.
+    assert ExtractedData(accounts=fixture["accounts"]).accounts == extracted.accounts
+    with pytest.raises(ValidationError, match="missing an id"):
+        ExtractedData(accounts=[{"Name": "Checking"}])
+
+
 def test_report_normalizer_reports_no_data_and_missing_statements() -> None:
     raw_fixture = _release_raw_fixture()
     raw_fixture["reports"] = {
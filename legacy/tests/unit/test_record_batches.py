@@ -0,0 +1,186 @@
+"""Columnar record batch tests."""
+
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tests.fixtures.sample_data import sample_mixed_records, sample_records_extracted
+from waccy.core.batch import MappedRecordBatch, SourceRecordBatch
+from waccy.core.models import (
+    ExtractedData,
+    MappingOverride,
+    MappingStatus,
+    NormalizedFinancialDataset,
+)
+from waccy.core.validation import validate_mapped_dataset
+from waccy.extraction.mapper import (
+    DataMapper,
+    source_record_batch_from_dicts,
+    source_record_from_dict,
+)
+from waccy.modeling.builder import ModelBuilder
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def _fixture_records() -> list[dict[str, object]]:
+    return sample_mixed_records(
+        {"name": "Checking", "period": "FY30X", "amount": 1, "statement": "balance_sheet"}
+    )
+
+
+def test_source_record_batch_row_views_match_validated_records() -> None:
+    """Row views reproduce the validated records exactly, including amount exponents."""
+    raw_records = _fixture_records()
+    batch = source_record_batch_from_dicts(raw_records, "qbo")
+    records = [source_record_from_dict(record, "qbo") for record in raw_records]
+
+    assert len(batch) == len(records)
+    assert [row.model_dump(mode="json") for row in batch] == [
+        record.model_dump(mode="json") for record in records
+    ]
+    assert str(batch[-1].amount) == "-0.125"
+    assert batch[-1].source.metadata == {"row": 1}
+    assert batch[1:3] == records[1:3]
+    assert len(batch.account_names.values) < len(batch)
+
+
+def test_source_record_batch_round_trips_through_dataset_serialization() -> None:
+    """Datasets backed by a batch keep the batch and serialize like a record list."""
+    records = [source_record_from_dict(record, "qbo") for record in _fixture_records()]
+    batch = SourceRecordBatch.from_records(records)
+    batched = NormalizedFinancialDataset(entity_name="Fixture Co", periods=[], records=batch)
+    listed = NormalizedFinancialDataset(entity_name="Fixture Co", periods=[], records=records)
+
+    assert batched.records is batch
+    assert batched.model_dump_json() == listed.model_dump_json()
+    assert NormalizedFinancialDataset.model_validate_json(batched.model_dump_json()) == listed
+
+
+def test_columnar_pipeline_matches_record_pipeline() -> None:
+    """Mapping, validation, and model building give identical outputs over columns."""
+    mapper = DataMapper()
+    overrides = {"Manual": MappingOverride(account_id="cash", note="Known bank account")}
+    mapped_records = mapper.map_dataset(
+        mapper.normalize(sample_records_extracted(_fixture_records())), overrides=overrides
+    )
+    mapped_batch = mapper.map_dataset(
+        mapper.normalize(sample_records_extracted(_fixture_records(), columnar=True)),
+        overrides=overrides,
+    )
+
+    assert isinstance(mapped_batch.records, MappedRecordBatch)
+    assert len(mapped_batch.records.accounts) < len(mapped_batch.records)
+    assert mapped_batch.model_dump_json() == mapped_records.model_dump_json()
+
+    validated_records = validate_mapped_dataset(mapped_records)
+    validated_batch = validate_mapped_dataset(mapped_batch)
+    assert validated_batch.issues == validated_records.issues
+    assert {issue.code for issue in validated_batch.issues} >= {
+        "missing_period",
+        "unmapped_account",
+        "mapping_overridden",
+    }
+
+    builder = ModelBuilder()
+    assert builder.build_three_statement_model(validated_batch).model_dump_json() == (
+        builder.build_three_statement_model(validated_records).model_dump_json()
+    )
+
+
+def test_mapped_records_reference_normalized_records_by_row() -> None:
+    """Mapping results are row-aligned arrays that round-trip through their column form."""
+    mapper = DataMapper()
+    overrides = {"Manual": MappingOverride(account_id="cash", note="Known bank account")}
+    normalized = mapper.normalize(sample_records_extracted(_fixture_records()))
+    mapped = mapper.map_dataset(normalized, overrides=overrides)
+    records = mapped.records
+
+    assert isinstance(records, MappedRecordBatch)
+    assert records.source is normalized.records
+    assert records[0].source_record is normalized.records[0]
+    assert records.status(len(records) - 1) == MappingStatus.OVERRIDDEN
+    assert records[-1].override_note == "Known bank account"
+
+    restored = MappedRecordBatch.from_columns(
+        normalized.records, json.loads(json.dumps(records.to_columns()))
+    )
+    assert restored.to_records() == records.to_records()
+    assert MappedRecordBatch.from_records(records.to_records()).to_records() == (
+        records.to_records()
+    )
+
+
+def test_columnar_normalize_rewrites_only_the_period_dictionary() -> None:
+    """Inferred period labels are canonicalized by remapping the period dictionary."""
+    batch = source_record_batch_from_dicts(
+        [
+            {"name": "Sales", "period": "2024-2", "amount": 1},
+            {"name": "Sales", "period": "2024-02", "amount": 2},
+            {"name": "Sales", "period": "2024Q1", "amount": 3},
+        ],
+        "qbo",
+    )
+    normalized = DataMapper().normalize(
+        ExtractedData(entity_name="Fixture Co", source_records=batch, metadata={"source": "qbo"})
+    )
+
+    assert isinstance(normalized.records, SourceRecordBatch)
+    assert normalized.records.periods.values == ["2024-02", "2024Q1"]
+    assert [record.period_label for record in normalized.records] == [
+        "2024-02",
+        "2024-02",
+        "2024Q1",
+    ]
+    assert normalized.records.amount_coefficients is batch.amount_coefficients
+    mapped = DataMapper().map_dataset(normalized)
+    assert mapped.records[0].status == MappingStatus.MAPPED
+    assert mapped.records[-1].source_record.amount == Decimal("3")
+
+
+def test_mapping_plan_is_shared_across_records_and_runs(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A plan decides each key once and is reused while the mapping inputs are unchanged."""
+    mapper = DataMapper()
+    overrides = {"Manual": MappingOverride(account_id="cash", note="Known bank account")}
+    normalized = mapper.normalize(sample_records_extracted(_fixture_records(), columnar=True))
+    plan = mapper.plan(normalized, overrides)
+    assert len(plan) == len({record.source_account_name for record in normalized.records})
+    assert plan.fingerprint == mapper.plan_fingerprint(overrides)
+
+    def decide(keys: Sequence[object], _: object) -> list[object]:
+        assert not keys, f"planned keys {keys!r} were decided again"
+        return []
+
+    with monkeypatch.context() as patch:
+        patch.setattr(mapper, "_decide_many", decide)
+        planned = mapper.map_dataset(normalized, overrides, plan=plan)
+        listed = mapper.map_dataset(
+            mapper.normalize(sample_records_extracted(_fixture_records())), overrides, plan=plan
+        )
+    assert planned.model_dump_json() == mapper.map_dataset(normalized, overrides).model_dump_json()
+    assert listed.model_dump_json() == planned.model_dump_json()
+    unmapped = [record for record in planned.records if record.status == MappingStatus.UNMAPPED]
+    mystery = plan.decisions["Mystery Account", "Mystery Account", "qbo", None]
+    assert unmapped[0].diagnostics[0] is mystery.diagnostics[0]
+
+    extended = mapper.plan(
+        NormalizedFinancialDataset(
+            entity_name="Fixture Co",
+            periods=[],
+            records=[
+                source_record_from_dict({"name": "Sales", "period": "2025", "amount": 1}, "xero")
+            ],
+        ),
+        overrides,
+        plan=plan,
+    )
+    assert extended is plan
+    assert plan.decisions["Sales", "Sales", "xero", None].account_id == "revenue"
+
+    with pytest.raises(ValueError, match="different ontology"):
+        mapper.map_dataset(normalized, plan=plan)
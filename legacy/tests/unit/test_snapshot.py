@@ -0,0 +1,109 @@
+"""Binary snapshot tests."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tests.fixtures.sample_data import sample_mixed_records, sample_records_extracted
+from waccy.core.batch import MappedRecordBatch
+from waccy.core.models import (
+    CONTRACT_SCHEMA_VERSION,
+    MappingOverride,
+    ThreeStatementModel,
+    ValidatedFinancialDataset,
+)
+from waccy.core.snapshot import SNAPSHOT_MAGIC
+from waccy.extraction.mapper import DataMapper
+from waccy.modeling.builder import ModelBuilder
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_validated_dataset_round_trips_through_snapshot(columnar: bool, tmp_path: Path) -> None:
+    """Snapshots reopen as batch-backed datasets that serialize to the same JSON."""
+    mapper = DataMapper()
+    mapped = mapper.map_dataset(
+        mapper.normalize(sample_records_extracted(sample_mixed_records(), columnar=columnar)),
+        overrides={"Manual": MappingOverride(account_id="cash", note="Bank")},
+    )
+    validated = mapper.validate(mapped)
+    path = tmp_path / "validated.waccy"
+
+    validated.to_snapshot(path)
+    restored = ValidatedFinancialDataset.from_snapshot(path)
+
+    assert path.read_bytes().startswith(SNAPSHOT_MAGIC)
+    records = restored.mapped_dataset.records
+    assert isinstance(records, MappedRecordBatch)
+    assert not records.account_codes.flags.owndata
+    assert restored.model_dump_json() == validated.model_dump_json()
+    assert records.to_records() == list(validated.mapped_dataset.records)
+
+
+def test_snapshot_values_are_decoded_on_first_use(tmp_path: Path) -> None:
+    """Opening a snapshot leaves string values, diagnostics, and metadata undecoded."""
+    mapper = DataMapper()
+    extracted = sample_records_extracted(
+        [
+            *sample_mixed_records(),
+            {
+                "name": "Accrual",
+                "period": "2024",
+                "amount": 1,
+                "as_of": date(2024, 12, 31),
+                "metadata": {"rate": Decimal("0.05")},
+            },
+        ],
+        columnar=True,
+    )
+    validated = mapper.validate(mapper.map_dataset(mapper.normalize(extracted)))
+    path = tmp_path / "validated.waccy"
+    validated.to_snapshot(path)
+
+    restored = ValidatedFinancialDataset.from_snapshot(path)
+    records = restored.mapped_dataset.records
+    assert isinstance(records, MappedRecordBatch)
+    names = records.source.account_names.values
+    assert names._decode is not None
+    assert records.diagnostics._decode is not None
+    assert records.source.metadata._decode is not None
+    assert records.source.source_metadata._decode is not None
+
+    assert records[0].source_record.source_account_name == "Sales"
+    assert names._decode is None
+    assert records[-1].source_record.metadata == {"as_of": "2024-12-31"}
+    assert records[-1].source_record.source.metadata == {"rate": "0.05"}
+    assert restored.model_dump_json() == validated.model_dump_json()
+
+
+def test_model_round_trips_and_snapshot_versions_are_checked(tmp_path: Path) -> None:
+    """Models read back identically and mismatched snapshots are refused."""
+    model = ModelBuilder().build_three_statement_model(
+        sample_records_extracted(sample_mixed_records())
+    )
+    path = tmp_path / "model.waccy"
+    model.to_snapshot(path)
+
+    assert ThreeStatementModel.from_snapshot(path).model_dump_json() == model.model_dump_json()
+    with pytest.raises(ValueError, match="holds 'model' data, not 'validated'"):
+        ValidatedFinancialDataset.from_snapshot(path)
+
+    data = path.read_bytes()
+    stale = data.replace(
+        f'"schema_version": "{CONTRACT_SCHEMA_VERSION}"'.encode(), b'"schema_version": "0.9.0"'
+    )
+    path.write_bytes(stale)
+    with pytest.raises(ValueError, match=r"contract schema 0\.9\.0"):
+        ThreeStatementModel.from_snapshot(path)
+
+    path.write_bytes(b"not a snapshot")
+    with pytest.raises(ValueError, match="not a WACCY snapshot"):
+        ThreeStatementModel.from_snapshot(path)
@@ -0,0 +1,92 @@
+"""Dense statement value table tests."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+
+from tests.fixtures.sample_data import sample_periods, sample_qbo_fixture
+from waccy.core.models import ExtractedData, FinancialStatement, StatementLine, ThreeStatementModel
+from waccy.core.statement_values import PeriodIndex, PeriodValues, StatementValues
+from waccy.extraction.mapper import source_record_from_dict
+from waccy.modeling.builder import ModelBuilder
+
+
+def _model() -> ThreeStatementModel:
+    return ModelBuilder().build_three_statement_model(
+        ExtractedData(
+            entity_name="Fixture Co",
+            periods=sample_periods(),
+            source_records=[
+                source_record_from_dict(record, "qbo") for record in sample_qbo_fixture()["records"]
+            ],
+            metadata={"source": "qbo"},
+        )
+    )
+
+
+def test_built_statements_share_one_value_table() -> None:
+    """Every line of a built statement is a row view of the statement's array."""
+    model = _model()
+    statement = model.income_statement
+    table = statement.value_table()
+
+    assert table.amounts.shape == (len(statement.lines), len(statement.periods))
+    assert list(table.periods) == [period.label for period in statement.periods]
+    for row, line in enumerate(statement.lines):
+        assert isinstance(line.values, PeriodValues)
+        assert line.values.table is table
+        assert line.values.row == row
+        assert dict(line.values) == dict(zip(table.periods, table.amounts[row], strict=True))
+
+    restored = ThreeStatementModel.model_validate_json(model.model_dump_json())
+    assert isinstance(restored.income_statement.lines[0].values, dict)
+    assert restored == model
+    assert restored.model_dump_json() == model.model_dump_json()
+
+
+def test_period_values_read_like_a_dict() -> None:
+    """Views support mapping access and dict-backed lines still stack into a table."""
+    values = PeriodValues.from_amounts(["2023", "2024"], [Decimal("1.50"), Decimal("-2")])
+
+    assert values["2023"] == Decimal("1.50")
+    assert values.get("2025", Decimal("0")) == Decimal("0")
+    assert list(values) == ["2023", "2024"]
+    assert values == {"2023": Decimal("1.50"), "2024": Decimal("-2")}
+    with pytest.raises(KeyError):
+        values["2025"]
+
+    statement = FinancialStatement(
+        name="Income Statement",
+        periods=sample_periods(),
+        lines=[StatementLine(label="Revenue", values={"2023": Decimal("5")})],
+    )
+    table = statement.value_table()
+    assert table.amounts.tolist() == [[Decimal("5"), Decimal("0")]]
+    assert StatementValues.from_lines(table.periods, [table.line(0)]) is table
+    assert list(PeriodIndex(["2024", "2023", "2024"])) == ["2024", "2023"]
+
+
+def test_period_values_copy_on_write() -> None:
+    """Writing to one line's view leaves the shared table and other lines unchanged."""
+    statement = _model().income_statement
+    table = statement.value_table()
+    first, second = statement.lines[0].values, statement.lines[1].values
+    before = table.amounts.copy()
+    periods = list(table.periods)
+
+    first[periods[0]] = Decimal("42")
+    first.update({"2030": Decimal("1")})
+    del first[periods[-1]]
+
+    assert isinstance(first, PeriodValues)
+    assert first.table is not table
+    assert first == {
+        **dict(zip(periods[:-1], before[0][:-1], strict=True)),
+        periods[0]: Decimal("42"),
+        "2030": Decimal("1"),
+    }
+    assert second.table is table
+    assert (table.amounts == before).all()
+    assert statement.value_table() is not table
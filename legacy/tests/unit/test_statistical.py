@@ -0,0 +1,66 @@
+"""Statistical fallback classifier tests."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from waccy.classification import ClassificationEngine, NaiveBayesClassifier
+from waccy.core.models import MappingStatus
+
+
+def test_naive_bayes_scores_batches_of_names() -> None:
+    """Each name gets a distribution over accounts; names without words get a uniform one."""
+    classifier = NaiveBayesClassifier.from_aliases(
+        [
+            ("Rent Expense", "rent"),
+            ("Office Lease", "rent"),
+            ("Bank Checking", "cash"),
+            ("Savings Account", "cash"),
+        ]
+    )
+
+    probabilities = classifier.probabilities(["Office Rent", "Checking 1234", "--"])
+    assert classifier.account_ids == ("rent", "cash")
+    assert probabilities.shape == (3, 2)
+    np.testing.assert_allclose(probabilities.sum(axis=1), 1.0)
+    assert probabilities[0, 0] > 0.9
+    assert probabilities[1, 1] > 0.9
+    np.testing.assert_allclose(probabilities[2], [0.5, 0.5])
+    assert classifier.probabilities([]).shape == (0, 2)
+
+    with pytest.raises(ValueError, match="at least one alias"):
+        NaiveBayesClassifier.from_aliases([])
+
+
+def test_engine_statistical_fallback_suggests_accounts_for_unmatched_names() -> None:
+    """Only names no alias or pattern matches reach the model, and its guesses stay suggestions."""
+    context = {"source_system": "qbo"}
+    assert (
+        ClassificationEngine().classify_with_diagnostics("Office Rent", [], context).status
+        == MappingStatus.UNMAPPED
+    )
+
+    engine = ClassificationEngine(statistical_fallback=True)
+    balance_sheet = {**context, "statement": "balance_sheet"}
+    batch = engine.classify_many(
+        [
+            ("Office Rent", [], context),
+            ("Sales", [], context),
+            ("Zzqx", [], context),
+            ("Office Rent", [], balance_sheet),
+        ]
+    )
+    guessed, exact, unknown, contradicted = batch[0], batch[1], batch[2], batch[3]
+    assert guessed.account_id == "rent"
+    assert guessed.status == MappingStatus.AMBIGUOUS
+    assert guessed.diagnostics == ["classified_by_statistical_model"]
+    assert 0.36 <= guessed.confidence <= 0.4
+    assert exact.diagnostics == ["classified_by_ontology_alias"]
+    assert unknown.status == MappingStatus.UNMAPPED
+    assert contradicted.status == MappingStatus.UNMAPPED
+
+    classifier = engine.statistical_classifier()
+    assert engine.statistical_classifier() is classifier
+    engine.learn_from_edgar({"records": [{"concept": "us-gaap:InventoryNet"}]})
+    assert engine.statistical_classifier() is not classifier
@@ -0,0 +1,65 @@
+"""Streaming JSON writer tests."""
+
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from tests.fixtures.sample_data import sample_periods, sample_qbo_fixture
+from waccy.core.models import (
+    ExtractedData,
+    MappedFinancialDataset,
+    NormalizedFinancialDataset,
+    ThreeStatementModel,
+    ValidatedFinancialDataset,
+)
+from waccy.core.streaming import iter_json
+from waccy.extraction.mapper import DataMapper, source_record_batch_from_dicts
+
+CONFORMANCE_DIR = Path(__file__).resolve().parents[1] / "conformance"
+
+
+@pytest.mark.parametrize("source", ["qbo", "edgar"])
+def test_streamed_json_matches_conformance_fixtures(source: str, tmp_path: Path) -> None:
+    """Contract models stream back to the committed fixture bytes."""
+    for filename, model_type in (
+        ("expected-normalized.json", NormalizedFinancialDataset),
+        ("expected-mapped.json", MappedFinancialDataset),
+        ("expected-validated.json", ValidatedFinancialDataset),
+        ("expected-model.json", ThreeStatementModel),
+    ):
+        expected = (CONFORMANCE_DIR / source / filename).read_text()
+        value = model_type.model_validate_json(expected)
+
+        assert "".join(iter_json(value)) + "\n" == expected
+
+    expected = (CONFORMANCE_DIR / source / "expected-model.json").read_text()
+    ThreeStatementModel.model_validate_json(expected).write_json(tmp_path / "model.json")
+    assert (tmp_path / "model.json").read_text() + "\n" == expected
+
+
+def test_streamed_json_matches_json_dumps_for_batches() -> None:
+    """Batch-backed records stream identically in compact and unsorted layouts."""
+    mapper = DataMapper()
+    records = [
+        *sample_qbo_fixture()["records"],
+        {"name": "Café ✓", "period": "2024", "amount": "1", "metadata": {"n": "a\nb"}},
+    ]
+    validated = mapper.map_to_standard(
+        ExtractedData(
+            entity_name="Fixture Co",
+            periods=sample_periods(),
+            source_records=source_record_batch_from_dicts(records, "qbo"),
+        )
+    )
+
+    for options in ({"indent": None}, {"indent": 4, "sort_keys": False}):
+        stream = io.StringIO()
+        validated.write_json(stream, **options)  # type: ignore[arg-type]
+        expected = json.dumps(
+            validated.model_dump(mode="json"), **{"indent": 2, "sort_keys": True, **options}
+        )
+        assert stream.getvalue() == expected
@@ -0,0 +1,74 @@
+"""Aho-Corasick alias substring index tests."""
+
+from __future__ import annotations
+
+from waccy.classification import ConfidenceScorer
+from waccy.core.ontology import AccountCategory, AccountType, StandardChartOfAccounts
+from waccy.core.substrings import SubstringIndex
+
+
+def test_substring_index_matches_keys_in_both_directions() -> None:
+    """Groups match when one of their keys occurs in the text or contains it."""
+    groups = {
+        "revenue": ["sales", "salesrevenue", "revenue"],
+        "rent": ["rent", "rentexpense"],
+        "cogs": ["costofsales", "cogs"],
+        "blank": ["", "zzz"],
+        "none": [],
+    }
+    index = SubstringIndex(groups)
+
+    assert len(index) == 5
+    for text in ["netsalesrevenue", "currentexpense", "costofsalesnet", "sal", "", "x"]:
+        assert index.occurring_in(text) == {
+            group for group, keys in groups.items() if any(key in text for key in keys)
+        }
+        for group, keys in groups.items():
+            assert index.occurs_in(group, text) == any(text in key for key in keys)
+    assert index.occurring_in("netsalesrevenue") == {"revenue", "blank"}
+    assert index.occurring_in("currentexpense") == {"rent", "blank"}
+
+
+def test_confidence_scoring_credits_partial_alias_matches() -> None:
+    """Source keys nested in either direction with an alias earn partial credit."""
+    scorer = ConfidenceScorer()
+
+    assert scorer.calculate_confidence("Net Sales", "revenue", [], {}) == 0.6
+    assert scorer.calculate_confidence("Payroll Exp", "payroll", [], {}) == 0.6
+    assert scorer.calculate_confidence("Rent", "rent", [], {}) == 0.8
+    assert scorer.calculate_confidence("Office Snacks", "rent", [], {}) == 0.35
+    rows = [
+        ("Net Sales", "revenue", [], {}),
+        ("Net Sales", "cogs", [], {}),
+        ("Office Snacks", "rent", [{"account_id": "rent"}], {}),
+    ]
+    assert scorer.calculate_confidence_many(rows) == [
+        scorer.calculate_confidence(*row) for row in rows
+    ]
+
+
+def test_confidence_scoring_reads_instance_accounts() -> None:
+    """Accounts added to or replaced in a chart instance score by their own aliases."""
+    ontology = StandardChartOfAccounts()
+    ontology.accounts["snacks"] = AccountCategory(
+        id="snacks",
+        name="Snacks",
+        type=AccountType.EXPENSE,
+        parent_id="operating_expenses",
+        level=2,
+        description="Office snacks",
+        statement="income_statement",
+        aliases=["office snacks", "pantry"],
+    )
+    ontology.accounts["rent"] = ontology.accounts["rent"].model_copy(
+        update={"aliases": ["office lease"]}
+    )
+    scorer = ConfidenceScorer(ontology)
+
+    assert ontology.alias_keys("snacks") == {"snacks", "officesnacks", "pantry"}
+    assert scorer.calculate_confidence("Pantry", "snacks", [], {}) == 0.8
+    assert scorer.calculate_confidence("Office Snacks Q3", "snacks", [], {}) == 0.6
+    assert scorer.calculate_confidence("Office Lease", "rent", [], {}) == 0.8
+    assert scorer.calculate_confidence("Rent Expense", "rent", [], {}) == 0.6
+    assert scorer.calculate_confidence_many([("Pantry", "snacks", [], {})]) == [0.8]
+    assert ConfidenceScorer().calculate_confidence("Office Lease", "rent", [], {}) == 0.35
@@ -169,6 +169,45 @@ def test_classification_and_pattern_matching_are_deterministic() -> None:
     assert "classified_by_edgar_pattern" in pattern_result.diagnostics
 
 
+def test_classify_many_shares_lookups_and_returns_columns() -> None:
+    """Batch classification matches single-account results, one shared result per outcome."""
+    engine = ClassificationEngine()
+    engine.learn_from_edgar(
+        {"records": [{"concept": "us-gaap:Revenues", "statement": "income_statement"}]}
+    )
+    supporting = [{"name": "us-gaap:Revenues"}, {"account_id": "revenue"}]
+    rows = [
+        ("Sales", [], {"source_system": "qbo"}),
+        ("Mystery Account", [], {"source_system": "qbo"}),
+        ("SALES", [], {"source_system": "qbo"}),
+        ("us-gaap:DepreciationDepletionAndAmortization", [], {"source_system": "edgar"}),
+        ("Net Sales", supporting, {"source_system": "qbo", "statement": "income_statement"}),
+        ("Sales", [], {"source_system": "qbo"}),
+    ]
+    batch = engine.classify_many(rows)
+
+    assert len(batch) == 6
+    assert batch.codes.tolist() == [0, 1, 0, 2, 3, 0]
+    assert batch.account_ids().decode() == ["revenue", None, "revenue", None, "revenue", "revenue"]
+    assert batch.statuses().decode() == [
+        MappingStatus.MAPPED,
+        MappingStatus.UNMAPPED,
+        MappingStatus.MAPPED,
+        MappingStatus.AMBIGUOUS,
+        MappingStatus.MAPPED,
+        MappingStatus.MAPPED,
+    ]
+    assert batch.confidences().tolist() == [0.8, 0.0, 0.8, 0.35, 0.85, 0.8]
+    assert batch[4].diagnostics == ["classified_by_edgar_pattern"]
+    assert batch[4].pattern is not None
+    assert batch[3].diagnostics == [
+        "ambiguous_candidates: depreciation_amortization, depreciation_addback"
+    ]
+    for row, (name, transaction_patterns, context) in enumerate(rows):
+        assert batch[row] == engine.classify_with_diagnostics(name, transaction_patterns, context)
+    assert len(engine.classify_many([])) == 0
+
+
 def test_model_template_placeholder_contract() -> None:
     """ModelTemplate keeps placeholder structure behavior explicit."""
     template = ModelTemplate("three_statement")
@@ -0,0 +1,75 @@
+"""Trusted construction tests."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from pydantic import ValidationError
+
+from tests.fixtures.sample_data import sample_mixed_records, sample_records_extracted
+from waccy.core.models import SourceRecord, SourceReference, StatementLine
+from waccy.core.trusted import construct, replace, strict_validation, strict_validation_enabled
+from waccy.extraction.mapper import DataMapper
+from waccy.modeling.builder import ModelBuilder
+
+
+def test_trusted_construction_matches_validated_models() -> None:
+    """Trusted models fill defaults and compare, dump, and repr like validated ones."""
+    fields = {"label": "Cash", "values": {"2024": Decimal("1.50")}}
+    trusted = construct(StatementLine, **fields)
+    validated = StatementLine(**fields)
+
+    assert trusted == validated
+    assert trusted.model_dump_json() == validated.model_dump_json()
+    assert repr(trusted) == repr(validated)
+    assert trusted.model_fields_set == validated.model_fields_set
+    assert trusted.metadata == {}
+    assert trusted.metadata is not construct(StatementLine, **fields).metadata
+
+
+def test_strict_validation_switch_validates_internal_models() -> None:
+    """The debug switch turns validation back on for trusted construction."""
+    record = SourceRecord(
+        source_account_id="1",
+        source_account_name="Cash",
+        amount=Decimal("1"),
+        period_label="2024",
+        source=SourceReference(source_system="qbo", source_id="1"),
+    )
+
+    with strict_validation(False):
+        assert not strict_validation_enabled()
+        assert construct(StatementLine, label="Cash", values="bad").values == "bad"
+        assert replace(record, amount="bad").amount == "bad"
+    with strict_validation():
+        assert strict_validation_enabled()
+        with pytest.raises(ValidationError):
+            construct(StatementLine, label="Cash", values="bad")
+        with pytest.raises(ValidationError):
+            replace(record, amount="bad")
+        assert replace(record, amount="2.5").amount == Decimal("2.5")
+
+
+def test_pipeline_output_is_identical_with_strict_validation() -> None:
+    """Trusted and strict pipelines produce byte-identical artifacts."""
+    mapper = DataMapper()
+    builder = ModelBuilder()
+    records = sample_mixed_records(
+        {"name": "Sales", "period": "2024-2", "amount": "3.25", "statement": "income_statement"}
+    )
+
+    def run() -> list[str]:
+        normalized = mapper.normalize(sample_records_extracted(records))
+        mapped = mapper.map_dataset(normalized)
+        validated = mapper.validate(mapped)
+        model = builder.build_three_statement_model(validated)
+        return [item.model_dump_json() for item in (normalized, mapped, validated, model)]
+
+    with strict_validation(False):
+        trusted = run()
+    with strict_validation():
+        strict = run()
+
+    assert trusted == strict
+    assert '"period_label":"2024-02"' in trusted[0]